@@ -5,11 +5,20 @@ Enhanced version with WOW effects and interactive features
 """
 
 import asyncio
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import signal
 import sqlite3
+import sys
+import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Collection, Dict, List, Mapping, Optional, Tuple
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -20,16 +29,82 @@ from telegram.ext import (
     CallbackQueryHandler,
     MessageHandler,
     ConversationHandler,
+    SimpleUpdateProcessor,
     filters,
 )
 from telegram.constants import ChatAction
+from telegram.error import TelegramError
+
+from medici_bot_messages import MessageCatalog
 
 # ---------------------- Налаштування ----------------------
 
 TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "YOUR_TOKEN_HERE")
 DB_PATH = "medici_bot.db"
+# Версія схеми БД (PRAGMA user_version); збільшуй при зміні таблиць
+SCHEMA_VERSION = 3
+
+# Кількість записів на сторінці історії
+HISTORY_PAGE_SIZE = 5
 MANAGER_CHAT_ID = int(os.getenv("MANAGER_CHAT_ID", "0"))
 
+# Припущення калькулятора для прогнозу
+AVG_CONVERSION = 0.30  # 30% лідів стають пацієнтами
+AVG_CHECK = 1500  # середній чек, грн
+
+# Діапазони для таблиці сценаріїв "що, якщо"
+SCENARIO_CONVERSIONS = (0.10, 0.20, 0.30, 0.40, 0.50)
+SCENARIO_CHECKS = (1000, 1500, 2000, 3000, 5000)
+SCENARIO_BUDGET_FACTORS = (0.5, 1.0, 2.0)
+
+# Вікно (в секундах), протягом якого повторний callback вважається дублем
+CALLBACK_DEDUP_WINDOW = float(os.getenv("CALLBACK_DEDUP_WINDOW", "2.0"))
+
+# Навігаційні кнопки: повторне натискання — легітимна дія (наступний місяць
+# календаря, сторінка історії), тож дублем вважається лише повтор того ж query.id
+NAVIGATION_CALLBACK_PREFIXES = (
+    "prev_month_",
+    "next_month_",
+    "hist_",
+    "back_main",
+    "action_menu",
+    "change_date",
+    "ignore",
+)
+
+# Файл проби готовності/живучості (для Docker/systemd/k8s)
+HEALTH_FILE = os.getenv("HEALTH_FILE", "medici_bot.health")
+HEALTH_INTERVAL = float(os.getenv("HEALTH_INTERVAL", "15"))
+
+# Скільки секунд чекати завершення обробників при зупинці (SIGTERM/SIGINT)
+SHUTDOWN_DEADLINE = float(os.getenv("SHUTDOWN_DEADLINE", "20"))
+
+# Завантажені користувачами файли (spool)
+SPOOL_DIR = os.getenv("SPOOL_DIR", "spool")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+SPOOL_QUOTA_BYTES = int(os.getenv("SPOOL_QUOTA_BYTES", str(500 * 1024 * 1024)))
+SPOOL_MAX_AGE_HOURS = float(os.getenv("SPOOL_MAX_AGE_HOURS", "72"))
+SPOOL_CLEANUP_INTERVAL = float(os.getenv("SPOOL_CLEANUP_INTERVAL", "3600"))
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+# Сигнатури дозволених форматів: (перші байти, MIME, розширення)
+SPOOL_SIGNATURES = (
+    (b"%PDF-", "application/pdf", ".pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+    (b"GIF87a", "image/gif", ".gif"),
+    (b"GIF89a", "image/gif", ".gif"),
+)
+
+# Захист від флуду: поповнення токенів за секунду та розмір "запасу" на користувача
+FLOOD_RATE = float(os.getenv("FLOOD_RATE", "1.0"))
+FLOOD_BURST = float(os.getenv("FLOOD_BURST", "8"))
+# Скільки оновлень одного користувача можуть чекати в черзі; решта відкидається
+MAX_QUEUED_UPDATES = int(os.getenv("MAX_QUEUED_UPDATES", "8"))
+# Скільки оновлень бот обробляє одночасно (глобальний ліміт між користувачами;
+# оновлення одного користувача завжди обробляються по черзі)
+MAX_CONCURRENT_UPDATES = int(os.getenv("MAX_CONCURRENT_UPDATES", "32"))
+
 # Стани розмови
 (
     MAIN_MENU,
@@ -49,20 +124,105 @@ MANAGER_CHAT_ID = int(os.getenv("MANAGER_CHAT_ID", "0"))
     QUIZ_QUESTION,
 ) = range(15)
 
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
+# Логування: "json" (структуровані рядки) або "text"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Частка записів, що зберігаються для високочастотних подій (extra={"sample": True})
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматування запису логу в один JSON-рядок."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Вибіркове пропускання записів, позначених як високочастотні."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or not getattr(record, "sample", False):
+            return True
+        return random.random() < self.rate
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Налаштування неблокуючого логування.
+
+    Обробники бота лише кладуть запис у чергу (QueueHandler), а форматування
+    та запис у потік виконує фоновий QueueListener, тож I/O логування не
+    блокує event loop. Викликається з main(), а не під час імпорту: тести,
+    --profile-startup та звіти не мають підміняти обробники root-логера.
+    Listener зупиняє той, хто його запустив.
+    """
+    if LOG_FORMAT == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    # httpx логує кожен запит polling на рівні INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
 logger = logging.getLogger(__name__)
 
+# Каталог шаблонів повідомлень (завантажується та компілюється один раз).
+# Локалі вмикаються явно: англійська лишається вимкненою, доки меню,
+# калькулятор і квіз не перенесені в каталог повністю.
+BOT_LOCALES = [lang.strip() for lang in os.getenv("BOT_LOCALES", "uk").split(",") if lang.strip()]
+messages = MessageCatalog(enabled=BOT_LOCALES)
+
 # ---------------------- Робота з БД ----------------------
 
 
 def init_db() -> None:
-    """Створення таблиць, якщо їх ще немає."""
+    """Створення таблиць, якщо їх ще немає.
+
+    Якщо user_version бази вже дорівнює SCHEMA_VERSION, перевірка схеми
+    пропускається — перезапуск не виконує жодного DDL.
+    """
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
 
+    # WAL: читачі (звіти) не блокують запис; режим зберігається у файлі БД
+    cur.execute("PRAGMA journal_mode = WAL")
+
+    cur.execute("PRAGMA user_version")
+    user_version = cur.fetchone()[0]
+    if user_version >= SCHEMA_VERSION:
+        conn.close()
+        logger.debug("Схема БД актуальна (версія %d)", SCHEMA_VERSION)
+        return
+
     # Таблиця подій
     cur.execute(
         """
@@ -122,9 +282,75 @@ def init_db() -> None:
         """
     )
 
+    # Історія активності користувача (консультації, квізи, матеріали)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            kind TEXT,
+            title TEXT,
+            ts TEXT
+        )
+        """
+    )
+    # Покриваючий індекс: сторінка історії — один range scan без звернень до таблиці
+    # та без тимчасового сортування по (ts, id)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_history_user_ts ON history (user_id, ts, id, kind, title)"
+    )
+
+    # Індекси звітів medici_bot_report.py (покривають усі колонки запитів).
+    # Створюються тут, при міграції до старту бота, а не звітом на живій БД
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_action_ts_user ON events (action, ts, user_id)"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_events_ts_action ON events (ts, action)")
+    # Когорти воронки: перший start та етапи користувача після нього
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_events_action_user_ts ON events (action, user_id, ts)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_consultations_ts_user ON consultations (ts, user_id)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_consultations_user_ts ON consultations (user_id, ts)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_quiz_results_ts_score ON quiz_results (ts, score, max_score)"
+    )
+
+    if user_version < 2:
+        # Перенесення наявних консультацій та квізів в історію
+        cur.execute(
+            """
+            INSERT INTO history (user_id, kind, title, ts)
+            SELECT user_id, 'consultation', consultation_date || ' ' || consultation_time, ts
+            FROM consultations
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO history (user_id, kind, title, ts)
+            SELECT user_id, 'quiz', score || '/' || max_score, ts
+            FROM quiz_results
+            """
+        )
+
+    cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
-    logger.info("База даних ініціалізована")
+    logger.info("База даних ініціалізована (версія схеми %d)", SCHEMA_VERSION)
+
+
+def checkpoint_db() -> None:
+    """Перенесення WAL у основний файл БД (при зупинці бота)."""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+    except Exception as e:
+        logger.error("Помилка checkpoint БД: %s", e)
 
 
 def log_event(user_id: int, action: str, payload: str = "") -> None:
@@ -139,7 +365,7 @@ def log_event(user_id: int, action: str, payload: str = "") -> None:
         conn.commit()
         conn.close()
     except Exception as e:
-        logger.error(f"Помилка запису події: {e}")
+        logger.error("Помилка запису події: %s", e)
 
 
 def update_user_profile(user_id: int, **kwargs) -> None:
@@ -188,7 +414,7 @@ def update_user_profile(user_id: int, **kwargs) -> None:
         conn.commit()
         conn.close()
     except Exception as e:
-        logger.error(f"Помилка оновлення профілю: {e}")
+        logger.error("Помилка оновлення профілю: %s", e)
 
 
 def get_user_stats(user_id: int) -> Dict:
@@ -234,7 +460,7 @@ def get_user_stats(user_id: int) -> Dict:
         conn.close()
         return stats
     except Exception as e:
-        logger.error(f"Помилка отримання статистики: {e}")
+        logger.error("Помилка отримання статистики: %s", e)
         return {}
 
 
@@ -247,6 +473,7 @@ def save_consultation(
     consultation_time: str = "",
 ) -> None:
     """Збереження заявки на консультацію в БД."""
+    ts = datetime.utcnow().isoformat()
     try:
         conn = sqlite3.connect(DB_PATH)
         cur = conn.cursor()
@@ -262,29 +489,95 @@ def save_consultation(
                 contact,
                 consultation_date,
                 consultation_time,
-                datetime.utcnow().isoformat(),
+                ts,
             ),
         )
+        cur.execute(
+            "INSERT INTO history (user_id, kind, title, ts) VALUES (?, ?, ?, ?)",
+            (user_id, "consultation", f"{consultation_date} {consultation_time}", ts),
+        )
         conn.commit()
         conn.close()
-        logger.info(f"Збережено заявку від користувача {user_id}")
+        logger.info("Збережено заявку від користувача %s", user_id)
     except Exception as e:
-        logger.error(f"Помилка збереження консультації: {e}")
+        logger.error("Помилка збереження консультації: %s", e)
 
 
 def save_quiz_result(user_id: int, score: int, max_score: int) -> None:
     """Збереження результату квізу."""
+    ts = datetime.utcnow().isoformat()
     try:
         conn = sqlite3.connect(DB_PATH)
         cur = conn.cursor()
         cur.execute(
             "INSERT INTO quiz_results (user_id, score, max_score, ts) VALUES (?, ?, ?, ?)",
-            (user_id, score, max_score, datetime.utcnow().isoformat()),
+            (user_id, score, max_score, ts),
+        )
+        cur.execute(
+            "INSERT INTO history (user_id, kind, title, ts) VALUES (?, ?, ?, ?)",
+            (user_id, "quiz", f"{score}/{max_score}", ts),
         )
         conn.commit()
         conn.close()
     except Exception as e:
-        logger.error(f"Помилка збереження результату квізу: {e}")
+        logger.error("Помилка збереження результату квізу: %s", e)
+
+
+def add_history(user_id: int, kind: str, title: str) -> None:
+    """Запис події в історію користувача."""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute(
+            "INSERT INTO history (user_id, kind, title, ts) VALUES (?, ?, ?, ?)",
+            (user_id, kind, title, datetime.utcnow().isoformat()),
+        )
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        logger.error("Помилка запису історії: %s", e)
+
+
+def get_history_page(
+    user_id: int,
+    cursor: Optional[Tuple[str, int]] = None,
+    direction: str = "next",
+    limit: int = HISTORY_PAGE_SIZE,
+) -> Tuple[List[Tuple[int, str, str, str]], bool]:
+    """Сторінка історії (від нових до старих) з keyset-пагінацією по (ts, id).
+
+    cursor — (ts, id) крайнього запису попередньої сторінки: для "next" —
+    останнього, для "prev" — першого. Повертає записи (id, kind, title, ts)
+    та ознаку, чи є ще записи в цьому напрямку.
+    """
+    if cursor is None:
+        where, order, params = "", "DESC", (user_id,)
+    elif direction == "next":
+        where, order, params = "AND (ts, id) < (?, ?)", "DESC", (user_id, *cursor)
+    else:
+        where, order, params = "AND (ts, id) > (?, ?)", "ASC", (user_id, *cursor)
+
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        rows = conn.execute(
+            f"""
+            SELECT id, kind, title, ts
+            FROM history
+            WHERE user_id = ? {where}
+            ORDER BY ts {order}, id {order}
+            LIMIT ?
+            """,
+            (*params, limit + 1),
+        ).fetchall()
+        conn.close()
+    except Exception as e:
+        logger.error("Помилка отримання історії: %s", e)
+        return [], False
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if order == "ASC":
+        rows.reverse()
+    return rows, has_more
 
 
 # ---------------------- Допоміжні функції ----------------------
@@ -340,6 +633,207 @@ def calculate_badges(stats: Dict) -> List[str]:
     return badges if badges else ["🌱 Новачок"]
 
 
+def render_stats(stats: Dict, lang: str) -> str:
+    """Текст персональної статистики з каталогу шаблонів."""
+    default = messages.render("stats_default_value", lang)
+    return messages.renderer("stats", lang)(
+        name=stats.get("name", default),
+        business_type=stats.get("business_type", default),
+        files_uploaded=stats.get("files_uploaded", 0),
+        materials_downloaded=stats.get("materials_downloaded", 0),
+        consultations_requested=stats.get("consultations_requested", 0),
+        quizzes_completed=stats.get("quizzes_completed", 0),
+        badges=" ".join(calculate_badges(stats)),
+    )
+
+
+# ---------------------- Захист від подвійних натискань ----------------------
+
+
+class CallbackDeduplicator:
+    """Короткоживучий кеш ідемпотентності для callback-запитів.
+
+    Дубль — це повторна доставка того самого callback_query.id (Telegram
+    надсилає його знову при ретраях) або, для кнопок, що змінюють стан,
+    повторне натискання тієї ж кнопки (user_id, message_id, callback_data) в
+    межах вікна. Навігаційні кнопки (NAVIGATION_CALLBACK_PREFIXES) за
+    вмістом не дедуплікуються: два натискання "наступний місяць" — дві дії.
+    """
+
+    def __init__(self, window: float = CALLBACK_DEDUP_WINDOW, max_size: int = 10000) -> None:
+        self.window = window
+        self.max_size = max_size
+        self._seen: "OrderedDict[Tuple, float]" = OrderedDict()
+
+    def is_duplicate(
+        self,
+        query_id: str,
+        user_id: int,
+        message_id: int,
+        data: str,
+        now: Optional[float] = None,
+    ) -> bool:
+        """Перевірити callback і запам'ятати його, якщо він новий."""
+        now = time.monotonic() if now is None else now
+        self._evict(now)
+
+        keys = [("id", query_id)]
+        if not data.startswith(NAVIGATION_CALLBACK_PREFIXES):
+            keys.append((user_id, message_id, data))
+        if any(key in self._seen for key in keys):
+            return True
+
+        for key in keys:
+            self._seen[key] = now
+        while len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def _evict(self, now: float) -> None:
+        """Видалення записів, старших за вікно (найстаріші — на початку)."""
+        while self._seen:
+            key, ts = next(iter(self._seen.items()))
+            if now - ts < self.window:
+                break
+            del self._seen[key]
+
+
+callback_deduplicator = CallbackDeduplicator()
+
+
+async def drop_duplicate_callback(update: Update) -> bool:
+    """Відкидання повторного callback-запиту при надходженні (True — дубль).
+
+    Викликається з DrainingUpdateProcessor.process_update до черги
+    користувача: вікно рахується від надходження, а не від моменту, коли
+    попередній (можливо, довгий) обробник звільнив чергу.
+    """
+    query = update.callback_query
+    if not query or not query.message:
+        return False
+
+    if not callback_deduplicator.is_duplicate(
+        query.id, query.from_user.id, query.message.message_id, query.data or ""
+    ):
+        return False
+
+    logger.debug(
+        "Відкинуто дубль callback %r від користувача %s",
+        query.data,
+        query.from_user.id,
+        extra={"sample": True},
+    )
+    try:
+        await query.answer()
+    except TelegramError as e:
+        logger.debug("Не вдалося відповісти на дубль callback: %s", e)
+    return True
+
+
+# ---------------------- Захист від флуду ----------------------
+
+
+class FloodGuard:
+    """Допуск вхідних оновлень за принципом token bucket на користувача.
+
+    Кожне оновлення витрачає один токен; токени поповнюються зі швидкістю
+    rate до burst. Оновлення без токена відкидаються ще до БД та API, а
+    лічильники відкинутих оновлень доступні в self.metrics.
+    """
+
+    def __init__(
+        self,
+        rate: float = FLOOD_RATE,
+        burst: float = FLOOD_BURST,
+        notice_interval: float = 30.0,
+        max_users: int = 50000,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.notice_interval = notice_interval
+        self.max_users = max_users
+        # user_id -> [токени, час останнього поповнення, час останнього попередження]
+        self._buckets: "OrderedDict[int, List[float]]" = OrderedDict()
+        self.metrics: Counter = Counter()
+
+    def admit(self, user_id: int, now: Optional[float] = None) -> bool:
+        """Спробувати витратити токен користувача."""
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = [self.burst, now, 0.0]
+            self._buckets[user_id] = bucket
+            if len(self._buckets) > self.max_users:
+                # Найдовше неактивні користувачі мають повний запас — їх можна забути
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(user_id)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            self.metrics["admitted"] += 1
+            return True
+
+        self.metrics["shed"] += 1
+        return False
+
+    def should_notify(self, user_id: int, now: Optional[float] = None) -> bool:
+        """Чи попереджати користувача (не частіше за notice_interval)."""
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(user_id)
+        if bucket is None or now - bucket[2] < self.notice_interval:
+            return False
+        bucket[2] = now
+        return True
+
+
+flood_guard = FloodGuard()
+
+
+async def admit_update(update: Update, queued: int) -> bool:
+    """Допуск оновлення при надходженні, ще до черги користувача.
+
+    Викликається з DrainingUpdateProcessor.process_update: токен
+    витрачається в момент надходження, тож сплеск не накопичується в черзі,
+    поки повільний обробник тримає попереднє оновлення. queued — скільки
+    оновлень користувача вже в черзі (разом з тим, що виконується); понад
+    MAX_QUEUED_UPDATES нові відкидаються.
+    """
+    user = update.effective_user
+    if user is None:
+        return True
+    if queued >= MAX_QUEUED_UPDATES:
+        flood_guard.metrics["shed"] += 1
+        flood_guard.metrics["shed_queue"] += 1
+    elif flood_guard.admit(user.id):
+        return True
+
+    kind = "callback" if update.callback_query else "message"
+    flood_guard.metrics[f"shed_{kind}"] += 1
+    logger.warning(
+        "Флуд: відкинуто %s від користувача %s (всього відкинуто: %d)",
+        kind,
+        user.id,
+        flood_guard.metrics["shed"],
+        extra={"sample": True},
+    )
+
+    notice = None
+    if flood_guard.should_notify(user.id):
+        notice = "⏳ Забагато запитів. Зачекай кілька секунд."
+    try:
+        if update.callback_query:
+            # Відповідь на кожен відкинутий callback — інакше в клієнті крутиться індикатор
+            await update.callback_query.answer(notice)
+        elif notice and update.effective_message:
+            await update.effective_message.reply_text(notice)
+    except TelegramError as e:
+        logger.debug("Не вдалося відповісти на відкинуте оновлення: %s", e)
+    return False
+
+
 # ---------------------- Клавіатури ----------------------
 
 
@@ -360,6 +854,7 @@ def main_menu_keyboard() -> InlineKeyboardMarkup:
         ],
         [
             InlineKeyboardButton("📊 Моя статистика", callback_data="action_stats"),
+            InlineKeyboardButton("🕘 Моя історія", callback_data="hist_first"),
         ],
     ]
     return InlineKeyboardMarkup(keyboard)
@@ -411,47 +906,23 @@ def calculator_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
-def calendar_keyboard(year: int, month: int) -> InlineKeyboardMarkup:
+def calendar_keyboard(year: int, month: int, lang: Optional[str] = None) -> InlineKeyboardMarkup:
     """Inline календар для вибору дати."""
     import calendar
 
-    month_names = [
-        "",
-        "Січень",
-        "Лютий",
-        "Березень",
-        "Квітень",
-        "Травень",
-        "Червень",
-        "Липень",
-        "Серпень",
-        "Вересень",
-        "Жовтень",
-        "Листопад",
-        "Грудень",
-    ]
-
     keyboard = []
 
     # Заголовок з місяцем та роком
-    keyboard.append(
-        [
-            InlineKeyboardButton(
-                f"📅 {month_names[month]} {year}", callback_data="ignore"
-            )
-        ]
+    title = messages.render(
+        "calendar_title", lang, month=messages.get("month_names", lang)[month], year=year
     )
+    keyboard.append([InlineKeyboardButton(title, callback_data="ignore")])
 
     # Дні тижня
     keyboard.append(
         [
-            InlineKeyboardButton("Пн", callback_data="ignore"),
-            InlineKeyboardButton("Вт", callback_data="ignore"),
-            InlineKeyboardButton("Ср", callback_data="ignore"),
-            InlineKeyboardButton("Чт", callback_data="ignore"),
-            InlineKeyboardButton("Пт", callback_data="ignore"),
-            InlineKeyboardButton("Сб", callback_data="ignore"),
-            InlineKeyboardButton("Нд", callback_data="ignore"),
+            InlineKeyboardButton(day, callback_data="ignore")
+            for day in messages.get("weekdays_short", lang)
         ]
     )
 
@@ -648,22 +1119,9 @@ async def main_menu_callback(update: Update, context: CallbackContext) -> int:
 
     if data == "action_stats":
         await send_typing_action(context, query.message.chat_id, 1.5)
+        lang = messages.resolve_lang(user.language_code)
         stats = get_user_stats(user.id)
-        badges = calculate_badges(stats)
-
-        text = (
-            f"📊 **Твоя статистика**\n\n"
-            f"👤 Ім'я: {stats.get('name', 'Не вказано')}\n"
-            f"🏥 Тип бізнесу: {stats.get('business_type', 'Не вказано')}\n\n"
-            f"📈 **Активність:**\n"
-            f"📎 Файлів завантажено: {stats.get('files_uploaded', 0)}\n"
-            f"📚 Матеріалів отримано: {stats.get('materials_downloaded', 0)}\n"
-            f"📝 Консультацій запитано: {stats.get('consultations_requested', 0)}\n"
-            f"🎮 Квізів пройдено: {stats.get('quizzes_completed', 0)}\n\n"
-            f"🏆 **Твої бейджі:**\n"
-            f"{' '.join(badges)}\n\n"
-            f"🎯 Продовжуй у тому ж дусі!"
-        )
+        text = render_stats(stats, lang) + messages.render("stats_footer", lang)
 
         keyboard = [
             [InlineKeyboardButton("🏠 Головне меню", callback_data="back_main")]
@@ -919,6 +1377,7 @@ async def materials_callback(update: Update, context: CallbackContext) -> int:
             )
 
         update_user_profile(user.id, materials_downloaded=1)
+        add_history(user.id, "material", title)
 
         await query.edit_message_text(
             "✅ Матеріал надіслано. Обери інший або повернись у меню:",
@@ -930,7 +1389,7 @@ async def materials_callback(update: Update, context: CallbackContext) -> int:
             reply_markup=materials_keyboard(),
         )
     except Exception as e:
-        logger.error(f"Помилка відправки файлу: {e}")
+        logger.error("Помилка відправки файлу: %s", e)
         await query.edit_message_text(
             "Помилка відправки файлу. Спробуйте пізніше.",
             reply_markup=materials_keyboard(),
@@ -942,19 +1401,208 @@ async def materials_callback(update: Update, context: CallbackContext) -> int:
 # ---------------------- Завантаження та аналіз файлів ----------------------
 
 
+class UploadRejected(Exception):
+    """Файл не прийнято; текст помилки показується користувачу."""
+
+
+# file_unique_id -> [lock, кількість завантажень, що чекають або виконуються]
+_spool_locks: Dict[str, list] = {}
+
+
+def sniff_mime(head: bytes) -> Optional[Tuple[str, str]]:
+    """Визначення (MIME, розширення) за першими байтами файлу."""
+    for signature, mime, ext in SPOOL_SIGNATURES:
+        if head.startswith(signature):
+            return mime, ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", ".webp"
+    return None
+
+
+def find_spooled(file_unique_id: str) -> Optional[str]:
+    """Шлях до вже завантаженого файлу з таким file_unique_id."""
+    for ext in {ext for _, _, ext in SPOOL_SIGNATURES} | {".webp"}:
+        path = os.path.join(SPOOL_DIR, file_unique_id + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _read_head(path: str, size: int = 16) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(size)
+
+
+def _active_parts() -> set:
+    """Шляхи .part файлів, які зараз завантажуються."""
+    return {os.path.join(SPOOL_DIR, key + ".part") for key in _spool_locks}
+
+
+def _spool_entries() -> List[Tuple[float, int, str]]:
+    """Файли spool як (mtime, розмір, шлях)."""
+    entries = []
+    try:
+        with os.scandir(SPOOL_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def referenced_spool_paths(user_data: Mapping) -> set:
+    """Файли spool, на які ще посилається user_data (аналіз не завершено).
+
+    Після аналізу чи /cancel "upload" видаляється з user_data. Розмова без
+    тайм-ауту, тож покинуте завантаження перестає бути "живим" через
+    SPOOL_MAX_AGE_HOURS і далі очищається як звичайний старий файл.
+    """
+    cutoff = time.time() - SPOOL_MAX_AGE_HOURS * 3600
+    paths = set()
+    for data in user_data.values():
+        upload = data.get("upload") if isinstance(data, dict) else None
+        if upload and upload.get("path") and upload.get("received_at", 0) >= cutoff:
+            paths.add(upload["path"])
+    return paths
+
+
+def cleanup_spool(referenced: Collection[str] = ()) -> int:
+    """Видалення файлів, старших за SPOOL_MAX_AGE_HOURS, та недокачаних .part.
+
+    Файли з referenced (на них посилається user_data) не видаляються.
+    """
+    cutoff = time.time() - SPOOL_MAX_AGE_HOURS * 3600
+    active = _active_parts()
+    removed = 0
+    for mtime, _, path in _spool_entries():
+        if path in referenced:
+            continue
+        if mtime < cutoff or (path.endswith(".part") and path not in active):
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    if removed:
+        logger.info("Очищено spool: видалено %d файлів", removed)
+    return removed
+
+
+async def cleanup_spool_job(context: CallbackContext) -> None:
+    """Періодичне очищення spool з черги завдань."""
+    cleanup_spool(referenced_spool_paths(context.application.user_data))
+
+
+def ensure_spool_quota(incoming: int, referenced: Collection[str] = ()) -> None:
+    """Звільнення місця під новий файл: найстаріші файли видаляються першими.
+
+    Файли з referenced займають квоту, але не видаляються.
+    """
+    entries = sorted(e for e in _spool_entries() if not e[2].endswith(".part"))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total + incoming <= SPOOL_QUOTA_BYTES:
+            break
+        if path in referenced:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    if total + incoming > SPOOL_QUOTA_BYTES:
+        raise UploadRejected("❌ Сховище файлів переповнене. Спробуй пізніше.")
+
+
+async def spool_upload(
+    bot,
+    file_id: str,
+    file_unique_id: str,
+    size_hint: int = 0,
+    referenced: Collection[str] = (),
+) -> Tuple[str, str]:
+    """Потокове завантаження файлу Telegram у spool.
+
+    Файл пишеться частинами в .part і перейменовується лише після повного
+    завантаження. MIME визначається за першими байтами, розмір обмежений
+    UPLOAD_MAX_BYTES, а однаковий file_unique_id ніколи не завантажується двічі.
+    referenced — файли, які квота не може витіснити. Повертає (шлях, MIME).
+    """
+    existing = find_spooled(file_unique_id)
+    if existing:
+        os.utime(existing)
+        return existing, sniff_mime(_read_head(existing))[0]
+
+    entry = _spool_locks.setdefault(file_unique_id, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            existing = find_spooled(file_unique_id)
+            if existing:
+                return existing, sniff_mime(_read_head(existing))[0]
+
+            os.makedirs(SPOOL_DIR, exist_ok=True)
+            ensure_spool_quota(size_hint or UPLOAD_MAX_BYTES, referenced)
+
+            import httpx
+
+            tg_file = await bot.get_file(file_id)
+            part_path = os.path.join(SPOOL_DIR, file_unique_id + ".part")
+            sniffed = None
+            received = 0
+            try:
+                async with httpx.AsyncClient(timeout=30) as client:
+                    async with client.stream("GET", tg_file.file_path) as response:
+                        response.raise_for_status()
+                        with open(part_path, "wb") as out:
+                            async for chunk in response.aiter_bytes(SPOOL_CHUNK_SIZE):
+                                if sniffed is None:
+                                    sniffed = sniff_mime(chunk)
+                                    if sniffed is None:
+                                        raise UploadRejected(
+                                            "❌ Формат не підтримується. Надішли PDF або зображення."
+                                        )
+                                received += len(chunk)
+                                if received > UPLOAD_MAX_BYTES:
+                                    raise UploadRejected("❌ Файл завеликий для аналізу.")
+                                out.write(chunk)
+                if sniffed is None:
+                    raise UploadRejected("❌ Файл порожній.")
+
+                mime, ext = sniffed
+                path = os.path.join(SPOOL_DIR, file_unique_id + ext)
+                os.replace(part_path, path)
+            except BaseException:
+                try:
+                    os.remove(part_path)
+                except FileNotFoundError:
+                    pass
+                raise
+    finally:
+        # Запис прибирається на будь-якому виході, коли його ніхто більше не чекає
+        entry[1] -= 1
+        if not entry[1]:
+            _spool_locks.pop(file_unique_id, None)
+
+    logger.info("Файл %s збережено в spool (%d байт, %s)", file_unique_id, received, mime)
+    return path, mime
+
+
 async def upload_wait_file(update: Update, context: CallbackContext) -> int:
     """Очікування файлу від користувача."""
     user = update.effective_user
     message = update.message
 
-    file_id = None
     file_type = None
+    attachment = None
 
     if message.document:
-        file_id = message.document.file_id
+        attachment = message.document
         file_type = "document"
     elif message.photo:
-        file_id = message.photo[-1].file_id
+        attachment = message.photo[-1]
         file_type = "photo"
     elif message.text:
         context.user_data["uploaded_text"] = message.text
@@ -964,7 +1612,36 @@ async def upload_wait_file(update: Update, context: CallbackContext) -> int:
         await message.reply_text("Надішли, будь ласка, файл або текст для аналізу.")
         return UPLOAD_WAIT_FILE
 
-    context.user_data["upload"] = {"file_id": file_id, "file_type": file_type}
+    upload = {"file_id": None, "file_type": file_type}
+    if attachment:
+        # Розмір відомий до завантаження — завеликі файли навіть не качаємо
+        if (attachment.file_size or 0) > UPLOAD_MAX_BYTES:
+            await message.reply_text(
+                f"❌ Файл завеликий. Максимум {UPLOAD_MAX_BYTES // (1024 * 1024)} МБ."
+            )
+            return UPLOAD_WAIT_FILE
+
+        try:
+            path, mime = await spool_upload(
+                context.bot,
+                attachment.file_id,
+                attachment.file_unique_id,
+                attachment.file_size or 0,
+                referenced_spool_paths(context.application.user_data),
+            )
+        except UploadRejected as e:
+            await message.reply_text(str(e))
+            return UPLOAD_WAIT_FILE
+        except Exception as e:
+            logger.error("Помилка завантаження файлу: %s", e)
+            await message.reply_text("Помилка завантаження файлу. Спробуйте пізніше.")
+            return UPLOAD_WAIT_FILE
+
+        upload.update(
+            file_id=attachment.file_id, path=path, mime=mime, received_at=time.time()
+        )
+
+    context.user_data["upload"] = upload
     log_event(user.id, "upload_received", file_type)
     update_user_profile(user.id, files_uploaded=1)
 
@@ -984,7 +1661,11 @@ async def upload_ask_type(update: Update, context: CallbackContext) -> int:
     user = query.from_user
 
     material_type = query.data
-    context.user_data["upload"]["material_type"] = material_type
+    upload = context.user_data.get("upload")
+    if upload is None:
+        # Аналіз цього файлу вже завершено — повторна кнопка типу
+        return MAIN_MENU
+    upload["material_type"] = material_type
     log_event(user.id, "upload_type", material_type)
 
     # Початок аналізу з прогрес-баром
@@ -1002,113 +1683,84 @@ async def upload_ask_type(update: Update, context: CallbackContext) -> int:
 
     await simulate_progress(context, query.message.chat_id, progress_msg.message_id, steps)
 
-    # Рекомендації залежно від типу
-    recommendations = {
-        "type_banner": {
-            "score": 7.5,
-            "good": [
-                "✅ Читабельний шрифт",
-                "✅ Контрастні кольори",
-                "✅ Є логотип/брендинг",
-            ],
-            "improve": [
-                "⚠️ Додайте яскравий заклик до дії (CTA)",
-                "⚠️ Збільште розмір основного тексту на 20%",
-                "⚠️ Перевірте правило 20% тексту для Facebook",
-            ],
-            "tips": [
-                "💡 Використайте контрастну кнопку для CTA",
-                "💡 Додайте емоційний тригер (знижка, термін)",
-                "💡 Протестуйте 3-5 варіантів (A/B тест)",
-            ],
-        },
-        "type_text": {
-            "score": 8.0,
-            "good": [
-                "✅ Чіткий заклик до дії",
-                "✅ Опис вигоди для пацієнта",
-                "✅ Є контактна інформація",
-            ],
-            "improve": [
-                "⚠️ Додайте конкретні цифри та факти",
-                "⚠️ Скоротіть текст до 150 символів",
-                "⚠️ Використайте емоційні слова",
-            ],
-            "tips": [
-                "💡 Формула: Проблема → Рішення → Результат → CTA",
-                "💡 Додайте термін акції для терміновості",
-                "💡 Використайте соціальні докази (відгуки, кількість пацієнтів)",
-            ],
-        },
-        "type_landing": {
-            "score": 6.5,
-            "good": [
-                "✅ Є форма запису",
-                "✅ Мобільна версія",
-                "✅ Контактна інформація",
-            ],
-            "improve": [
-                "⚠️ Оптимізуйте швидкість завантаження (<3 сек)",
-                "⚠️ Спростіть форму (макс 3-4 поля)",
-                "⚠️ Додайте соціальні докази (відгуки, сертифікати)",
-            ],
-            "tips": [
-                "💡 Додайте відео-відгуки пацієнтів",
-                "💡 Використайте exit-intent popup",
-                "💡 Додайте онлайн-чат для консультацій",
-            ],
-        },
-        "type_stats": {
-            "score": 7.0,
-            "good": [
-                "✅ CTR вище середнього (>2%)",
-                "✅ Налаштовано відстеження конверсій",
-            ],
-            "improve": [
-                "⚠️ Покращіть CR (конверсія < 5%)",
-                "⚠️ Оптимізуйте CPL (вартість ліда)",
-                "⚠️ Розширте аудиторію (схожі аудиторії)",
-            ],
-            "tips": [
-                "💡 Використайте ремаркетинг для теплої аудиторії",
-                "💡 Тестуйте різні пропозиції (offer)",
-                "💡 Аналізуйте по годинах доби (time parting)",
-            ],
-        },
-    }
-
-    analysis = recommendations.get(material_type, recommendations["type_banner"])
-
-    # Візуалізація оцінки
-    score = analysis["score"]
-    stars = "⭐" * int(score) + "☆" * (10 - int(score))
-
-    text = (
-        f"✅ **Аналіз завершено!**\n\n"
-        f"📊 **Загальна оцінка:** {score}/10\n"
-        f"{stars}\n\n"
-        f"**✅ Що добре:**\n"
-    )
-    for item in analysis["good"]:
-        text += f"{item}\n"
-
-    text += f"\n**⚠️ Що покращити:**\n"
-    for item in analysis["improve"]:
-        text += f"{item}\n"
+    # Рекомендації залежно від типу (тексти відрендерені в каталозі при старті)
+    text = messages.analysis(material_type, messages.resolve_lang(user.language_code))
 
-    text += f"\n**💡 Додаткові поради:**\n"
-    for item in analysis["tips"]:
-        text += f"{item}\n"
+    # Аналіз завершено: файл більше не потрібен, і spool може його видалити
+    context.user_data.pop("upload", None)
 
     await query.edit_message_text(
         text, reply_markup=post_analysis_keyboard(), parse_mode="Markdown"
     )
-    return UPLOAD_ASK_TYPE
+    # Кнопки post_analysis_keyboard — дії головного меню
+    return MAIN_MENU
 
 
 # ---------------------- Калькулятор CPL/ROAS ----------------------
 
 
+@lru_cache(maxsize=256)
+def scenario_grid(
+    budget: float,
+    leads: int,
+    conversions: Tuple[float, ...] = SCENARIO_CONVERSIONS,
+    checks: Tuple[int, ...] = SCENARIO_CHECKS,
+    budget_factors: Tuple[float, ...] = SCENARIO_BUDGET_FACTORS,
+) -> Dict:
+    """Сітка сценаріїв CPL/ROI/ROAS одним векторизованим проходом.
+
+    Осі результату: (бюджет, конверсія, середній чек). Бюджет масштабується
+    при незмінному CPL, тобто кількість лідів росте пропорційно бюджету.
+    Результати кешуються для однакових вхідних даних.
+    """
+    import numpy as np
+
+    factors = np.asarray(budget_factors, dtype=float)[:, None, None]
+    conv = np.asarray(conversions, dtype=float)[None, :, None]
+    chk = np.asarray(checks, dtype=float)[None, None, :]
+
+    budgets = budget * factors
+    lead_counts = leads * factors
+    patients = np.floor(lead_counts * conv)
+    revenue = patients * chk
+
+    grid = {
+        "budgets": budgets[:, 0, 0],
+        "cpl": (budgets / lead_counts)[:, 0, 0],
+        "patients": np.broadcast_to(patients, revenue.shape),
+        "revenue": revenue,
+        "roas": revenue / budgets * 100,
+        "roi": (revenue - budgets) / budgets * 100,
+    }
+    # Масиви з кешу спільні між викликами — забороняємо їх змінювати
+    for values in grid.values():
+        values.flags.writeable = False
+    return grid
+
+
+def render_scenario_table(
+    grid: Dict,
+    conversions: Tuple[float, ...] = SCENARIO_CONVERSIONS,
+    checks: Tuple[int, ...] = SCENARIO_CHECKS,
+) -> str:
+    """Компактна текстова таблиця ROI (%) для кожного рівня бюджету."""
+    header = "конв.\\чек " + "".join(f"{check:>7}" for check in checks)
+    blocks = []
+    for i, budget in enumerate(grid["budgets"]):
+        lines = [f"Бюджет {budget:,.0f} грн (CPL {grid['cpl'][i]:,.0f})", header]
+        for j, conv in enumerate(conversions):
+            cells = "".join(f"{roi:>7.0f}" for roi in grid["roi"][i, j])
+            lines.append(f"{conv:>9.0%} " + cells)
+        blocks.append("\n".join(lines))
+
+    return (
+        "📊 **Сценарії ROI, %**\n"
+        "Рядки — конверсія ліда в пацієнта, стовпці — середній чек (грн).\n"
+        "ROAS = ROI + 100%.\n\n"
+        "```\n" + "\n\n".join(blocks) + "\n```"
+    )
+
+
 async def calculator_callback(update: Update, context: CallbackContext) -> int:
     """Обробник калькулятора."""
     query = update.callback_query
@@ -1140,6 +1792,26 @@ async def calculator_callback(update: Update, context: CallbackContext) -> int:
         await query.edit_message_text(text, parse_mode="Markdown")
         return CALC_ROAS_SPEND
 
+    if data == "calc_scenarios":
+        budget = context.user_data.get("calc_budget")
+        leads = context.user_data.get("calc_leads")
+        if not budget or not leads:
+            await query.edit_message_text(
+                "Спочатку розрахуй CPL, щоб побудувати сценарії.",
+                reply_markup=calculator_keyboard(),
+            )
+            return MAIN_MENU
+
+        text = render_scenario_table(scenario_grid(float(budget), int(leads)))
+        keyboard = [
+            [InlineKeyboardButton("🧮 Ще розрахунок", callback_data="action_calculator")],
+            [InlineKeyboardButton("🏠 Головне меню", callback_data="back_main")],
+        ]
+        await query.edit_message_text(
+            text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode="Markdown"
+        )
+        return MAIN_MENU
+
     return MAIN_MENU
 
 
@@ -1188,11 +1860,11 @@ async def calc_cpl_leads(update: Update, context: CallbackContext) -> int:
             quality = "🔴 Потребує оптимізації"
             comment = "CPL високий. Рекомендуємо аудит кампанії."
 
+        context.user_data["calc_leads"] = leads
+
         # Прогноз
-        avg_conversion = 0.30  # 30% лідів стають пацієнтами
-        patients = int(leads * avg_conversion)
-        avg_check = 1500  # середній чек
-        revenue = patients * avg_check
+        patients = int(leads * AVG_CONVERSION)
+        revenue = patients * AVG_CHECK
         roi = ((revenue - budget) / budget) * 100
 
         text = (
@@ -1202,13 +1874,18 @@ async def calc_cpl_leads(update: Update, context: CallbackContext) -> int:
             f"💵 **CPL: {cpl:,.0f} грн** {quality}\n\n"
             f"📝 {comment}\n\n"
             f"🎯 **Прогноз (орієнтовно):**\n"
-            f"• Пацієнтів: ~{patients} (конверсія 30%)\n"
+            f"• Пацієнтів: ~{patients} (конверсія {AVG_CONVERSION:.0%})\n"
             f"• Потенційний дохід: ~{revenue:,.0f} грн\n"
             f"• ROI: ~{roi:,.0f}%\n\n"
             f"💡 Середній CPL для медицини: 200-800 грн"
         )
 
         keyboard = [
+            [
+                InlineKeyboardButton(
+                    "📊 Сценарії «що, якщо»", callback_data="calc_scenarios"
+                )
+            ],
             [
                 InlineKeyboardButton(
                     "🧮 Ще розрахунок", callback_data="action_calculator"
@@ -1608,7 +2285,9 @@ async def consult_contact(update: Update, context: CallbackContext) -> int:
     )
 
     now = datetime.now()
-    keyboard_markup = calendar_keyboard(now.year, now.month)
+    keyboard_markup = calendar_keyboard(
+        now.year, now.month, messages.resolve_lang(user.language_code)
+    )
 
     await update.message.reply_text(text, reply_markup=keyboard_markup)
     return CONSULT_DATE
@@ -1619,6 +2298,7 @@ async def consult_date_callback(update: Update, context: CallbackContext) -> int
     query = update.callback_query
     await query.answer()
     user = query.from_user
+    lang = messages.resolve_lang(user.language_code)
 
     data = query.data
 
@@ -1642,7 +2322,7 @@ async def consult_date_callback(update: Update, context: CallbackContext) -> int
                 year += 1
 
         await query.edit_message_reply_markup(
-            reply_markup=calendar_keyboard(year, month)
+            reply_markup=calendar_keyboard(year, month, lang)
         )
         return CONSULT_DATE
 
@@ -1653,27 +2333,14 @@ async def consult_date_callback(update: Update, context: CallbackContext) -> int
 
         context.user_data["consult"]["date"] = selected_date.strftime("%Y-%m-%d")
 
-        month_names = [
-            "",
-            "січня",
-            "лютого",
-            "березня",
-            "квітня",
-            "травня",
-            "червня",
-            "липня",
-            "серпня",
-            "вересня",
-            "жовтня",
-            "листопада",
-            "грудня",
-        ]
-
         await send_typing_action(context, query.message.chat_id, 0.5)
 
-        text = (
-            f"✅ Обрано дату: {day} {month_names[month]} {year}\n\n"
-            f"⏰ Обери зручний час:"
+        text = messages.render(
+            "date_selected",
+            lang,
+            day=day,
+            month=messages.get("month_names_genitive", lang)[month],
+            year=year,
         )
 
         await query.edit_message_text(
@@ -1684,7 +2351,7 @@ async def consult_date_callback(update: Update, context: CallbackContext) -> int
     if data == "change_date":
         now = datetime.now()
         await query.edit_message_text(
-            "📅 Обери іншу дату:", reply_markup=calendar_keyboard(now.year, now.month)
+            "📅 Обери іншу дату:", reply_markup=calendar_keyboard(now.year, now.month, lang)
         )
         return CONSULT_DATE
 
@@ -1736,7 +2403,7 @@ async def consult_time_callback(update: Update, context: CallbackContext) -> int
                     chat_id=MANAGER_CHAT_ID, text=msg, parse_mode="Markdown"
                 )
             except Exception as e:
-                logger.error(f"Помилка відправки повідомлення менеджеру: {e}")
+                logger.error("Помилка відправки повідомлення менеджеру: %s", e)
 
         await send_typing_action(context, query.message.chat_id, 1.0)
 
@@ -1759,6 +2426,78 @@ async def consult_time_callback(update: Update, context: CallbackContext) -> int
     return CONSULT_TIME
 
 
+# ---------------------- Історія активності ----------------------
+
+HISTORY_LABELS = {
+    "consultation": "📝 Консультація",
+    "quiz": "🎮 Квіз",
+    "material": "📚 Матеріал",
+}
+
+
+def history_keyboard(
+    rows: List[Tuple[int, str, str, str]], has_prev: bool, has_next: bool
+) -> InlineKeyboardMarkup:
+    """Навігація по історії; курсор (ts, id) передається в callback_data."""
+    nav = []
+    if rows and has_prev:
+        first_id, _, _, first_ts = rows[0]
+        nav.append(InlineKeyboardButton("◀️ Новіші", callback_data=f"hist_p_{first_ts}_{first_id}"))
+    if rows and has_next:
+        last_id, _, _, last_ts = rows[-1]
+        nav.append(InlineKeyboardButton("Старіші ▶️", callback_data=f"hist_n_{last_ts}_{last_id}"))
+
+    keyboard = [nav] if nav else []
+    keyboard.append([InlineKeyboardButton("🏠 Головне меню", callback_data="back_main")])
+    return InlineKeyboardMarkup(keyboard)
+
+
+def render_history(user_id: int, data: str = "hist_first") -> Tuple[str, InlineKeyboardMarkup]:
+    """Текст і клавіатура сторінки історії для callback_data виду hist_<n|p>_<ts>_<id>."""
+    cursor = None
+    direction = "next"
+    if data.startswith(("hist_n_", "hist_p_")):
+        _, mode, ts, row_id = data.split("_", 3)
+        cursor = (ts, int(row_id))
+        direction = "next" if mode == "n" else "prev"
+
+    rows, has_more = get_history_page(user_id, cursor, direction)
+
+    if direction == "next":
+        has_prev, has_next = cursor is not None, has_more
+    else:
+        has_prev, has_next = has_more, True
+
+    if not rows:
+        text = "🕘 **Твоя історія**\n\nПоки що тут порожньо. Отримай матеріал, пройди квіз або запишись на консультацію!"
+    else:
+        lines = [
+            f"{ts[:16].replace('T', ' ')} — {HISTORY_LABELS.get(kind, kind)}: {title}"
+            for _, kind, title, ts in rows
+        ]
+        text = "🕘 **Твоя історія**\n\n" + "\n".join(lines)
+
+    return text, history_keyboard(rows, has_prev, has_next)
+
+
+async def history_callback(update: Update, context: CallbackContext) -> int:
+    """Гортання історії активності."""
+    query = update.callback_query
+    await query.answer()
+    user = query.from_user
+    log_event(user.id, "history_click", query.data)
+
+    text, keyboard = render_history(user.id, query.data)
+    await query.edit_message_text(text, reply_markup=keyboard, parse_mode="Markdown")
+    return MAIN_MENU
+
+
+async def history_command(update: Update, context: CallbackContext) -> None:
+    """Обробник команди /history."""
+    text, keyboard = render_history(update.effective_user.id)
+    await update.message.reply_text(text, reply_markup=keyboard, parse_mode="Markdown")
+
+
 # ---------------------- /help та fallback ----------------------
 
 
@@ -1772,6 +2511,7 @@ async def help_command(update: Update, context: CallbackContext) -> None:
         "/stats — твоя статистика\n"
         "/calculator — калькулятор CPL/ROAS\n"
         "/quiz — тест на знання маркетингу\n"
+        "/history — твоя історія активності\n"
         "/help — ця довідка\n"
         "/cancel — скасувати поточну дію\n\n"
         "**Можливості:**\n"
@@ -1789,6 +2529,7 @@ async def help_command(update: Update, context: CallbackContext) -> None:
 
 async def cancel(update: Update, context: CallbackContext) -> int:
     """Скасування діалогу."""
+    context.user_data.pop("upload", None)
     await update.message.reply_text(
         "❌ Діалог завершено. Використай /start, щоб почати знову.",
         reply_markup=main_menu_keyboard(),
@@ -1807,20 +2548,7 @@ async def stats_command(update: Update, context: CallbackContext) -> None:
     """Обробник команди /stats."""
     user = update.effective_user
     stats = get_user_stats(user.id)
-    badges = calculate_badges(stats)
-
-    text = (
-        f"📊 **Твоя статистика**\n\n"
-        f"👤 Ім'я: {stats.get('name', 'Не вказано')}\n"
-        f"🏥 Тип бізнесу: {stats.get('business_type', 'Не вказано')}\n\n"
-        f"📈 **Активність:**\n"
-        f"📎 Файлів завантажено: {stats.get('files_uploaded', 0)}\n"
-        f"📚 Матеріалів отримано: {stats.get('materials_downloaded', 0)}\n"
-        f"📝 Консультацій запитано: {stats.get('consultations_requested', 0)}\n"
-        f"🎮 Квізів пройдено: {stats.get('quizzes_completed', 0)}\n\n"
-        f"🏆 **Твої бейджі:**\n"
-        f"{' '.join(badges)}"
-    )
+    text = render_stats(stats, messages.resolve_lang(user.language_code))
 
     keyboard = [[InlineKeyboardButton("🏠 Головне меню", callback_data="back_main")]]
 
@@ -1866,26 +2594,129 @@ async def quiz_command(update: Update, context: CallbackContext) -> None:
 # ---------------------- Запуск застосунку ----------------------
 
 
-def main() -> None:
-    """Головна функція запуску бота."""
-    if not TOKEN or TOKEN == "YOUR_TOKEN_HERE":
-        raise RuntimeError(
-            "❌ Не задано змінну середовища TELEGRAM_BOT_TOKEN\n"
-            "Встановіть токен: export TELEGRAM_BOT_TOKEN='ваш_токен'"
-        )
+def write_health(status: str) -> None:
+    """Запис стану бота у файл проби (mtime оновлюється heartbeat-ом)."""
+    payload = {"status": status, "pid": os.getpid(), "ts": datetime.utcnow().isoformat()}
+    tmp_path = f"{HEALTH_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, HEALTH_FILE)
+
 
-    logger.info("🚀 Запуск покращеного бота Медічі...")
-    init_db()
+async def health_heartbeat() -> None:
+    """Періодичне оновлення файлу проби, поки працює event loop."""
+    while True:
+        await asyncio.sleep(HEALTH_INTERVAL)
+        write_health("ready")
 
-    application = ApplicationBuilder().token(TOKEN).build()
 
+def remove_health() -> None:
+    """Видалення файлу проби при зупинці."""
+    try:
+        os.remove(HEALTH_FILE)
+    except FileNotFoundError:
+        pass
+
+
+class DrainingUpdateProcessor(SimpleUpdateProcessor):
+    """Обробник оновлень: порядок у межах користувача, ліміт — між користувачами.
+
+    Оновлення одного користувача (або чату, якщо користувача немає)
+    виконуються строго по черзі: ConversationHandler і context.user_data не
+    розраховані на паралельні зміни. Захист від флуду (admit_update) та
+    фільтр дублів callback діють при надходженні, до черги користувача. Глобальний семафор займається
+    лише після черги користувача, тож очікування одного користувача не
+    забирає слоти в інших. Облік оновлень у роботі — для плавної зупинки.
+    """
+
+    def __init__(self, max_concurrent_updates: int) -> None:
+        super().__init__(max_concurrent_updates)
+        self._in_flight: "set[asyncio.Task]" = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # ключ користувача/чату -> [lock, кількість оновлень у черзі]
+        self._queues: Dict[int, list] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    @staticmethod
+    def ordering_key(update: object) -> Optional[int]:
+        if not isinstance(update, Update):
+            return None
+        if update.effective_user:
+            return update.effective_user.id
+        if update.effective_chat:
+            return update.effective_chat.id
+        return None
+
+    async def process_update(self, update: object, coroutine) -> None:
+        task = asyncio.current_task()
+        self._in_flight.add(task)
+        self._idle.clear()
+        key = self.ordering_key(update)
+        try:
+            if key is None:
+                await super().process_update(update, coroutine)
+                return
+
+            queue = self._queues.setdefault(key, [asyncio.Lock(), 0])
+            queue[1] += 1
+            try:
+                admitted = await admit_update(update, queue[1] - 1)
+                if not admitted or await drop_duplicate_callback(update):
+                    # Обробники не запускалися — корутину закриваємо без очікування
+                    coroutine.close()
+                    return
+                # asyncio.Lock — FIFO, тож оновлення йдуть у порядку надходження
+                async with queue[0]:
+                    await super().process_update(update, coroutine)
+            finally:
+                queue[1] -= 1
+                if not queue[1]:
+                    del self._queues[key]
+        finally:
+            self._in_flight.discard(task)
+            if not self._in_flight:
+                self._idle.set()
+
+    async def do_process_update(self, update: object, coroutine) -> None:
+        await coroutine
+
+    async def drain(self, timeout: float) -> bool:
+        """Дочекатися завершення обробників; після дедлайну — скасувати решту."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            for task in list(self._in_flight):
+                task.cancel()
+            return False
+
+
+update_processor = DrainingUpdateProcessor(MAX_CONCURRENT_UPDATES)
+
+
+def build_application() -> Application:
+    """Створення застосунку та реєстрація всіх обробників."""
+    application = (
+        ApplicationBuilder()
+        .token(TOKEN)
+        .concurrent_updates(update_processor)
+        .build()
+    )
+
+    # Захист від флуду та фільтр дублів callback працюють в update_processor
     conv_handler = ConversationHandler(
         entry_points=[CommandHandler("start", start)],
         states={
             MAIN_MENU: [
-                CallbackQueryHandler(main_menu_callback),
+                # Обробники з pattern мають іти перед загальним main_menu_callback
                 CallbackQueryHandler(calculator_callback, pattern="^calc_"),
                 CallbackQueryHandler(quiz_start, pattern="^quiz_start$"),
+                CallbackQueryHandler(history_callback, pattern="^hist_"),
+                CallbackQueryHandler(main_menu_callback),
             ],
             DIALOG: [CallbackQueryHandler(dialog_callback)],
             MATERIALS: [CallbackQueryHandler(materials_callback)],
@@ -1932,25 +2763,157 @@ def main() -> None:
     application.add_handler(CommandHandler("stats", stats_command))
     application.add_handler(CommandHandler("calculator", calculator_command))
     application.add_handler(CommandHandler("quiz", quiz_command))
+    application.add_handler(CommandHandler("history", history_command))
+    # Гортання історії з /history поза розмовою
+    application.add_handler(CallbackQueryHandler(history_callback, pattern="^hist_"))
+
+    return application
+
+
+async def run_bot(application: Application) -> None:
+    """Запуск polling та плавна зупинка за SIGTERM/SIGINT.
+
+    Порядок зупинки: припинити отримання оновлень → дочекатися обробників,
+    що виконуються (не довше SHUTDOWN_DEADLINE) → зупинити застосунок →
+    checkpoint WAL → прибрати файл проби.
+    """
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows: лишається KeyboardInterrupt
+            pass
+
+    heartbeat = None
+    await application.initialize()
+    try:
+        await application.start()
+        await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
 
-    logger.info("✅ Покращений бот Медічі успішно запущено!")
-    logger.info("📊 Доступні функції:")
-    logger.info("  ⚡ Typing ефекти та анімації")
-    logger.info("  📊 Персональний Dashboard")
-    logger.info("  🔍 Розумний аналіз з прогрес-баром")
-    logger.info("  🧮 Інтерактивний калькулятор CPL/ROAS")
-    logger.info("  🎮 Міні-квіз з маркетингу")
-    logger.info("  📅 Inline календар для консультацій")
-    logger.info("  🏆 Система бейджів та досягнень")
+        write_health("ready")
+        heartbeat = asyncio.create_task(health_heartbeat())
+        logger.info("✅ Бот готовий, проба: %s", HEALTH_FILE)
 
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+        await stop_event.wait()
+        logger.info(
+            "⏹️ Отримано сигнал зупинки, обробників у роботі: %d", update_processor.in_flight
+        )
+        write_health("stopping")
+    finally:
+        if heartbeat:
+            heartbeat.cancel()
+        if application.updater.running:
+            await application.updater.stop()
+        if not await update_processor.drain(SHUTDOWN_DEADLINE):
+            logger.warning(
+                "Обробники не завершились за %.0f с і були скасовані", SHUTDOWN_DEADLINE
+            )
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+
+        checkpoint_db()
+        remove_health()
+        logger.info("Бот зупинено. Відкинуто флуд-оновлень: %d", flood_guard.metrics["shed"])
+
+
+def profile_startup() -> None:
+    """Вивід розбивки часу імпортів та етапів старту (--profile-startup)."""
+    global DB_PATH
+    import subprocess
+    import tempfile
+
+    # Окремий процес: у поточному telegram уже імпортовано, тож його
+    # вартість видно лише при холодному імпорті модуля
+    bot_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import medici_bot_enhanced"],
+        cwd=bot_dir,
+        capture_output=True,
+        text=True,
+    )
 
+    # Рядки формату: "import time: self [us] | cumulative | imported package",
+    # вкладеність - по 2 пробіли; дочірні імпорти йдуть перед батьківським
+    children: List[Tuple[int, str]] = []
+    direct: List[Tuple[int, str]] = []
+    module_self = 0
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[0].startswith("import time:"):
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        try:
+            self_us, cumulative = int(parts[0].split(":")[1]), int(parts[1])
+        except ValueError:
+            continue
+        if depth == 1:
+            children.append((cumulative, name.strip()))
+        elif depth == 0:
+            if name.strip() == "medici_bot_enhanced":
+                direct, module_self = children, self_us
+            children = []
+
+    print("⏱️ Імпорти medici_bot_enhanced (кумулятивно):")
+    for cumulative, name in sorted(direct, reverse=True)[:15]:
+        print(f"  {cumulative / 1000:8.1f} мс  {name}")
+    print(f"  {module_self / 1000:8.1f} мс  тіло модуля")
+    print(f"  {(sum(c for c, _ in direct) + module_self) / 1000:8.1f} мс  всього")
+
+    # init_db() на тимчасовій базі: профілювання не мігрує робочу DB_PATH
+    print("⏱️ Етапи старту:")
+    production_db = DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        DB_PATH = os.path.join(tmp, "profile.db")
+        try:
+            for title, func in (("init_db", init_db), ("build_application", build_application)):
+                started = time.perf_counter()
+                func()
+                print(f"  {(time.perf_counter() - started) * 1000:8.1f} мс  {title}")
+        finally:
+            DB_PATH = production_db
 
-if __name__ == "__main__":
+
+def main() -> None:
+    """Головна функція запуску бота."""
+    if "--profile-startup" in sys.argv:
+        profile_startup()
+        return
+
+    listener = setup_logging()
     try:
-        main()
+        if not TOKEN or TOKEN == "YOUR_TOKEN_HERE":
+            raise RuntimeError(
+                "❌ Не задано змінну середовища TELEGRAM_BOT_TOKEN\n"
+                "Встановіть токен: export TELEGRAM_BOT_TOKEN='ваш_токен'"
+            )
+
+        logger.info("🚀 Запуск покращеного бота Медічі...")
+        write_health("starting")
+        init_db()
+        cleanup_spool()
+        application = build_application()
+        application.job_queue.run_repeating(
+            cleanup_spool_job, interval=SPOOL_CLEANUP_INTERVAL, first=SPOOL_CLEANUP_INTERVAL
+        )
+
+        logger.info(
+            "Обробників зареєстровано: %d",
+            sum(len(handlers) for handlers in application.handlers.values()),
+        )
+
+        asyncio.run(run_bot(application))
     except KeyboardInterrupt:
         logger.info("⏹️ Бот зупинено користувачем")
     except Exception as e:
-        logger.error(f"❌ Критична помилка: {e}")
+        logger.exception("❌ Критична помилка: %s", e)
+    finally:
+        # Дописати чергу логів у потік і зупинити фоновий потік
+        listener.stop()
 
+
+if __name__ == "__main__":
+    main()
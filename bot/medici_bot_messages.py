@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Каталог шаблонів повідомлень бота "Медічі" з локалізацією
+
+Шаблони завантажуються з locales/<мова>.json один раз при старті та
+перевіряються; статичні тексти (наприклад, результати аналізу матеріалів)
+рендеряться одразу. Кожен шаблон з плейсхолдерами компілюється в функцію
+з f-string (для кожної локалі окремо), тож рендер — це виклик
+скомпільованої функції, а не розбір шаблону через str.format_map.
+
+Мови, що віддаються користувачам, обмежені списком enabled (BOT_LOCALES у
+боті): локаль вмикається, коли в неї перенесено всі тексти бота, інакше
+користувач отримає змішаний інтерфейс.
+
+Бенчмарк вартості рендеру одного повідомлення:
+    python3 medici_bot_messages.py
+"""
+
+import json
+import string
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+LOCALES_DIR = Path(__file__).parent / "locales"
+DEFAULT_LANG = "uk"
+
+Renderer = Callable[..., str]
+
+
+def compile_template(template: str) -> Renderer:
+    """Функція рендеру шаблону через f-string.
+
+    Синтаксис str.format з простими іменами полів ({name}, {score:.1f},
+    {{ }}) збігається з f-string, тож шаблон компілюється як є; поля стають
+    keyword-only аргументами. Шаблони без полів повертають готовий рядок, а
+    поля, яких f-string не виразить (атрибути, індекси, вкладені поля у
+    специфікації), рендеряться через format_map.
+    """
+    fields = []
+    for _, field, spec, _ in string.Formatter().parse(template):
+        if field is None:
+            continue
+        if not field.isidentifier() or (spec and "{" in spec):
+            return lambda **params: template.format_map(params)
+        fields.append(field)
+    if not fields:
+        return lambda **_: template
+
+    args = ", ".join(dict.fromkeys(fields))
+    source = f"lambda *, {args}, **_: f{template!r}"
+    return eval(compile(source, "<locale>", "eval"), {"__builtins__": {}})
+
+
+class MessageCatalog:
+    """Скомпільований каталог шаблонів для всіх доступних мов."""
+
+    def __init__(
+        self,
+        locales_dir: Path = LOCALES_DIR,
+        default_lang: str = DEFAULT_LANG,
+        enabled: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.default_lang = default_lang
+        # lang -> key -> скомпільований рендер (кеш на локаль)
+        self._renderers: Dict[str, Dict[str, Renderer]] = {}
+        # lang -> key -> статичні дані (списки, готові тексти)
+        self._data: Dict[str, Dict] = {}
+
+        raw = {
+            path.stem: json.loads(path.read_text(encoding="utf-8"))
+            for path in sorted(Path(locales_dir).glob("*.json"))
+        }
+        if default_lang not in raw:
+            raise RuntimeError(f"Не знайдено локаль за замовчуванням: {default_lang}")
+
+        for lang, messages in raw.items():
+            # Відсутні ключі беруться з мови за замовчуванням
+            self._compile(lang, {**raw[default_lang], **messages})
+
+        # Мови для користувачів: мова за замовчуванням завжди доступна
+        self.enabled = frozenset(self._renderers if enabled is None else enabled) & set(self._renderers)
+        self.enabled |= {default_lang}
+
+    @property
+    def languages(self) -> Tuple[str, ...]:
+        return tuple(sorted(self._renderers))
+
+    def _compile(self, lang: str, messages: Dict) -> None:
+        """Перевірка шаблонів та підготовка статичних даних локалі."""
+        renderers: Dict[str, Renderer] = {}
+        data: Dict = {}
+
+        for key, value in messages.items():
+            if key == "analysis":
+                continue
+            if isinstance(value, str):
+                # Помилки в плейсхолдерах виявляються при старті, а не в обробнику
+                renderers[key] = compile_template(value)
+            elif isinstance(value, list):
+                data[key] = tuple(value)
+            else:
+                data[key] = value
+
+        # Місяці з індексацією від 1, як у datetime
+        for key in ("month_names", "month_names_genitive"):
+            data[key] = ("",) + data[key]
+
+        template = messages["analysis"]
+        data["analysis"] = {
+            material_type: template.format(
+                score=item["score"],
+                stars="⭐" * int(item["score"]) + "☆" * (10 - int(item["score"])),
+                good="\n".join(item["good"]),
+                improve="\n".join(item["improve"]),
+                tips="\n".join(item["tips"]),
+            )
+            for material_type, item in data.pop("recommendations").items()
+        }
+
+        self._renderers[lang] = renderers
+        self._data[lang] = data
+
+    def resolve_lang(self, language_code: Optional[str]) -> str:
+        """Мова каталогу для language_code користувача Telegram (напр. "en-US")."""
+        if language_code:
+            lang = language_code.split("-")[0].lower()
+            if lang in self.enabled:
+                return lang
+        return self.default_lang
+
+    def get(self, key: str, lang: Optional[str] = None):
+        """Статичні дані каталогу (наприклад, кортеж назв місяців)."""
+        return self._data[lang or self.default_lang][key]
+
+    def renderer(self, key: str, lang: Optional[str] = None) -> Renderer:
+        """Скомпільований рендер шаблону локалі: виклик з keyword-аргументами.
+
+        Для гарячих шляхів — без повторного пакування параметрів у render().
+        """
+        return self._renderers[lang or self.default_lang][key]
+
+    def render(self, key: str, lang: Optional[str] = None, **params) -> str:
+        """Рендер шаблону з підстановкою параметрів."""
+        return self._renderers[lang or self.default_lang][key](**params)
+
+    def analysis(self, material_type: str, lang: Optional[str] = None) -> str:
+        """Готовий текст результату аналізу матеріалу."""
+        prerendered = self._data[lang or self.default_lang]["analysis"]
+        return prerendered.get(material_type, prerendered["type_banner"])
+
+
+# ---------------------- Бенчмарк ----------------------
+
+
+def _legacy_stats(stats: Dict, badges) -> str:
+    """Збирання тексту статистики так, як це робили обробники до каталогу."""
+    return (
+        f"📊 **Твоя статистика**\n\n"
+        f"👤 Ім'я: {stats.get('name', 'Не вказано')}\n"
+        f"🏥 Тип бізнесу: {stats.get('business_type', 'Не вказано')}\n\n"
+        f"📈 **Активність:**\n"
+        f"📎 Файлів завантажено: {stats.get('files_uploaded', 0)}\n"
+        f"📚 Матеріалів отримано: {stats.get('materials_downloaded', 0)}\n"
+        f"📝 Консультацій запитано: {stats.get('consultations_requested', 0)}\n"
+        f"🎮 Квізів пройдено: {stats.get('quizzes_completed', 0)}\n\n"
+        f"🏆 **Твої бейджі:**\n"
+        f"{' '.join(badges)}"
+    )
+
+
+def _legacy_analysis(analysis: Dict) -> str:
+    """Збирання тексту аналізу конкатенацією в циклах."""
+    score = analysis["score"]
+    stars = "⭐" * int(score) + "☆" * (10 - int(score))
+    text = (
+        f"✅ **Аналіз завершено!**\n\n"
+        f"📊 **Загальна оцінка:** {score}/10\n"
+        f"{stars}\n\n"
+        f"**✅ Що добре:**\n"
+    )
+    for item in analysis["good"]:
+        text += f"{item}\n"
+    text += "\n**⚠️ Що покращити:**\n"
+    for item in analysis["improve"]:
+        text += f"{item}\n"
+    text += "\n**💡 Додаткові поради:**\n"
+    for item in analysis["tips"]:
+        text += f"{item}\n"
+    return text
+
+
+def benchmark(number: int = 100000) -> None:
+    """Вартість рендеру одного повідомлення: каталог проти f-string збирання."""
+    load_time = timeit.timeit(MessageCatalog, number=20) / 20
+    catalog = MessageCatalog()
+
+    stats = {
+        "name": "Олена",
+        "business_type": "Клініка",
+        "files_uploaded": 3,
+        "materials_downloaded": 5,
+        "consultations_requested": 1,
+        "quizzes_completed": 2,
+    }
+    badges = ["📎 Перший файл", "📚 Книголюб", "🧠 Ерудит"]
+    raw = json.loads((LOCALES_DIR / f"{DEFAULT_LANG}.json").read_text(encoding="utf-8"))
+    recommendation = raw["recommendations"]["type_text"]
+
+    def catalog_stats(stats: Dict, badges, lang: str = DEFAULT_LANG) -> str:
+        # Як render_stats у боті: рендер локалі з явними аргументами
+        default = catalog.render("stats_default_value", lang)
+        return catalog.renderer("stats", lang)(
+            name=stats.get("name", default),
+            business_type=stats.get("business_type", default),
+            files_uploaded=stats.get("files_uploaded", 0),
+            materials_downloaded=stats.get("materials_downloaded", 0),
+            consultations_requested=stats.get("consultations_requested", 0),
+            quizzes_completed=stats.get("quizzes_completed", 0),
+            badges=" ".join(badges),
+        )
+
+    assert catalog.analysis("type_text") == _legacy_analysis(recommendation)
+    assert catalog_stats(stats, badges) == _legacy_stats(stats, badges)
+
+    cases = [
+        ("stats (f-string)", lambda: _legacy_stats(stats, badges)),
+        ("stats (каталог)", lambda: catalog_stats(stats, badges)),
+        ("analysis (цикли)", lambda: _legacy_analysis(recommendation)),
+        ("analysis (каталог)", lambda: catalog.analysis("type_text")),
+        ("date_selected (каталог)", lambda: catalog.render(
+            "date_selected", day=5, month=catalog.get("month_names_genitive")[5], year=2025
+        )),
+    ]
+
+    print(f"Завантаження каталогу ({', '.join(catalog.languages)}): {load_time * 1e3:.2f} мс")
+    for name, func in cases:
+        per_call = timeit.timeit(func, number=number) / number
+        print(f"  {name:<26} {per_call * 1e6:8.3f} мкс/повідомлення")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Звіти та воронки по базі даних бота "Медічі"
+
+Воронка (start → upload → консультація), розподіл балів квізу та щоденні
+лічильники дій з таблиць events, quiz_results і consultations.
+
+Усі звіти — агрегатні запити по індексах; рядки результату пишуться в
+CSV/JSON Lines одразу з курсора, без fetchall(), тож інструмент працює і на
+десятках мільйонів подій. Режим --incremental рахує лише нові дані з
+моменту попереднього запуску. Кожен запит обмежений зверху моментом
+старту звіту (ts < until): рядки, вставлені ботом під час звіту, потраплять
+лише в наступний запуск, а не в обидва.
+
+Воронка рахується по когортах: користувач належить вікну (--since або
+час попереднього --incremental запуску) за своїм ПЕРШИМ start, а наступні
+етапи зараховуються, якщо відбулися після цього start — у будь-який час до
+моменту звіту. Тож користувач, що почав до межі вікна і конвертувався після
+неї, лишається у своїй когорті (і не з'являється в наступному вікні без
+start), а конверсії когорти, що відбулися вже після її звіту, видно при
+повторному запуску з --since початку когорти.
+
+Використання:
+    python3 medici_bot_report.py funnel
+    python3 medici_bot_report.py daily --format json --incremental
+    python3 medici_bot_report.py quiz --since 2025-01-01 --output quiz.csv
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+DB_PATH = "medici_bot.db"
+
+# Версія схеми бота (PRAGMA user_version), з якою init_db створює індекси звітів
+REPORT_SCHEMA_VERSION = 3
+
+# Етапи воронки: (назва, таблиця, умова). Перший етап задає когорту
+FUNNEL_STAGES = (
+    ("start", "events", "action = 'start'"),
+    ("upload", "events", "action = 'upload_received'"),
+    ("consultation", "consultations", "1 = 1"),
+)
+
+FETCH_BATCH = 5000
+
+
+# ---------------------- Підключення та стан ----------------------
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Підключення до БД та таблиця стану звітів.
+
+    Індекси звітів створює міграція бота (init_db); на старій схемі звіт
+    працює, але повним скануванням, про що виводиться попередження.
+    """
+    conn = sqlite3.connect(db_path)
+    # Тимчасові b-tree для GROUP BY тримаємо в пам'яті
+    conn.execute("PRAGMA temp_store = MEMORY")
+    user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if user_version < REPORT_SCHEMA_VERSION:
+        print(
+            f"⚠️  Схема БД версії {user_version}: індексів звітів немає, "
+            "запусти бота для міграції (init_db)",
+            file=sys.stderr,
+        )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS report_state (
+            report TEXT PRIMARY KEY,
+            last_run TEXT
+        )
+        """
+    )
+    conn.commit()
+    return conn
+
+
+def get_last_run(conn: sqlite3.Connection, report: str) -> Optional[str]:
+    """Час попереднього запуску звіту (ISO) або None."""
+    row = conn.execute(
+        "SELECT last_run FROM report_state WHERE report = ?", (report,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set_last_run(conn: sqlite3.Connection, report: str, ts: str) -> None:
+    """Запам'ятати час запуску звіту для наступного інкрементального прогону."""
+    conn.execute(
+        """
+        INSERT INTO report_state (report, last_run) VALUES (?, ?)
+        ON CONFLICT(report) DO UPDATE SET last_run = excluded.last_run
+        """,
+        (report, ts),
+    )
+    conn.commit()
+
+
+def iter_rows(cursor: sqlite3.Cursor) -> Iterator[Tuple]:
+    """Потокове читання курсора порціями."""
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH)
+        if not rows:
+            return
+        yield from rows
+
+
+# ---------------------- Звіти ----------------------
+
+
+def funnel_report(
+    conn: sqlite3.Connection, since: str, until: str
+) -> Tuple[List[str], Iterable[Tuple]]:
+    """Когортна воронка: start → upload → консультація.
+
+    Когорта — користувачі, чий перший start припадає на since <= ts < until;
+    етап зараховується, якщо подія етапу є після першого start користувача
+    і до until.
+    """
+    _, cohort_table, cohort_condition = FUNNEL_STAGES[0]
+    flags = []
+    for name, table, condition in FUNNEL_STAGES[1:]:
+        flags.append(
+            f"EXISTS (SELECT 1 FROM {table} AS s WHERE {condition} "
+            f"AND s.user_id = cohort.user_id "
+            f"AND s.ts >= cohort.first_ts AND s.ts < :until) AS {name}"
+        )
+
+    # Кожен етап рахується серед користувачів, що пройшли всі попередні
+    counts = ["COUNT(*)"]
+    for i in range(1, len(FUNNEL_STAGES)):
+        names = [stage[0] for stage in FUNNEL_STAGES[1: i + 1]]
+        counts.append(f"COALESCE(SUM({' AND '.join(names)}), 0)")
+
+    sql = f"""
+        WITH cohort AS (
+            SELECT user_id, MIN(ts) AS first_ts
+            FROM {cohort_table}
+            WHERE {cohort_condition}
+            GROUP BY user_id
+            HAVING MIN(ts) >= :since AND MIN(ts) < :until
+        ),
+        stages AS (SELECT {', '.join(flags)} FROM cohort)
+        SELECT {', '.join(counts)} FROM stages
+    """
+    row = conn.execute(sql, {"since": since, "until": until}).fetchone()
+
+    def rows() -> Iterator[Tuple]:
+        top = row[0] or 0
+        previous = top
+        for (name, _, _), users in zip(FUNNEL_STAGES, row):
+            from_top = round(users * 100.0 / top, 2) if top else 0.0
+            from_previous = round(users * 100.0 / previous, 2) if previous else 0.0
+            previous = users
+            yield name, users, from_top, from_previous
+
+    return ["stage", "users", "pct_of_start", "pct_of_previous"], rows()
+
+
+def quiz_report(
+    conn: sqlite3.Connection, since: str, until: str
+) -> Tuple[List[str], Iterable[Tuple]]:
+    """Розподіл балів квізу."""
+    cursor = conn.execute(
+        """
+        SELECT score, max_score, COUNT(*)
+        FROM quiz_results
+        WHERE ts >= ? AND ts < ?
+        GROUP BY score, max_score
+        ORDER BY max_score, score
+        """,
+        (since, until),
+    )
+    return ["score", "max_score", "attempts"], iter_rows(cursor)
+
+
+def daily_report(
+    conn: sqlite3.Connection, since: str, until: str
+) -> Tuple[List[str], Iterable[Tuple]]:
+    """Кількість дій по днях."""
+    cursor = conn.execute(
+        """
+        SELECT substr(ts, 1, 10) AS day, action, COUNT(*)
+        FROM events
+        WHERE ts >= ? AND ts < ?
+        GROUP BY day, action
+        ORDER BY day, action
+        """,
+        (since, until),
+    )
+    return ["day", "action", "events"], iter_rows(cursor)
+
+
+REPORTS = {
+    "funnel": funnel_report,
+    "quiz": quiz_report,
+    "daily": daily_report,
+}
+
+
+# ---------------------- Вивід ----------------------
+
+
+def write_csv(out: TextIO, columns: Sequence[str], rows: Iterable[Tuple]) -> int:
+    """Запис рядків у CSV. Повертає кількість рядків."""
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_json(out: TextIO, columns: Sequence[str], rows: Iterable[Tuple]) -> int:
+    """Запис рядків у JSON Lines (один об'єкт на рядок)."""
+    count = 0
+    for row in rows:
+        out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+WRITERS = {"csv": write_csv, "json": write_json}
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Звіти по базі даних бота Медічі")
+    parser.add_argument("report", choices=sorted(REPORTS), help="тип звіту")
+    parser.add_argument("--db", default=DB_PATH, help=f"шлях до БД (за замовчуванням {DB_PATH})")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--output", help="файл для запису (за замовчуванням stdout)")
+    parser.add_argument("--since", help="лише дані з цієї дати/часу (ISO, UTC)")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="лише дані з моменту попереднього інкрементального запуску",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    conn = connect(args.db)
+
+    started_at = datetime.utcnow().isoformat()
+    since = args.since or ""
+    if args.incremental:
+        since = max(since, get_last_run(conn, args.report) or "")
+
+    columns, rows = REPORTS[args.report](conn, since, started_at)
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        count = WRITERS[args.format](out, columns, rows)
+    finally:
+        if args.output:
+            out.close()
+
+    if args.incremental:
+        set_last_run(conn, args.report, started_at)
+    conn.close()
+
+    print(f"✅ {args.report}: {count} рядків", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,13 +12,19 @@
  * • Fonts preload (with crossorigin attribute)
  * • Local fonts @font-face declarations
  * • Script enqueuing (modular architecture)
+ * • Minified content-hashed bundles (dist/manifest.json)
+ * • Subset Montserrat faces with unicode-range (fonts/subset/manifest.json)
  * • Script deferring (GeneratePress compatible)
  * • Resource hints management
  * • Google Fonts removal
  * • Exit-intent overlay popup (GenerateBlocks Pro 2.3+ Overlay Panel)
  *
- * @version 2.0.0
+ * @version 2.3.0
  * @since   1.3.2
+ * @changelog 2.3.0 - Critical CSS лише на головній, стилі під ним - без блокування рендеру (preload)
+ * @changelog 2.2.1 - Відкладений бандл форм medici-event-forms (не в medici-events без defer)
+ * @changelog 2.2.0 - Subsets шрифтів з unicode-range (scripts/subset_fonts.py)
+ * @changelog 2.1.0 - Бандли з хешем вмісту з dist/manifest.json (scripts/build_assets.py)
  * @changelog 2.0.0 - Рефакторинг до GenerateBlocks Overlay Panel (exit-intent-overlay.css/js)
  * @changelog 1.5.2 - Видалено defer для medici-events та medici-exit-intent (dependency conflict)
  * @changelog 1.5.1 - Видалено wp_is_mobile() для exit-intent (JS сам перевіряє ширину екрану)
@@ -45,24 +51,146 @@
 	define( 'MEDICI_THEME_URI', get_stylesheet_directory_uri() );
 }
 
+// ============================================================================
+// ASSET MANIFEST (scripts/build_assets.py)
+// ============================================================================
+
+/**
+ * Get manifest of minified, content-hashed bundles
+ *
+ * dist/manifest.json генерує scripts/build_assets.py. Без нього (або з
+ * SCRIPT_DEBUG) підключаються вихідні файли з версією filemtime().
+ *
+ * @return array<string, array<string, mixed>> Manifest або порожній масив
+ */
+function medici_get_asset_manifest(): array {
+	static $manifest = null;
+
+	if ( null !== $manifest ) {
+		return $manifest;
+	}
+
+	$manifest      = array();
+	$manifest_path = MEDICI_THEME_DIR . '/dist/manifest.json';
+
+	if ( ( defined( 'SCRIPT_DEBUG' ) && SCRIPT_DEBUG ) || ! file_exists( $manifest_path ) ) {
+		return $manifest;
+	}
+
+	$data = json_decode( (string) file_get_contents( $manifest_path ), true );
+	if ( is_array( $data ) ) {
+		$manifest = $data;
+	}
+
+	return $manifest;
+}
+
+/**
+ * Resolve asset URL and version: hashed bundle or source file
+ *
+ * @param string $type   'styles' або 'scripts'.
+ * @param string $handle WordPress handle.
+ * @param string $path   Шлях вихідного файлу від кореня теми.
+ * Hash - хеш вмісту бандла з імені файлу або filemtime() джерела (для
+ * версій у mediciData).
+ *
+ * @return array{src: string, ver: string|int|null, hash: string}|null Null, якщо джерело входить до іншого бандла
+ */
+function medici_asset( string $type, string $handle, string $path ): ?array {
+	$manifest = medici_get_asset_manifest();
+	$bundle   = $manifest['merged'][ $type ][ $handle ] ?? null;
+
+	if ( null !== $bundle && isset( $manifest[ $type ][ $bundle ] ) ) {
+		return null;
+	}
+
+	if ( ! empty( $manifest[ $type ][ $handle ]['file'] ) ) {
+		$file = (string) $manifest[ $type ][ $handle ]['file'];
+		$name = pathinfo( $file, PATHINFO_FILENAME ); // <назва>.<хеш>
+
+		// Хеш вмісту вже в імені файлу - ?ver не потрібен
+		return array(
+			'src'  => MEDICI_THEME_URI . '/dist/' . $file,
+			'ver'  => null,
+			'hash' => substr( $name, (int) strrpos( $name, '.' ) + 1 ),
+		);
+	}
+
+	$file_path = MEDICI_THEME_DIR . $path;
+	$ver       = file_exists( $file_path ) ? filemtime( $file_path ) : MEDICI_VERSION;
+
+	return array(
+		'src'  => MEDICI_THEME_URI . $path,
+		'ver'  => $ver,
+		'hash' => (string) $ver,
+	);
+}
+
 // ============================================================================
 // CRITICAL CSS INLINING
 // ============================================================================
 
 /**
- * Output critical CSS inline in <head>
+ * Get handles of stylesheets covered by critical CSS
  *
- * @return void
+ * Відповідає SOURCE_STYLESHEETS у scripts/critical_css.py (разом з бандлом
+ * medici-core з dist/manifest.json).
+ *
+ * @return array<int, string>
  */
-function medici_critical_css(): void {
+function medici_critical_style_handles(): array {
+	return array(
+		'medici-variables',
+		'medici-core',
+		'medici-buttons',
+		'medici-sections',
+		'medici-navigation',
+		'medici-lazy-load',
+		'medici-layout',
+		'medici-child-theme',
+	);
+}
+
+/**
+ * Get critical CSS for the current page
+ *
+ * css/critical.css витягнуто з першого екрану головної (HEADER + HERO),
+ * тож він застосовується лише там; на інших сторінках перший екран
+ * інший, і таблиці стилів лишаються блокуючими.
+ *
+ * @return string CSS або порожній рядок
+ */
+function medici_get_critical_css(): string {
+	static $critical_css = null;
+
+	if ( null !== $critical_css ) {
+		return $critical_css;
+	}
+
+	$critical_css      = '';
 	$critical_css_path = MEDICI_THEME_DIR . '/css/critical.css';
 
-	if ( ! file_exists( $critical_css_path ) ) {
-		return;
+	if ( ! is_front_page() || ! file_exists( $critical_css_path ) ) {
+		return $critical_css;
+	}
+
+	$content = file_get_contents( $critical_css_path );
+	if ( false !== $content && '' !== trim( $content ) ) {
+		$critical_css = $content;
 	}
 
-	$critical_css = file_get_contents( $critical_css_path );
-	if ( false === $critical_css || '' === trim( $critical_css ) ) {
+	return $critical_css;
+}
+
+/**
+ * Output critical CSS inline in <head>
+ *
+ * @return void
+ */
+function medici_critical_css(): void {
+	$critical_css = medici_get_critical_css();
+
+	if ( '' === $critical_css ) {
 		return;
 	}
 
@@ -71,6 +199,41 @@ function medici_critical_css(): void {
 }
 add_action( 'wp_head', 'medici_critical_css', 1 );
 
+/**
+ * Load stylesheets covered by critical CSS without blocking render
+ *
+ * Коли critical.css вбудовано, повні таблиці стилів підключаються як
+ * preload і стають stylesheet після завантаження (<noscript> - без JS).
+ * Позиція <link> не змінюється, тож порядок каскаду той самий.
+ *
+ * @param string $tag    Link HTML tag.
+ * @param string $handle Style handle.
+ * @return string Modified link tag
+ */
+function medici_async_critical_styles( string $tag, string $handle ): string {
+	if ( is_admin() || ! in_array( $handle, medici_critical_style_handles(), true ) ) {
+		return $tag;
+	}
+
+	if ( '' === medici_get_critical_css() ) {
+		return $tag;
+	}
+
+	$preload = preg_replace(
+		'/rel=([\'"])stylesheet\1/',
+		'rel="preload" as="style" onload="this.onload=null;this.rel=\'stylesheet\'"',
+		$tag,
+		1
+	);
+
+	if ( null === $preload || $preload === $tag ) {
+		return $tag;
+	}
+
+	return $preload . '<noscript>' . trim( $tag ) . "</noscript>\n";
+}
+add_filter( 'style_loader_tag', 'medici_async_critical_styles', 10, 2 );
+
 // ============================================================================
 // ENQUEUE STYLES & SCRIPTS
 // ============================================================================
@@ -82,7 +245,6 @@ function medici_critical_css(): void {
  */
 function medici_enqueue_assets(): void {
 	$theme_dir = MEDICI_THEME_DIR;
-	$theme_uri = MEDICI_THEME_URI;
 
 	// Parent theme CSS
 	$parent_theme   = wp_get_theme()->parent();
@@ -107,11 +269,18 @@ function medici_enqueue_assets(): void {
 		$file_path = $theme_dir . $path;
 
 		if ( file_exists( $file_path ) ) {
+			$asset = medici_asset( 'styles', $handle, $path );
+
+			// Джерело входить до бандла, підключеного раніше
+			if ( null === $asset ) {
+				continue;
+			}
+
 			wp_enqueue_style(
 				$handle,
-				$theme_uri . $path,
+				$asset['src'],
 				array( $last_handle ),
-				filemtime( $file_path )
+				$asset['ver']
 			);
 			$last_handle = $handle;
 		}
@@ -129,11 +298,18 @@ function medici_enqueue_assets(): void {
 		$file_path = $theme_dir . $path;
 
 		if ( file_exists( $file_path ) ) {
+			$asset = medici_asset( 'styles', $handle, $path );
+
+			// Джерело входить до бандла, підключеного раніше
+			if ( null === $asset ) {
+				continue;
+			}
+
 			wp_enqueue_style(
 				$handle,
-				$theme_uri . $path,
+				$asset['src'],
 				array( $last_handle ),
-				filemtime( $file_path )
+				$asset['ver']
 			);
 			$last_handle = $handle;
 		}
@@ -145,13 +321,18 @@ function medici_enqueue_assets(): void {
 		$cards_css_path = $theme_dir . '/css/components/cards.css';
 
 		if ( file_exists( $cards_css_path ) ) {
-			wp_enqueue_style(
-				'medici-cards',
-				$theme_uri . '/css/components/cards.css',
-				array( $last_handle ),
-				filemtime( $cards_css_path )
-			);
-			$last_handle = 'medici-cards';
+			$asset = medici_asset( 'styles', 'medici-cards', '/css/components/cards.css' );
+
+			// Null - джерело входить до іншого бандла (dist/manifest.json)
+			if ( null !== $asset ) {
+				wp_enqueue_style(
+					'medici-cards',
+					$asset['src'],
+					array( $last_handle ),
+					$asset['ver']
+				);
+				$last_handle = 'medici-cards';
+			}
 		}
 	}
 
@@ -160,13 +341,18 @@ function medici_enqueue_assets(): void {
 		$faq_css_path = $theme_dir . '/css/components/faq.css';
 
 		if ( file_exists( $faq_css_path ) ) {
-			wp_enqueue_style(
-				'medici-faq',
-				$theme_uri . '/css/components/faq.css',
-				array( $last_handle ),
-				filemtime( $faq_css_path )
-			);
-			$last_handle = 'medici-faq';
+			$asset = medici_asset( 'styles', 'medici-faq', '/css/components/faq.css' );
+
+			// Null - джерело входить до іншого бандла (dist/manifest.json)
+			if ( null !== $asset ) {
+				wp_enqueue_style(
+					'medici-faq',
+					$asset['src'],
+					array( $last_handle ),
+					$asset['ver']
+				);
+				$last_handle = 'medici-faq';
+			}
 		}
 	}
 
@@ -179,11 +365,18 @@ function medici_enqueue_assets(): void {
 		$file_path = $theme_dir . $path;
 
 		if ( file_exists( $file_path ) ) {
+			$asset = medici_asset( 'styles', $handle, $path );
+
+			// Джерело входить до бандла, підключеного раніше
+			if ( null === $asset ) {
+				continue;
+			}
+
 			wp_enqueue_style(
 				$handle,
-				$theme_uri . $path,
+				$asset['src'],
 				array( $last_handle ),
-				filemtime( $file_path )
+				$asset['ver']
 			);
 			$last_handle = $handle;
 		}
@@ -194,26 +387,33 @@ function medici_enqueue_assets(): void {
 		$widgets_css_path = $theme_dir . '/inc/widgets/widget-styles.css';
 
 		if ( file_exists( $widgets_css_path ) ) {
-			wp_enqueue_style(
-				'medici-widgets',
-				$theme_uri . '/inc/widgets/widget-styles.css',
-				array( $last_handle ),
-				filemtime( $widgets_css_path )
-			);
-			$last_handle = 'medici-widgets';
+			$asset = medici_asset( 'styles', 'medici-widgets', '/inc/widgets/widget-styles.css' );
+
+			// Null - джерело входить до іншого бандла (dist/manifest.json)
+			if ( null !== $asset ) {
+				wp_enqueue_style(
+					'medici-widgets',
+					$asset['src'],
+					array( $last_handle ),
+					$asset['ver']
+				);
+				$last_handle = 'medici-widgets';
+			}
 		}
 	}
 
 	// ===== MAIN THEME CSS =====
-	$child_css_path = $theme_dir . '/style.css';
-	$css_ver        = file_exists( $child_css_path ) ? filemtime( $child_css_path ) : MEDICI_VERSION;
-
-	wp_enqueue_style(
-		'medici-child-theme',
-		get_stylesheet_directory_uri() . '/style.css',
-		array( $last_handle ),
-		$css_ver
-	);
+	$child_css = medici_asset( 'styles', 'medici-child-theme', '/style.css' );
+
+	// Null - джерело входить до іншого бандла (dist/manifest.json)
+	if ( null !== $child_css ) {
+		wp_enqueue_style(
+			'medici-child-theme',
+			$child_css['src'],
+			array( $last_handle ),
+			$child_css['ver']
+		);
+	}
 
 	// ===== FORMS CSS (Conditional - only on pages with forms) =====
 	// Forms used on: contact page, consultation page, single posts (comments), pages with shortcodes
@@ -231,12 +431,17 @@ function medici_enqueue_assets(): void {
 		$forms_css_path = $theme_dir . '/css/components/forms.css';
 
 		if ( file_exists( $forms_css_path ) ) {
-			wp_enqueue_style(
-				'medici-forms',
-				$theme_uri . '/css/components/forms.css',
-				array( 'medici-child-theme' ),
-				filemtime( $forms_css_path )
-			);
+			$asset = medici_asset( 'styles', 'medici-forms', '/css/components/forms.css' );
+
+			// Null - джерело входить до іншого бандла (dist/manifest.json)
+			if ( null !== $asset ) {
+				wp_enqueue_style(
+					'medici-forms',
+					$asset['src'],
+					array( 'medici-child-theme' ),
+					$asset['ver']
+				);
+			}
 		}
 	}
 
@@ -245,25 +450,35 @@ function medici_enqueue_assets(): void {
 		$blog_css_path = $theme_dir . '/css/modules/blog/blog-new.css';
 
 		if ( file_exists( $blog_css_path ) ) {
-			wp_enqueue_style(
-				'medici-blog',
-				$theme_uri . '/css/modules/blog/blog-new.css',
-				array( 'medici-child-theme' ),
-				filemtime( $blog_css_path )
-			);
+			$asset = medici_asset( 'styles', 'medici-blog', '/css/modules/blog/blog-new.css' );
+
+			// Null - джерело входить до іншого бандла (dist/manifest.json)
+			if ( null !== $asset ) {
+				wp_enqueue_style(
+					'medici-blog',
+					$asset['src'],
+					array( 'medici-child-theme' ),
+					$asset['ver']
+				);
+			}
 		}
 
 		// FIX: JS повинен бути в /js/, а не в /css/
 		$blog_js_path = $theme_dir . '/js/modules/blog/blog-new.js';
 
 		if ( file_exists( $blog_js_path ) ) {
-			wp_enqueue_script(
-				'medici-blog',
-				$theme_uri . '/js/modules/blog/blog-new.js',
-				array(),
-				filemtime( $blog_js_path ),
-				true
-			);
+			$asset = medici_asset( 'scripts', 'medici-blog', '/js/modules/blog/blog-new.js' );
+
+			// Null - джерело входить до іншого бандла (dist/manifest.json)
+			if ( null !== $asset ) {
+				wp_enqueue_script(
+					'medici-blog',
+					$asset['src'],
+					array(),
+					$asset['ver'],
+					true
+				);
+			}
 		}
 
 		// Single Post CSS & JS
@@ -271,24 +486,34 @@ function medici_enqueue_assets(): void {
 			$blog_single_css_path = $theme_dir . '/css/modules/blog/blog-single.css';
 
 			if ( file_exists( $blog_single_css_path ) ) {
-				wp_enqueue_style(
-					'medici-blog-single',
-					$theme_uri . '/css/modules/blog/blog-single.css',
-					array( 'medici-blog' ),
-					filemtime( $blog_single_css_path )
-				);
+				$asset = medici_asset( 'styles', 'medici-blog-single', '/css/modules/blog/blog-single.css' );
+
+				// Null - джерело входить до іншого бандла (dist/manifest.json)
+				if ( null !== $asset ) {
+					wp_enqueue_style(
+						'medici-blog-single',
+						$asset['src'],
+						array( 'medici-blog' ),
+						$asset['ver']
+					);
+				}
 			}
 
 			$blog_single_js_path = $theme_dir . '/js/modules/blog/blog-single.js';
 
 			if ( file_exists( $blog_single_js_path ) ) {
-				wp_enqueue_script(
-					'medici-blog-single',
-					$theme_uri . '/js/modules/blog/blog-single.js',
-					array( 'medici-twemoji' ), // Dependency: чекати поки Twemoji завантажиться
-					filemtime( $blog_single_js_path ),
-					true
-				);
+				$asset = medici_asset( 'scripts', 'medici-blog-single', '/js/modules/blog/blog-single.js' );
+
+				// Null - джерело входить до іншого бандла (dist/manifest.json)
+				if ( null !== $asset ) {
+					wp_enqueue_script(
+						'medici-blog-single',
+						$asset['src'],
+						array( 'medici-twemoji' ), // Dependency: чекати поки Twemoji завантажиться
+						$asset['ver'],
+						true
+					);
+				}
 			}
 		}
 	}
@@ -320,78 +545,119 @@ function ( $tag, $handle ) {
 	}
 
 	// ===== MAIN SCRIPT =====
-	$child_js_path = $theme_dir . '/js/scripts.js';
-	$js_ver        = file_exists( $child_js_path ) ? filemtime( $child_js_path ) : MEDICI_VERSION;
+	$app_js = medici_asset( 'scripts', 'medici-app', '/js/scripts.js' );
 
-	wp_enqueue_script(
-		'medici-app',
-		get_stylesheet_directory_uri() . '/js/scripts.js',
-		array(),
-		$js_ver,
-		true
-	);
+	// Null - джерело входить до іншого бандла (dist/manifest.json)
+	if ( null !== $app_js ) {
+		wp_enqueue_script(
+			'medici-app',
+			$app_js['src'],
+			array(),
+			$app_js['ver'],
+			true
+		);
+	}
 
 	// ===== EVENTS API =====
 	$events_js_path = $theme_dir . '/js/events.js';
 
 	if ( file_exists( $events_js_path ) ) {
+		$asset = medici_asset( 'scripts', 'medici-events', '/js/events.js' );
+
+		// Null - джерело входить до іншого бандла (dist/manifest.json)
+		if ( null !== $asset ) {
+			wp_enqueue_script(
+				'medici-events',
+				$asset['src'],
+				array(),
+				$asset['ver'],
+				true
+			);
+		}
+	}
+
+	// ===== EVENTS FORMS =====
+	// Бандл форм (dist/manifest.json) відкладений: medici-events його не містить,
+	// бо сам підключається без defer
+	$forms_manifest = medici_get_asset_manifest();
+
+	if ( ! empty( $forms_manifest['scripts']['medici-event-forms']['file'] ) ) {
 		wp_enqueue_script(
-			'medici-events',
-			get_stylesheet_directory_uri() . '/js/events.js',
-			array(),
-			filemtime( $events_js_path ),
+			'medici-event-forms',
+			MEDICI_THEME_URI . '/dist/' . $forms_manifest['scripts']['medici-event-forms']['file'],
+			array( 'medici-events' ),
+			null,
 			true
 		);
 	}
 
-	// ===== EVENTS FORMS =====
 	$forms_newsletter_path   = $theme_dir . '/js/forms-newsletter.js';
 	$forms_consultation_path = $theme_dir . '/js/forms-consultation.js';
 
 	if ( file_exists( $forms_newsletter_path ) ) {
-		wp_enqueue_script(
-			'medici-forms-newsletter',
-			get_stylesheet_directory_uri() . '/js/forms-newsletter.js',
-			array( 'medici-events' ),
-			filemtime( $forms_newsletter_path ),
-			true
-		);
+		$asset = medici_asset( 'scripts', 'medici-forms-newsletter', '/js/forms-newsletter.js' );
+
+		// Null - скрипт уже в бандлі medici-event-forms (dist/manifest.json)
+		if ( null !== $asset ) {
+			wp_enqueue_script(
+				'medici-forms-newsletter',
+				$asset['src'],
+				array( 'medici-events' ),
+				$asset['ver'],
+				true
+			);
+		}
 	}
 
 	if ( file_exists( $forms_consultation_path ) ) {
-		wp_enqueue_script(
-			'medici-forms-consultation',
-			get_stylesheet_directory_uri() . '/js/forms-consultation.js',
-			array( 'medici-events' ),
-			filemtime( $forms_consultation_path ),
-			true
-		);
+		$asset = medici_asset( 'scripts', 'medici-forms-consultation', '/js/forms-consultation.js' );
+
+		// Null - скрипт уже в бандлі medici-event-forms (dist/manifest.json)
+		if ( null !== $asset ) {
+			wp_enqueue_script(
+				'medici-forms-consultation',
+				$asset['src'],
+				array( 'medici-events' ),
+				$asset['ver'],
+				true
+			);
+		}
 	}
 
 	// ===== FAQ ACCORDION =====
 	$faq_js_path = $theme_dir . '/js/faq-accordion.js';
 
 	if ( file_exists( $faq_js_path ) ) {
-		wp_enqueue_script(
-			'medici-faq-accordion',
-			get_stylesheet_directory_uri() . '/js/faq-accordion.js',
-			array(),
-			filemtime( $faq_js_path ),
-			true
-		);
+		$asset = medici_asset( 'scripts', 'medici-faq-accordion', '/js/faq-accordion.js' );
+
+		// Null - джерело входить до іншого бандла (dist/manifest.json)
+		if ( null !== $asset ) {
+			wp_enqueue_script(
+				'medici-faq-accordion',
+				$asset['src'],
+				array(),
+				$asset['ver'],
+				true
+			);
+		}
 	}
 
 	// ===== LAZY LOAD (Intersection Observer API) =====
 	$lazy_load_js_path = $theme_dir . '/js/lazy-load.js';
 
 	if ( file_exists( $lazy_load_js_path ) ) {
-		wp_enqueue_script(
-			'medici-lazy-load',
-			get_stylesheet_directory_uri() . '/js/lazy-load.js',
-			array(), // No dependencies - standalone module
-			filemtime( $lazy_load_js_path ),
-			true // Load in footer for better performance
-		);
+		$asset = medici_asset( 'scripts', 'medici-lazy-load', '/js/lazy-load.js' );
+
+		// Null - джерело входить до іншого бандла (dist/manifest.json)
+		if ( null !== $asset ) {
+			wp_enqueue_script(
+				'medici-lazy-load',
+				$asset['src'],
+				array(), // No dependencies - standalone module
+				$asset['ver'],
+				true // Load in footer for better performance
+			);
+		}
 	}
 
 	// ===== EXIT-INTENT POPUP =====
@@ -410,8 +676,9 @@ function ( $tag, $handle ) {
 			'ajaxUrl'     => admin_url( 'admin-ajax.php' ),
 			'nonce'       => wp_create_nonce( 'medici_nonce' ),
 			'eventNonce'  => wp_create_nonce( 'medici_event' ),
-			'cssVersion'  => $css_ver,
-			'jsVersion'   => $js_ver,
+			// Версії тих самих файлів, що підключені: хеш бандла з dist/manifest.json
+			'cssVersion'  => $child_css['hash'] ?? MEDICI_VERSION,
+			'jsVersion'   => $app_js['hash'] ?? MEDICI_VERSION,
 			'i18n'        => array(
 				'newsletter'   => array(
 					'sending'       => __( 'Відправка...', 'medici.agency' ),
@@ -442,6 +709,58 @@ function ( $tag, $handle ) {
 // PRELOAD CRITICAL RESOURCES (Fonts with crossorigin)
 // ============================================================================
 
+/**
+ * Get Montserrat font faces: subsets from fonts/subset/ or full files
+ *
+ * Subsets генерує scripts/subset_fonts.py (символи теми + латиниця та
+ * кирилиця); manifest містить файл з хешем і unicode-range.
+ *
+ * @return array<int, array{weight: int, file: string, unicode_range: string}> Font faces
+ */
+function medici_get_font_faces(): array {
+	static $faces = null;
+
+	if ( null !== $faces ) {
+		return $faces;
+	}
+
+	$faces = array(
+		'montserrat-regular' => array(
+			'weight'        => 400,
+			'file'          => 'montserrat-regular.woff2',
+			'unicode_range' => '',
+		),
+		'montserrat-600'     => array(
+			'weight'        => 600,
+			'file'          => 'montserrat-600.woff2',
+			'unicode_range' => '',
+		),
+		'montserrat-700'     => array(
+			'weight'        => 700,
+			'file'          => 'montserrat-700.woff2',
+			'unicode_range' => '',
+		),
+	);
+
+	$manifest_path = MEDICI_THEME_DIR . '/fonts/subset/manifest.json';
+	$manifest      = file_exists( $manifest_path ) ? json_decode( (string) file_get_contents( $manifest_path ), true ) : null;
+
+	if ( is_array( $manifest ) ) {
+		foreach ( $faces as $key => $face ) {
+			$subset = $manifest[ $key ] ?? null;
+
+			if ( is_array( $subset ) && ! empty( $subset['file'] ) && file_exists( MEDICI_THEME_DIR . '/fonts/subset/' . $subset['file'] ) ) {
+				$faces[ $key ]['file']          = 'subset/' . $subset['file'];
+				$faces[ $key ]['unicode_range'] = (string) ( $subset['unicode_range'] ?? '' );
+			}
+		}
+	}
+
+	$faces = array_values( $faces );
+
+	return $faces;
+}
+
 /**
  * Preload critical resources for performance optimization
  *
@@ -451,9 +770,9 @@ function medici_preload_critical_assets(): void {
 	$base = MEDICI_THEME_URI . '/fonts/';
 
 	// Preload fonts with crossorigin attribute
-	echo '<link rel="preload" as="font" href="' . esc_url( $base . 'montserrat-regular.woff2' ) . '" type="font/woff2" crossorigin="anonymous" />' . "\n";
-	echo '<link rel="preload" as="font" href="' . esc_url( $base . 'montserrat-600.woff2' ) . '" type="font/woff2" crossorigin="anonymous" />' . "\n";
-	echo '<link rel="preload" as="font" href="' . esc_url( $base . 'montserrat-700.woff2' ) . '" type="font/woff2" crossorigin="anonymous" />' . "\n";
+	foreach ( medici_get_font_faces() as $face ) {
+		echo '<link rel="preload" as="font" href="' . esc_url( $base . $face['file'] ) . '" type="font/woff2" crossorigin="anonymous" />' . "\n";
+	}
 }
 add_action( 'wp_head', 'medici_preload_critical_assets', 2 );
 
@@ -470,24 +789,17 @@ function medici_local_fonts(): void {
 	$base = MEDICI_THEME_URI . '/fonts/';
 	?>
 	<style id="medici-fonts">
+		<?php foreach ( medici_get_font_faces() as $face ) : ?>
 		@font-face {
 			font-family: 'Montserrat';
-			src: url('<?php echo esc_url( $base . 'montserrat-regular.woff2' ); ?>') format('woff2');
-			font-weight: 400;
-			font-display: swap;
-		}
-		@font-face {
-			font-family: 'Montserrat';
-			src: url('<?php echo esc_url( $base . 'montserrat-600.woff2' ); ?>') format('woff2');
-			font-weight: 600;
-			font-display: swap;
-		}
-		@font-face {
-			font-family: 'Montserrat';
-			src: url('<?php echo esc_url( $base . 'montserrat-700.woff2' ); ?>') format('woff2');
-			font-weight: 700;
+			src: url('<?php echo esc_url( $base . $face['file'] ); ?>') format('woff2');
+			font-weight: <?php echo (int) $face['weight']; ?>;
 			font-display: swap;
+			<?php if ( '' !== $face['unicode_range'] ) : ?>
+			unicode-range: <?php echo esc_html( $face['unicode_range'] ); ?>;
+			<?php endif; ?>
 		}
+		<?php endforeach; ?>
 	</style>
 	<?php
 }
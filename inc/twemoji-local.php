@@ -10,7 +10,7 @@
  * @package    Medici
  * @subpackage Core/Twemoji
  * @since      1.3.4
- * @version    1.0.3
+ * @version    1.1.0
  */
 
 if ( ! defined( 'ABSPATH' ) ) {
@@ -74,11 +74,19 @@ function medici_enqueue_twemoji_local(): void {
 			function initTwemoji() {
 				if (typeof twemoji !== 'undefined') {
 					var baseUrl = '" . esc_js( get_stylesheet_directory_uri() . '/assets/twemoji/' ) . "';
+					var sprite = " . wp_json_encode( medici_get_twemoji_sprite_config() ) . ";
 
 					twemoji.parse(document.body, {
 						folder: 'svg',
 						ext: '.svg',
-						base: baseUrl
+						base: baseUrl,
+						// Емоджі зі спрайту - один запит; решта - окремі SVG
+						callback: function(icon, options) {
+							if (sprite && sprite.icons[icon]) {
+								return sprite.url + '#' + sprite.icons[icon];
+							}
+							return options.base + options.size + '/' + icon + options.ext;
+						}
 					});
 				}
 			}
@@ -123,6 +131,34 @@ function medici_get_twemoji_base_path(): string {
 	return get_stylesheet_directory() . '/assets/twemoji/';
 }
 
+/**
+ * Отримати конфігурацію спрайту Twemoji для twemoji.parse
+ *
+ * sprite.svg та sprite.json генерує scripts/twemoji_sprite.py з емоджі,
+ * що використовуються в темі. Без manifest емоджі завантажуються окремими
+ * SVG файлами.
+ *
+ * @return array{url: string, icons: array<string, string>}|null Конфігурація або null
+ */
+function medici_get_twemoji_sprite_config(): ?array {
+	$manifest_path = medici_get_twemoji_base_path() . 'sprite.json';
+
+	if ( ! is_readable( $manifest_path ) ) {
+		return null;
+	}
+
+	$manifest = json_decode( (string) file_get_contents( $manifest_path ), true );
+
+	if ( ! is_array( $manifest ) || empty( $manifest['sprite'] ) || empty( $manifest['icons'] ) ) {
+		return null;
+	}
+
+	return array(
+		'url'   => add_query_arg( 'ver', $manifest['version'] ?? '', medici_get_twemoji_base_url() . $manifest['sprite'] ),
+		'icons' => (array) $manifest['icons'],
+	);
+}
+
 /**
  * Перевірити чи існують локальні Twemoji assets
  *
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк скриптів теми на синтетичному корпусі
+
+Корпус будується з реальних шаблонів gutenberg/ і templates/: кожна копія
+отримує власні uniqueId (у "uniqueId", "css" та класах .gb-*-<id>), частина
+копій — одинарний escaping var(\\u002d\\u002d) та \\u0026 (робота для
+fix_blocks) і додатковий рівень вкладеності з globalClasses. Набір CSS —
+таблиці стилів теми плюс синтетичні з @media та вкладеними правилами,
+пропорційно розміру корпусу. Генерація детермінована (--seed).
+
+Для кожного розміру заміряються перевірки та виправлення:
+lint_blocks (без кешу, кеш холодний/теплий), fix_blocks (правила,
+--unique-ids), індекс блоків, css_index (холодний/теплий) та purge_css
+(на вибірці з PURGE_SAMPLE шаблонів).
+
+critical_css, page_budget, build_assets та subset_fonts працюють з
+фіксованими шляхами теми, тож заміряються один раз на її файлах (розмір
+"theme") і нічого не записують: critical_css --check і генерація,
+page_budget і build_assets (кеш холодний/теплий), subset_fonts --check і
+subset накреслень (якщо встановлені fonttools і brotli). Разом з
+lint-cache-warm це покриває все, що запускає pre-commit.
+Результати — JSON; з --baseline порівнюються з попереднім прогоном, і
+уповільнення понад --threshold дає код виходу 1.
+
+Використання:
+    python3 scripts/bench_tools.py                              # 10, 100, 1000 файлів
+    python3 scripts/bench_tools.py --sizes 10000 --cases lint-blocks fix-blocks
+    python3 scripts/bench_tools.py --cases critical-css-check page-budget-warm
+    python3 scripts/bench_tools.py --output bench.json
+    python3 scripts/bench_tools.py --baseline bench.json        # код 1 при регресії
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import critical_css
+from build_assets import SCRIPTS, STYLES, AssetBuilder, build
+from css_index import CSS_DIR, CssIndex, parse_stylesheet
+from fix_blocks import fix_paths, regenerate_unique_ids
+from gutenberg_blocks import DEFAULT_DIRS, BlockIndex, collect_files
+from lint_blocks import LintCache, lint_paths
+from page_budget import BudgetCache, analyze_pages, load_budgets
+from purge_css import Purger, Safelist, TemplateUsage
+from subset_fonts import FACES, FONTS_DIR, baseline, collect_codepoints, collect_sources, load_manifest, stale_faces, subset_face
+
+BASE_PATH = Path(__file__).parent.parent
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_THRESHOLD = 1.25
+MIN_REGRESSION = 0.005  # різниця менше 5 мс — шум таймера
+PURGE_SAMPLE = 100  # purge_css ~20 мс на шаблон: заміряється вибірка
+THEME_SIZE = 'theme'  # "розмір" сценаріїв на файлах теми
+ASSET_SOURCES = [rel for entries in (STYLES, SCRIPTS) for group in entries.values() for rel in group]
+
+UNIQUE_ID_RE = re.compile(r'"uniqueId":"([0-9a-f]{8})"')
+DOUBLE_VAR = 'var(\\\\u002d\\\\u002d'
+DOUBLE_AMP = '\\\\u0026'
+WRAPPER_OPEN = (
+    '<!-- wp:generateblocks/element {{"uniqueId":"{uid}","tagName":"div",'
+    '"styles":{{"paddingTop":"var(\\u002d\\u002dspace-m)"}},'
+    '"css":".gb-element-{uid}{{padding-top:var(\\\\u002d\\\\u002dspace-m)}}",'
+    '"globalClasses":["gbp-section","gbp-bench-{n}"]}} -->\n'
+    '<div class="gbp-section gbp-bench-{n} gb-element-{uid}">\n'
+)
+WRAPPER_CLOSE = '</div>\n<!-- /wp:generateblocks/element -->\n'
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+# ---------------------- Корпус ----------------------
+
+
+class Corpus:
+    """Синтетичні HTML блоків і CSS у тимчасовій директорії."""
+
+    def __init__(self, root: Path, size: int, seed: int) -> None:
+        self.root = root
+        self.html_dir = root / 'gutenberg'
+        self.css_dir = root / 'css'
+        self.size = size
+        self.rng = random.Random(seed)
+        self.files: List[Path] = []
+        self.stylesheets: List[Path] = []
+
+    def _fresh_id(self, taken: set) -> str:
+        while True:
+            uid = f'{self.rng.getrandbits(32):08x}'
+            if uid not in taken:
+                taken.add(uid)
+                return uid
+
+    def generate(self, sources: Sequence[Path]) -> 'Corpus':
+        self.html_dir.mkdir(parents=True)
+        templates = [(path.stem, path.read_text(encoding='utf-8')) for path in sources]
+        taken: set = set()
+        for i in range(self.size):
+            stem, content = templates[i % len(templates)]
+            ids = dict.fromkeys(UNIQUE_ID_RE.findall(content))
+            mapping = {uid: self._fresh_id(taken) for uid in ids}
+            if mapping:
+                pattern = re.compile(r'(?<=["-])(' + '|'.join(mapping) + r')(?![0-9A-Za-z])')
+                content = pattern.sub(lambda m: mapping[m.group(1)], content)
+
+            # ~20% копій з одинарним escaping (як після копіювання з редактора)
+            if self.rng.random() < 0.2:
+                content = content.replace(DOUBLE_VAR, 'var(\\u002d\\u002d').replace(DOUBLE_AMP, '\\u0026')
+            # ~30% копій загорнуті в ще один контейнер
+            if self.rng.random() < 0.3:
+                uid = self._fresh_id(taken)
+                content = WRAPPER_OPEN.format(uid=uid, n=i % 50) + content + WRAPPER_CLOSE
+
+            path = self.html_dir / f'{stem}-{i:05d}.html'
+            path.write_text(content, encoding='utf-8')
+            self.files.append(path)
+
+        self._generate_css()
+        return self
+
+    def _generate_css(self) -> None:
+        """Таблиці стилів теми та синтетичні: один файл на 20 шаблонів."""
+        for sheet in CssIndex(CSS_DIR).stylesheets():
+            target = self.css_dir / sheet.relative_to(CSS_DIR)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(sheet, target)
+            self.stylesheets.append(target)
+
+        bench_dir = self.css_dir / 'bench'
+        bench_dir.mkdir()
+        for n in range(max(1, self.size // 20)):
+            rules = []
+            for r in range(40):
+                cls = f'gbp-bench-{(n * 40 + r) % 50}'
+                rules.append(f'.{cls} .gbp-section__inner > .gb-text:hover {{ color: var(--accent); }}')
+                rules.append(f'@media (max-width: 767px) {{ .{cls} {{ padding: {r % 8}rem; }} }}')
+                rules.append(f'.{cls}-{r} {{ &:is(:hover, :focus) {{ color: var(--text-primary); }} }}')
+            path = bench_dir / f'bench-{n:04d}.css'
+            path.write_text('\n'.join(rules) + '\n', encoding='utf-8')
+            self.stylesheets.append(path)
+
+    def touch_one(self) -> None:
+        """Змінити один файл (сценарій повторного запуску з кешем)."""
+        with open(self.files[0], 'a', encoding='utf-8') as f:
+            f.write('\n')
+
+    @property
+    def bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.files)
+
+
+# ---------------------- Заміри ----------------------
+
+
+def case_lint_blocks(corpus: Corpus, classes: set) -> Callable[[], None]:
+    return lambda: lint_paths(corpus.files, css_classes=classes)
+
+
+def case_lint_cache_cold(corpus: Corpus, classes: set) -> Callable[[], None]:
+    def run() -> None:
+        cache_path = corpus.root / '.lint-cache'
+        cache_path.unlink(missing_ok=True)
+        cache = LintCache(cache_path)
+        lint_paths(corpus.files, css_classes=classes, cache=cache)
+        cache.save()
+    return run
+
+
+def case_lint_cache_warm(corpus: Corpus, classes: set) -> Callable[[], None]:
+    cache_path = corpus.root / '.lint-cache'
+    cache = LintCache(cache_path)
+    lint_paths(corpus.files, css_classes=classes, cache=cache)
+    cache.save()
+
+    def run() -> None:
+        corpus.touch_one()
+        cache = LintCache(cache_path)
+        lint_paths(corpus.files, css_classes=classes, cache=cache)
+        cache.save()
+    return run
+
+
+def case_fix_blocks(corpus: Corpus, classes: set) -> Callable[[], None]:
+    return lambda: fix_paths(corpus.files, write=False)
+
+
+def case_fix_blocks_serial(corpus: Corpus, classes: set) -> Callable[[], None]:
+    return lambda: fix_paths(corpus.files, write=False, jobs=1)
+
+
+def case_unique_ids(corpus: Corpus, classes: set) -> Callable[[], None]:
+    return lambda: regenerate_unique_ids(corpus.files, write=False)
+
+
+def case_block_index(corpus: Corpus, classes: set) -> Callable[[], None]:
+    return lambda: BlockIndex.from_paths(corpus.files)
+
+
+def case_css_index_cold(corpus: Corpus, classes: set) -> Callable[[], None]:
+    return lambda: CssIndex(corpus.css_dir, corpus.root / '.css-index').update()
+
+
+def case_css_index_warm(corpus: Corpus, classes: set) -> Callable[[], None]:
+    index_path = corpus.root / '.css-index'
+    index = CssIndex(corpus.css_dir, index_path)
+    index.update()
+    index.save()
+    return lambda: CssIndex.load(corpus.css_dir, index_path).update()
+
+
+def case_purge_css(corpus: Corpus, classes: set) -> Callable[[], None]:
+    parsed = [parse_stylesheet(path.read_text(encoding='utf-8')) for path in corpus.stylesheets]
+    safelist = Safelist(set(), set())
+
+    def run() -> None:
+        for path in corpus.files[:PURGE_SAMPLE]:
+            purger = Purger(TemplateUsage(path.read_text(encoding='utf-8')), safelist)
+            for nodes in parsed:
+                purger.purge(nodes)
+    return run
+
+
+# Сценарій -> кількість файлів, що обробляються (для мс/файл)
+CASE_FILES: Dict[str, Callable[[Corpus], int]] = {
+    'purge-css': lambda corpus: min(corpus.size, PURGE_SAMPLE),
+}
+
+CASES: Dict[str, Callable[[Corpus, set], Callable[[], None]]] = {
+    'lint-blocks': case_lint_blocks,
+    'lint-cache-cold': case_lint_cache_cold,
+    'lint-cache-warm': case_lint_cache_warm,
+    'fix-blocks': case_fix_blocks,
+    'fix-blocks-serial': case_fix_blocks_serial,
+    'unique-ids': case_unique_ids,
+    'block-index': case_block_index,
+    'css-index-cold': case_css_index_cold,
+    'css-index-warm': case_css_index_warm,
+    'purge-css': case_purge_css,
+}
+
+
+# ---------------------- Заміри на файлах теми ----------------------
+
+
+def case_critical_check() -> Callable[[], None]:
+    """Як у pre-commit: python3 scripts/critical_css.py --check."""
+    def run() -> None:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            critical_css.main(['--check'])
+    return run
+
+
+def case_critical_generate() -> Callable[[], None]:
+    return lambda: critical_css.generate(critical_css.inputs_hash())
+
+
+def _theme_pages() -> List[Path]:
+    return [page.resolve() for page in collect_files(DEFAULT_DIRS)]
+
+
+def case_page_budget_cold() -> Callable[[], None]:
+    pages, budgets = _theme_pages(), load_budgets()
+    return lambda: analyze_pages(pages, BudgetCache(Path(os.devnull)), budgets)
+
+
+def case_page_budget_warm() -> Callable[[], None]:
+    """Як у pre-commit: кеш розмірів і аналізу шаблонів уже заповнений."""
+    pages, budgets = _theme_pages(), load_budgets()
+    cache = BudgetCache(Path(os.devnull))
+    analyze_pages(pages, cache, budgets)
+    return lambda: analyze_pages(pages, cache, budgets)
+
+
+def case_build_assets_cold() -> Callable[[], None]:
+    def run() -> None:
+        builder = AssetBuilder(Path(os.devnull))
+        builder.refresh(ASSET_SOURCES)
+        build(builder, write=False)
+    return run
+
+
+def case_build_assets_warm() -> Callable[[], None]:
+    builder = AssetBuilder(Path(os.devnull))
+    builder.refresh(ASSET_SOURCES)
+
+    def run() -> None:
+        builder.refresh(ASSET_SOURCES)
+        build(builder, write=False)
+    return run
+
+
+def case_subset_fonts_check() -> Callable[[], None]:
+    return lambda: stale_faces(load_manifest(), baseline() | collect_codepoints(collect_sources()))
+
+
+def case_subset_fonts() -> Optional[Callable[[], None]]:
+    """Subset усіх накреслень у пам'яті; None без fonttools/brotli."""
+    try:
+        import fontTools  # noqa: F401
+        import brotli  # noqa: F401
+    except ImportError:
+        return None
+    points = baseline() | collect_codepoints(collect_sources())
+
+    def run() -> None:
+        for _, filename in FACES.values():
+            subset_face(FONTS_DIR / filename, points)
+    return run
+
+
+# Сценарій -> кількість файлів, що обробляються (для мс/файл)
+THEME_FILES: Dict[str, Callable[[], int]] = {
+    'critical-css-check': lambda: len(critical_css.ABOVE_THE_FOLD),
+    'critical-css': lambda: len(critical_css.ABOVE_THE_FOLD),
+    'page-budget-cold': lambda: len(_theme_pages()),
+    'page-budget-warm': lambda: len(_theme_pages()),
+    'build-assets-cold': lambda: len(ASSET_SOURCES),
+    'build-assets-warm': lambda: len(ASSET_SOURCES),
+    'subset-fonts-check': lambda: len(FACES),
+    'subset-fonts': lambda: len(FACES),
+}
+
+THEME_CASES: Dict[str, Callable[[], Optional[Callable[[], None]]]] = {
+    'critical-css-check': case_critical_check,
+    'critical-css': case_critical_generate,
+    'page-budget-cold': case_page_budget_cold,
+    'page-budget-warm': case_page_budget_warm,
+    'build-assets-cold': case_build_assets_cold,
+    'build-assets-warm': case_build_assets_warm,
+    'subset-fonts-check': case_subset_fonts_check,
+    'subset-fonts': case_subset_fonts,
+}
+
+
+def measure(run: Callable[[], None], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return {'min': min(timings), 'median': statistics.median(timings)}
+
+
+def record(size, name: str, run: Callable[[], None], files: int, repeat: int) -> Dict:
+    """Заміряти сценарій і вивести рядок звіту."""
+    timing = measure(run, repeat)
+    print(f"  {name:<18} {timing['min'] * 1000:>10.1f} мс  "
+          f"(медіана {timing['median'] * 1000:.1f}, {timing['min'] * 1000 / files:.3f} мс/файл)")
+    return {
+        'size': size,
+        'case': name,
+        'files': files,
+        'seconds_min': round(timing['min'], 6),
+        'seconds_median': round(timing['median'], 6),
+        'per_file_ms': round(timing['min'] * 1000 / files, 4),
+    }
+
+
+def run_theme(cases: Sequence[str], repeat: int) -> List[Dict]:
+    """Заміряти сценарії на файлах теми (без запису в тему)."""
+    print(f"{BLUE}Файли теми: {BASE_PATH}{RESET}")
+    results = []
+    for name in cases:
+        if name not in THEME_CASES:
+            continue
+        run = THEME_CASES[name]()
+        if run is None:
+            print(f"  {YELLOW}{name:<18} пропущено: pip install -r scripts/requirements.txt{RESET}")
+            continue
+        results.append(record(THEME_SIZE, name, run, THEME_FILES[name](), repeat))
+    return results
+
+
+def run_size(size: int, cases: Sequence[str], repeat: int, seed: int, keep: Optional[Path]) -> List[Dict]:
+    """Згенерувати корпус розміру size і заміряти вибрані сценарії."""
+    root = Path(tempfile.mkdtemp(prefix=f'bench-{size}-', dir=keep))
+    try:
+        started = time.perf_counter()
+        corpus = Corpus(root, size, seed).generate(collect_files(DEFAULT_DIRS))
+        classes = CssIndex(corpus.css_dir, root / '.classes-index')
+        classes.update()
+        classes = classes.classes()
+        print(f"{BLUE}Корпус {size}: {corpus.bytes / 1024 / 1024:.1f} МБ HTML, "
+              f"{len(corpus.stylesheets)} CSS ({time.perf_counter() - started:.2f} с){RESET}")
+
+        results = []
+        for name in cases:
+            if name not in CASES:
+                continue
+            files = CASE_FILES.get(name, lambda corpus: corpus.size)(corpus)
+            results.append(record(size, name, CASES[name](corpus, classes), files, repeat))
+        return results
+    finally:
+        if keep is None:
+            shutil.rmtree(root)
+
+
+# ---------------------- Порівняння ----------------------
+
+
+def compare(results: Sequence[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """Сценарії, повільніші за baseline більше ніж у threshold разів."""
+    previous = {(item['size'], item['case']): item for item in baseline.get('results', [])}
+    regressions = []
+    for item in results:
+        old = previous.get((item['size'], item['case']))
+        if old is None:
+            continue
+        new_time, old_time = item['seconds_min'], old['seconds_min']
+        if new_time > old_time * threshold and new_time - old_time > MIN_REGRESSION:
+            regressions.append(
+                f"{item['case']} @ {item['size']}: {old_time * 1000:.1f} → {new_time * 1000:.1f} мс "
+                f"(x{new_time / old_time:.2f})"
+            )
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BASE_PATH, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Бенчмарк скриптів теми на синтетичному корпусі')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='кількість файлів корпусу (10..10000)')
+    names = [*CASES, *THEME_CASES]
+    parser.add_argument('--cases', nargs='+', choices=names, default=names, help='лише вказані сценарії')
+    parser.add_argument('--repeat', type=int, default=3, help='повторів на сценарій (береться мінімум)')
+    parser.add_argument('--seed', type=int, default=1, help='seed генератора корпусу')
+    parser.add_argument('--output', type=Path, help='записати результати в JSON')
+    parser.add_argument('--baseline', type=Path, help='JSON попереднього прогону для порівняння')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='допустиме уповільнення (x)')
+    parser.add_argument('--keep', type=Path, help='залишити корпуси в цій директорії')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    if args.keep:
+        args.keep.mkdir(parents=True, exist_ok=True)
+
+    results: List[Dict] = []
+    if any(name in CASES for name in args.cases):
+        for size in args.sizes:
+            results.extend(run_size(size, args.cases, args.repeat, args.seed, args.keep))
+    if any(name in THEME_CASES for name in args.cases):
+        results.extend(run_theme(args.cases, args.repeat))
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"\n{GREEN}✓ Результати: {args.output}{RESET}")
+
+    if args.baseline:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"{RED}✗ Не вдалося прочитати baseline: {e}{RESET}", file=sys.stderr)
+            return 1
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{RED}✗ Уповільнення понад x{args.threshold}:{RESET}")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\n{GREEN}✓ Без регресій відносно {args.baseline} (поріг x{args.threshold}){RESET}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
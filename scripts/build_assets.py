@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Збірка CSS/JS теми: мінімізація, бандли та хеш вмісту в іменах файлів
+
+Кожен бандл відповідає handle з inc/assets.php і складається з одного або
+кількох джерел у порядку підключення. Результат — dist/css/<назва>.<хеш>.css
+та dist/js/<назва>.<хеш>.js, dist/manifest.json (handle -> файл), який
+читає medici_asset(), і dist/.htaccess з річним immutable Cache-Control
+для файлів з хешем.
+
+Джерела мінімізуються паралельно в пулі процесів. У .assets-cache для
+кожного джерела зберігаються mtime/розмір, sha1 та мінімізований текст,
+тож повторна збірка обробляє лише змінені файли.
+
+Використання:
+    python3 scripts/build_assets.py              # зібрати dist/
+    python3 scripts/build_assets.py --force      # без кешу
+    python3 scripts/build_assets.py --check      # код 1, якщо dist/ застарів
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from css_index import parse_stylesheet, split_selector_list
+
+BASE_PATH = Path(__file__).parent.parent
+DIST_DIR = BASE_PATH / 'dist'
+MANIFEST_PATH = DIST_DIR / 'manifest.json'
+HTACCESS_PATH = DIST_DIR / '.htaccess'
+CACHE_PATH = BASE_PATH / '.assets-cache'
+HASH_LENGTH = 10
+
+# handle -> джерела в порядку підключення (inc/assets.php). Handles
+# джерел, об'єднаних у чужий бандл, PHP пропускає (manifest['merged'])
+STYLES: Dict[str, List[str]] = {
+    'medici-core': [
+        'css/core/variables.css',
+        'css/core/core.css',
+        'css/components/buttons.css',
+        'css/components/sections.css',
+        'css/components/navigation.css',
+        'css/components/lazy-load.css',
+    ],
+    'medici-cards': ['css/components/cards.css'],
+    'medici-faq': ['css/components/faq.css'],
+    'medici-layout': ['css/layout/layout.css'],
+    'medici-widgets': ['inc/widgets/widget-styles.css'],
+    'medici-child-theme': ['style.css'],
+    'medici-forms': ['css/components/forms.css'],
+    'medici-blog': ['css/modules/blog/blog-new.css'],
+    'medici-blog-single': ['css/modules/blog/blog-single.css'],
+}
+SCRIPTS: Dict[str, List[str]] = {
+    'medici-app': ['js/scripts.js'],
+    # medici-events без defer (від нього залежить exit-intent), тож форми —
+    # окремим відкладеним бандлом, а не в ньому
+    'medici-events': ['js/events.js'],
+    'medici-event-forms': ['js/forms-newsletter.js', 'js/forms-consultation.js'],
+    'medici-faq-accordion': ['js/faq-accordion.js'],
+    'medici-lazy-load': ['js/lazy-load.js'],
+    'medici-blog': ['js/modules/blog/blog-new.js'],
+    'medici-blog-single': ['js/modules/blog/blog-single.js'],
+}
+# Handles окремих джерел, що тепер входять до бандлів
+MERGED: Dict[str, Dict[str, str]] = {
+    'styles': {
+        'medici-variables': 'medici-core',
+        'medici-buttons': 'medici-core',
+        'medici-sections': 'medici-core',
+        'medici-navigation': 'medici-core',
+        'medici-lazy-load': 'medici-core',
+    },
+    'scripts': {
+        'medici-forms-newsletter': 'medici-event-forms',
+        'medici-forms-consultation': 'medici-event-forms',
+    },
+}
+
+HTACCESS = """# GENERATED by scripts/build_assets.py - do not edit by hand.
+# Імена файлів містять хеш вмісту: кешувати рік без перевірки.
+<IfModule mod_headers.c>
+	<FilesMatch "\\.[0-9a-f]{%d}\\.(css|js)$">
+		Header set Cache-Control "public, max-age=31536000, immutable"
+	</FilesMatch>
+</IfModule>
+""" % HASH_LENGTH
+
+CSS_STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+CSS_PUNCT_RE = re.compile(r'\s*([,>])\s*')
+
+JS_IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$\\')
+# Після цих символів і слів '/' починає регулярний вираз, а не ділення
+JS_REGEX_AFTER = frozenset('(,=:[!&|?{};+-*%<>~^')
+JS_REGEX_KEYWORDS = frozenset({
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'instanceof', 'new',
+    'delete', 'void', 'throw', 'yield', 'await',
+})
+# Перенос рядка можна прибрати без ризику для ASI
+JS_NEWLINE_AFTER = frozenset('{;,([')
+JS_NEWLINE_BEFORE = frozenset('}]),.')
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+def engine_version() -> str:
+    """Хеш коду збірки: зміна мінімізаторів інвалідує кеш."""
+    digest = hashlib.sha1()
+    for module in (Path(__file__), Path(__file__).with_name('css_index.py')):
+        digest.update(module.read_bytes())
+    return digest.hexdigest()
+
+
+# ---------------------- CSS ----------------------
+
+
+def _outside_strings(value: str, transform) -> str:
+    """Застосувати transform до тексту поза рядками в лапках."""
+    parts = []
+    last = 0
+    for m in CSS_STRING_RE.finditer(value):
+        parts.append(transform(value[last:m.start()]))
+        parts.append(m.group())
+        last = m.end()
+    parts.append(transform(value[last:]))
+    return ''.join(parts)
+
+
+def _minify_value(value: str) -> str:
+    return _outside_strings(value, lambda text: text.replace(', ', ',').replace(' !important', '!important'))
+
+
+def _minify_declaration(declaration: str) -> str:
+    prop, sep, value = declaration.partition(':')
+    if not sep:
+        return declaration
+    return f"{prop.strip()}:{_minify_value(value.strip())}"
+
+
+def _minify_selector(prelude: str) -> str:
+    # '>' і ',' лише поза дужками атрибутів/рядками; ' ' між частинами значуща
+    return ','.join(_outside_strings(sel, lambda text: CSS_PUNCT_RE.sub(r'\1', text)) for sel in split_selector_list(prelude))
+
+
+def _render_min(nodes) -> str:
+    out = []
+    for node in nodes:
+        if not node.block:
+            out.append(f"{node.prelude};")
+            continue
+        if not node.declarations and not node.children:
+            continue
+        head = _minify_selector(node.prelude) if node.at_rule is None else node.prelude
+        body = ';'.join(_minify_declaration(decl) for decl in node.declarations)
+        if node.children:
+            body = (body + ';' if body else '') + _render_min(node.children)
+        out.append(f"{head}{{{body}}}")
+    return ''.join(out)
+
+
+def rebase_urls(css: str, source: Path, target_dir: Path) -> str:
+    """Відносні url() від розташування бандла, а не джерела."""
+    def _rebase(m: 're.Match') -> str:
+        url = m.group(2).strip()
+        if re.match(r'^(?:[a-z]+:|/|#)', url, re.IGNORECASE):
+            return m.group()
+        rebased = os.path.relpath(source.parent / url, target_dir).replace(os.sep, '/')
+        return f"url({m.group(1)}{rebased}{m.group(1)})"
+    return CSS_URL_RE.sub(_rebase, css)
+
+
+def minify_css(css: str) -> str:
+    """Мінімізація через дерево css_index: без коментарів, порожніх правил і пробілів."""
+    return _render_min(parse_stylesheet(css))
+
+
+# ---------------------- JS ----------------------
+
+
+def _is_ident(char: str) -> bool:
+    return char in JS_IDENT_CHARS or char > '\x7f'
+
+
+def minify_js(source: str) -> str:
+    """Консервативна мінімізація JS: коментарі, відступи, зайві пробіли.
+
+    Переноси рядків зберігаються там, де від них може залежати ASI. Рядки,
+    template literals (з вкладеними ${}) та регулярні вирази копіюються
+    без змін.
+    """
+    out: List[str] = []
+    last = ''          # останній значущий символ виводу
+    word = ''          # останній ідентифікатор (для return /re/ тощо)
+    pending = ''       # '', ' ' або '\n' — пропущений пробіл
+    templates: List[int] = []  # глибина {} у кожному відкритому ${
+    i = 0
+    size = len(source)
+
+    def emit(text: str) -> None:
+        nonlocal last, pending
+        first = text[0]
+        if pending == '\n' and last and last not in JS_NEWLINE_AFTER and first not in JS_NEWLINE_BEFORE:
+            out.append('\n')
+        elif pending and last and (
+            (_is_ident(last) and _is_ident(first))
+            or (last in '+-' and first in '+-')
+            or last == '/' or first == '/'
+            or (first == '.' and last.isdigit())
+        ):
+            out.append(' ')
+        out.append(text)
+        last = text[-1]
+        pending = ''
+
+    def read_template(start: int) -> int:
+        """Копіювати template literal від start до ` або ${; повернути кінець."""
+        j = start
+        while j < size:
+            char = source[j]
+            if char == '\\':
+                j += 2
+                continue
+            if char == '`':
+                return j + 1
+            if char == '$' and source.startswith('${', j):
+                templates.append(0)
+                return j + 2
+            j += 1
+        raise ValueError('незакритий template literal')
+
+    while i < size:
+        char = source[i]
+
+        if char in ' \t\r\n\f\v':
+            if char == '\n':
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i += 1
+            continue
+
+        if char == '/' and source.startswith('//', i):
+            end = source.find('\n', i)
+            i = size if end < 0 else end
+            continue
+        if char == '/' and source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            if end < 0:
+                raise ValueError('незакритий коментар')
+            if '\n' in source[i:end]:
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i = end + 2
+            continue
+
+        if char in '"\'':
+            j = i + 1
+            while j < size and source[j] != char:
+                if source[j] == '\n':
+                    raise ValueError(f'незакритий рядок у позиції {i}')
+                j += 2 if source[j] == '\\' else 1
+            emit(source[i:j + 1])
+            word = ''
+            i = j + 1
+            continue
+
+        if char == '`':
+            end = read_template(i + 1)
+            emit(source[i:end])
+            word = ''
+            i = end
+            continue
+
+        if char == '}' and templates and templates[-1] == 0:
+            templates.pop()
+            end = read_template(i + 1)
+            emit(source[i:end])
+            word = ''
+            i = end
+            continue
+
+        if char == '/' and (not last or last in JS_REGEX_AFTER or word in JS_REGEX_KEYWORDS):
+            j = i + 1
+            in_class = False
+            while j < size:
+                current = source[j]
+                if current == '\\':
+                    j += 2
+                    continue
+                if current == '\n':
+                    raise ValueError(f'незакритий регулярний вираз у позиції {i}')
+                if current == '[':
+                    in_class = True
+                elif current == ']':
+                    in_class = False
+                elif current == '/' and not in_class:
+                    break
+                j += 1
+            emit(source[i:j + 1])
+            word = ''
+            i = j + 1
+            continue
+
+        if _is_ident(char):
+            j = i + 1
+            while j < size and _is_ident(source[j]):
+                j += 1
+            word = source[i:j]
+            emit(word)
+            i = j
+            continue
+
+        if templates:
+            if char == '{':
+                templates[-1] += 1
+            elif char == '}':
+                templates[-1] -= 1
+        emit(char)
+        word = ''
+        i += 1
+
+    return ''.join(out) + '\n'
+
+
+# ---------------------- Збірка ----------------------
+
+
+def minify_source(rel: str, cached_sha1: Optional[str]) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """(джерело, sha1, мінімізований текст або None, якщо sha1 не змінився, помилка)."""
+    path = BASE_PATH / rel
+    try:
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        if digest == cached_sha1:
+            return rel, digest, None, None
+        text = raw.decode('utf-8')
+        if path.suffix == '.css':
+            text = minify_css(rebase_urls(text, path, DIST_DIR / 'css'))
+        else:
+            text = minify_js(text)
+        return rel, digest, text, None
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return rel, '', None, str(e)
+
+
+class AssetBuilder:
+    """Кеш мінімізованих джерел (.assets-cache) і запис dist/."""
+
+    def __init__(self, path: Path = CACHE_PATH) -> None:
+        self.path = path
+        self.version = engine_version()
+        self.sources: Dict[str, Dict] = {}
+        self.minified = 0
+        self.dirty = False
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') == self.version:
+            self.sources = data.get('sources', {})
+
+    def refresh(self, sources: Sequence[str], jobs: Optional[int] = None) -> List[str]:
+        """Оновити мінімізовані джерела; повернути помилки."""
+        todo = []
+        for rel in sources:
+            path = BASE_PATH / rel
+            if not path.exists():
+                continue
+            stat = path.stat()
+            entry = self.sources.get(rel)
+            if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                todo.append((rel, entry['sha1'] if entry else None, stat))
+        if not todo:
+            return []
+
+        jobs = min(jobs or os.cpu_count() or 1, len(todo))
+        args = ([rel for rel, _, _ in todo], [sha1 for _, sha1, _ in todo])
+        if jobs <= 1:
+            results = list(map(minify_source, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(minify_source, *args))
+
+        errors = []
+        for (rel, _, stat), (_, digest, text, error) in zip(todo, results):
+            if error:
+                errors.append(f"{rel}: {error}")
+                continue
+            entry = self.sources.setdefault(rel, {})
+            entry.update(mtime=stat.st_mtime_ns, size=stat.st_size, sha1=digest)
+            if text is not None:
+                entry['min'] = text
+                self.minified += 1
+            self.dirty = True
+        return errors
+
+    def bundle(self, handle: str, sources: Sequence[str], kind: str) -> Optional[Dict]:
+        """Текст бандла і його ім'я з хешем; None, якщо він порожній."""
+        parts = [self.sources[rel]['min'] for rel in sources if rel in self.sources and (BASE_PATH / rel).exists()]
+        parts = [part for part in parts if part.strip()]
+        if not parts:
+            # style.css — лише заголовок теми: PHP лишить оригінальний файл
+            return None
+        # ';' між скриптами: файл без крапки з комою в кінці не зіллється з наступним
+        content = (';\n' if kind == 'js' else '\n').join(parts)
+        digest = hashlib.sha1(content.encode()).hexdigest()[:HASH_LENGTH]
+        name = handle[len('medici-'):] if handle.startswith('medici-') else handle
+        return {
+            'file': f"{kind}/{name}.{digest}.{kind}",
+            'sources': list(sources),
+            'content': content,
+            'raw': sum((BASE_PATH / rel).stat().st_size for rel in sources if (BASE_PATH / rel).exists()),
+        }
+
+    def save(self) -> None:
+        """Атомарний запис; записи видалених джерел відкидаються."""
+        if not self.dirty:
+            return
+        sources = {rel: entry for rel, entry in self.sources.items() if (BASE_PATH / rel).exists()}
+        write_atomic(self.path, json.dumps({'version': self.version, 'sources': sources}, ensure_ascii=False))
+
+
+def write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(content, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def build(builder: AssetBuilder, write: bool = True) -> Tuple[Dict, List[Dict], bool]:
+    """Manifest, бандли та ознака, що dist/ вже актуальний."""
+    manifest: Dict = {'styles': {}, 'scripts': {}, 'merged': MERGED}
+    bundles = []
+    for section, kind, entries in (('styles', 'css', STYLES), ('scripts', 'js', SCRIPTS)):
+        for handle, sources in entries.items():
+            bundle = builder.bundle(handle, sources, kind)
+            if bundle is None:
+                continue
+            bundle['handle'] = handle
+            bundles.append(bundle)
+            manifest[section][handle] = {'file': bundle['file'], 'sources': bundle['sources']}
+
+    text = json.dumps(manifest, indent=2) + '\n'
+    try:
+        fresh = MANIFEST_PATH.read_text(encoding='utf-8') == text and all(
+            (DIST_DIR / bundle['file']).exists() for bundle in bundles
+        )
+    except OSError:
+        fresh = False
+    if not write or fresh:
+        return manifest, bundles, fresh
+
+    for bundle in bundles:
+        target = DIST_DIR / bundle['file']
+        if not target.exists():
+            write_atomic(target, bundle['content'])
+    write_atomic(MANIFEST_PATH, text)
+    if not HTACCESS_PATH.exists() or HTACCESS_PATH.read_text(encoding='utf-8') != HTACCESS:
+        write_atomic(HTACCESS_PATH, HTACCESS)
+
+    # Старі версії бандлів більше ніхто не підключає
+    current = {bundle['file'] for bundle in bundles}
+    for kind in ('css', 'js'):
+        for path in (DIST_DIR / kind).glob(f'*.{kind}'):
+            if f"{kind}/{path.name}" not in current:
+                path.unlink()
+    return manifest, bundles, False
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Збірка CSS/JS теми з хешем вмісту в іменах файлів')
+    parser.add_argument('--check', action='store_true', help='лише перевірити актуальність dist/ (код 1, якщо застарів)')
+    parser.add_argument('--force', action='store_true', help='зібрати без кешу')
+    parser.add_argument('--jobs', '-j', type=int, help='кількість процесів (за замовчуванням — кількість CPU)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    started = time.perf_counter()
+    builder = AssetBuilder(Path(os.devnull) if args.force else CACHE_PATH)
+    sources = [rel for entries in (STYLES, SCRIPTS) for group in entries.values() for rel in group]
+    errors = builder.refresh(sources, args.jobs)
+    for error in errors:
+        print(f"{RED}✗ {error}{RESET}", file=sys.stderr)
+    if errors:
+        return 1
+
+    _, bundles, fresh = build(builder, write=not args.check)
+    if not args.force:
+        builder.save()
+
+    if args.check:
+        if fresh:
+            print(f"{GREEN}✓ dist/ актуальний ({len(bundles)} бандлів){RESET}")
+            return 0
+        print(f"{RED}✗ dist/ застарів: запустіть python3 scripts/build_assets.py{RESET}")
+        return 1
+
+    raw_total = min_total = gz_total = 0
+    for bundle in bundles:
+        size = len(bundle['content'].encode())
+        gz = len(gzip.compress(bundle['content'].encode(), 9))
+        raw_total += bundle['raw']
+        min_total += size
+        gz_total += gz
+        print(f"  {bundle['file']:<40} {bundle['raw'] / 1024:7.1f} → {size / 1024:6.1f} KB (gzip {gz / 1024:.1f} KB)")
+
+    elapsed = (time.perf_counter() - started) * 1000
+    status = 'без змін' if fresh else 'оновлено'
+    print(
+        f"\n{GREEN}✓ dist/ {status}:{RESET} {len(bundles)} бандлів, "
+        f"{raw_total / 1024:.1f} → {min_total / 1024:.1f} KB (gzip {gz_total / 1024:.1f} KB)"
+    )
+    print(f"{BLUE}Мінімізовано: {builder.minified}, {elapsed:.0f} мс{RESET}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,687 @@
+#!/usr/bin/env python3
+"""
+Генератор critical CSS з блочних шаблонів
+
+Розмітка першого екрану (gutenberg/HEADER.html, gutenberg/HERO.html)
+розбирається в дерево елементів, а таблиці стилів, що завантажуються на
+кожній сторінці (порядок як в inc/assets.php), — у дерево правил
+(css_index.parse_stylesheet). Правило потрапляє в css/critical.css, якщо
+хоча б один його селектор збігається з елементом шаблонів у світлій або
+темній темі ([data-theme="dark"] на <html>). Стани (:hover, :focus) та
+@media print лишаються у відкладеній частині. З CSS змінних лишаються
+лише ті, що використовуються (транзитивно) критичними правилами або
+inline CSS блоків (атрибут css та значення styles); @keyframes та @font-face — лише якщо на них посилаються.
+
+Окремий файл залишку не пишеться: на сторінці, де inline critical.css,
+inc/assets.php підключає повні таблиці стилів без блокування рендеру
+(preload → stylesheet). Повні файли повторюють порядок каскаду джерел;
+залишок після inline блоку цей порядок порушив би (усі критичні правила
+опинилися б перед рештою).
+
+Заголовок згенерованого файлу містить хеш вхідних файлів: якщо вони не
+змінились, повторний запуск нічого не робить, а --check за мілісекунди
+перевіряє, що critical.css актуальний і визначає всі змінні, на які
+посилаються блоки першого екрану (pre-commit).
+
+Використання:
+    python3 scripts/critical_css.py            # згенерувати, якщо входи змінились
+    python3 scripts/critical_css.py --check    # код виходу 1, якщо critical.css застарів
+    python3 scripts/critical_css.py --force --stats
+"""
+
+import argparse
+import hashlib
+import re
+import sys
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from css_index import CssNode, parse_stylesheet, render_stylesheet, resolve_nesting, split_selector_list
+from gutenberg_blocks import parse_document
+
+BASE_PATH = Path(__file__).parent.parent
+CSS_DIR = BASE_PATH / 'css'
+
+# Шаблони першого екрану в порядку на сторінці
+ABOVE_THE_FOLD = [
+    BASE_PATH / 'gutenberg/HEADER.html',
+    BASE_PATH / 'gutenberg/HERO.html',
+]
+# Таблиці стилів, що завантажуються на кожній сторінці (inc/assets.php)
+SOURCE_STYLESHEETS = [
+    CSS_DIR / 'core/variables.css',
+    CSS_DIR / 'core/core.css',
+    CSS_DIR / 'components/buttons.css',
+    CSS_DIR / 'components/sections.css',
+    CSS_DIR / 'components/navigation.css',
+    CSS_DIR / 'components/lazy-load.css',
+    CSS_DIR / 'layout/layout.css',
+    BASE_PATH / 'style.css',
+]
+CRITICAL_PATH = CSS_DIR / 'critical.css'
+
+INPUTS_RE = re.compile(r'^ \* Inputs: ([0-9a-f]{40})$', re.M)
+VAR_REF_RE = re.compile(r'var\(\s*(--[\w-]+)')
+VAR_DEF_RE = re.compile(r'(--[\w-]+)\s*:')
+# "\\u002d" в JSON атрибутів після декодування лишається текстом "\u002d"
+ESCAPED_DASH = '\\u002d'
+IDENT_RE = re.compile(r'-?[_a-zA-Z][\w-]*')
+NTH_RE = re.compile(r'^\s*(?:([+-]?\d*)n\s*(?:([+-])\s*(\d+))?|([+-]?\d+))\s*$')
+
+# Взаємодія користувача — на першому кадрі не активна
+DYNAMIC_PSEUDO_CLASSES = {
+    'hover', 'focus', 'focus-visible', 'focus-within', 'active', 'visited', 'target', 'target-within',
+}
+# Псевдоелементи, що малюються разом з елементом
+PAINTED_PSEUDO_ELEMENTS = {'before', 'after', 'marker', 'first-line', 'first-letter', 'placeholder'}
+LEGACY_PSEUDO_ELEMENTS = {'before', 'after', 'first-line', 'first-letter'}
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+}
+
+
+# ---------------------- Дерево елементів ----------------------
+
+
+class Element:
+    """Елемент розмітки для зіставлення з селекторами."""
+
+    __slots__ = ('tag', 'attrs', 'classes', 'parent', 'children', 'has_text')
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional['Element'] = None) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = set(attrs.get('class', '').split())
+        self.parent = parent
+        self.children: List['Element'] = []
+        self.has_text = False
+        if parent is not None:
+            parent.children.append(self)
+
+    def siblings_before(self) -> List['Element']:
+        if self.parent is None:
+            return []
+        siblings = self.parent.children
+        return siblings[:siblings.index(self)]
+
+    def walk(self) -> Iterator['Element']:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self, root: Element) -> None:
+        super().__init__(convert_charrefs=True)
+        self.current = root
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        element = Element(tag, {name: value or '' for name, value in attrs}, self.current)
+        if tag not in VOID_ELEMENTS:
+            self.current = element
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        Element(tag, {name: value or '' for name, value in attrs}, self.current)
+
+    def handle_endtag(self, tag: str) -> None:
+        # Незакриті елементи закриваються разом з батьківським
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data: str) -> None:
+        if data.strip():
+            self.current.has_text = True
+
+
+def build_document(markup: Sequence[str], theme: Optional[str] = None) -> Element:
+    """<html><body>шаблони</body></html>; theme — значення data-theme."""
+    html = Element('html', {'data-theme': theme} if theme else {})
+    body = Element('body', {}, html)
+    builder = _TreeBuilder(body)
+    for text in markup:
+        builder.feed(text)
+    builder.close()
+    return html
+
+
+# ---------------------- Зіставлення селекторів ----------------------
+
+
+# Складений селектор: (тег, id, класи, атрибути, псевдо)
+Compound = Tuple[Optional[str], Optional[str], Tuple[str, ...], Tuple, Tuple]
+
+
+def _closing(text: str, start: int, open_char: str, close_char: str) -> int:
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == open_char:
+            depth += 1
+        elif text[i] == close_char:
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text)
+
+
+def compile_selector(selector: str) -> List[Tuple[Compound, Optional[str]]]:
+    """Складені селектори справа наліво, кожен з комбінатором зліва від нього."""
+    compounds: List[Tuple[Compound, Optional[str]]] = []
+    tag: Optional[str] = None
+    id_: Optional[str] = None
+    classes: List[str] = []
+    attrs: List[Tuple[str, Optional[str], str]] = []
+    pseudos: List[Tuple[str, Optional[str], bool]] = []
+    combinator: Optional[str] = None
+    empty = True
+    i = 0
+    n = len(selector)
+
+    def push() -> None:
+        compounds.append(((tag, id_, tuple(classes), tuple(attrs), tuple(pseudos)), combinator))
+
+    while i < n:
+        char = selector[i]
+        if char.isspace() or char in '>+~':
+            j = i
+            found = ' '
+            while j < n and (selector[j].isspace() or selector[j] in '>+~'):
+                if selector[j] in '>+~':
+                    found = selector[j]
+                j += 1
+            if not empty and j < n:
+                push()
+                tag, id_, classes, attrs, pseudos = None, None, [], [], []
+                empty = True
+                combinator = found
+            i = j
+            continue
+
+        empty = False
+        if char == '*':
+            i += 1
+        elif char == '#':
+            m = IDENT_RE.match(selector, i + 1)
+            id_ = m.group() if m else ''
+            i = m.end() if m else i + 1
+        elif char == '.':
+            m = IDENT_RE.match(selector, i + 1)
+            classes.append(m.group() if m else '')
+            i = m.end() if m else i + 1
+        elif char == '[':
+            end = _closing(selector, i, '[', ']')
+            body = selector[i + 1:end].strip()
+            m = re.match(r'([\w-]+)\s*(?:([~|^$*]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s\]]+))\s*(i)?)?', body)
+            if m:
+                value = next((v for v in m.group(3, 4, 5) if v is not None), '')
+                attrs.append((m.group(1).lower(), m.group(2), value))
+            i = end + 1
+        elif char == ':':
+            element = selector.startswith('::', i)
+            m = IDENT_RE.match(selector, i + (2 if element else 1))
+            if not m:
+                i += 1
+                continue
+            name = m.group().lower()
+            i = m.end()
+            argument = None
+            if i < n and selector[i] == '(':
+                end = _closing(selector, i, '(', ')')
+                argument = selector[i + 1:end]
+                i = end + 1
+            pseudos.append((name, argument, element or name in LEGACY_PSEUDO_ELEMENTS))
+        else:
+            m = IDENT_RE.match(selector, i)
+            if m:
+                tag = m.group().lower()
+                i = m.end()
+            else:
+                i += 1
+
+    push()
+    compounds.reverse()
+    return compounds
+
+
+class Matcher:
+    """Зіставлення селекторів з деревом елементів (з кешем компіляції)."""
+
+    def __init__(self) -> None:
+        self._compiled: Dict[str, List[Tuple[Compound, Optional[str]]]] = {}
+
+    def compiled(self, selector: str) -> List[Tuple[Compound, Optional[str]]]:
+        parts = self._compiled.get(selector)
+        if parts is None:
+            parts = self._compiled[selector] = compile_selector(selector)
+        return parts
+
+    def matches_any(self, selector: str, elements: Sequence[Element]) -> bool:
+        parts = self.compiled(selector)
+        return any(self._match(parts, 0, element) for element in elements)
+
+    def _match(self, parts: List[Tuple[Compound, Optional[str]]], i: int, element: Element) -> bool:
+        compound, combinator = parts[i]
+        if not self._match_compound(compound, element):
+            return False
+        if i + 1 == len(parts):
+            return True
+        if combinator == '>':
+            return element.parent is not None and self._match(parts, i + 1, element.parent)
+        if combinator == ' ':
+            node = element.parent
+            while node is not None:
+                if self._match(parts, i + 1, node):
+                    return True
+                node = node.parent
+            return False
+        siblings = element.siblings_before()
+        if combinator == '+':
+            return bool(siblings) and self._match(parts, i + 1, siblings[-1])
+        return any(self._match(parts, i + 1, sibling) for sibling in siblings)
+
+    def _match_compound(self, compound: Compound, element: Element) -> bool:
+        tag, id_, classes, attrs, pseudos = compound
+        if tag is not None and tag != element.tag:
+            return False
+        if id_ is not None and element.attrs.get('id') != id_:
+            return False
+        if classes and not element.classes.issuperset(classes):
+            return False
+        for name, op, value in attrs:
+            actual = element.attrs.get(name)
+            if actual is None or not _match_attr(actual, op, value):
+                return False
+        return all(self._match_pseudo(name, arg, is_element, element) for name, arg, is_element in pseudos)
+
+    def _match_pseudo(self, name: str, argument: Optional[str], is_element: bool, element: Element) -> bool:
+        if is_element:
+            return name in PAINTED_PSEUDO_ELEMENTS
+        if name in DYNAMIC_PSEUDO_CLASSES:
+            return False
+        if name == 'root':
+            return element.parent is None
+        if name in ('is', 'where', 'matches', 'any'):
+            return any(self._match_single(arg, element) for arg in split_selector_list(argument or ''))
+        if name == 'not':
+            return not any(self._match_single(arg, element) for arg in split_selector_list(argument or ''))
+        if name == 'has':
+            descendants = list(element.walk())[1:]
+            return any(
+                self.matches_any(arg.lstrip('> '), descendants) for arg in split_selector_list(argument or '')
+            )
+        if name in ('first-child', 'last-child', 'only-child', 'first-of-type', 'last-of-type', 'only-of-type',
+                    'nth-child', 'nth-last-child', 'nth-of-type', 'nth-last-of-type'):
+            return _match_position(name, argument, element)
+        if name == 'empty':
+            return not element.children and not element.has_text
+        if name in ('link', 'any-link'):
+            return element.tag in ('a', 'area') and 'href' in element.attrs
+        if name in ('checked', 'disabled', 'required', 'placeholder-shown', 'read-only'):
+            attr = {'placeholder-shown': 'placeholder', 'read-only': 'readonly'}.get(name, name)
+            return attr in element.attrs
+        # Невідомі псевдокласи вважаються такими, що збігаються: краще зайве
+        # правило в critical.css, ніж стрибок верстки
+        return True
+
+    def _match_single(self, selector: str, element: Element) -> bool:
+        return self._match(self.compiled(selector), 0, element)
+
+
+def _match_attr(actual: str, op: Optional[str], value: str) -> bool:
+    if op is None:
+        return True
+    if op == '=':
+        return actual == value
+    if op == '~=':
+        return value in actual.split()
+    if op == '|=':
+        return actual == value or actual.startswith(value + '-')
+    if op == '^=':
+        return bool(value) and actual.startswith(value)
+    if op == '$=':
+        return bool(value) and actual.endswith(value)
+    return bool(value) and value in actual
+
+
+def _match_position(name: str, argument: Optional[str], element: Element) -> bool:
+    if element.parent is None:
+        return name in ('first-child', 'last-child', 'only-child', 'first-of-type', 'last-of-type', 'only-of-type')
+    siblings = element.parent.children
+    if name.endswith('of-type'):
+        siblings = [sibling for sibling in siblings if sibling.tag == element.tag]
+    index = siblings.index(element)
+    if name.startswith(('last', 'nth-last')):
+        index = len(siblings) - 1 - index
+    if name.startswith('only'):
+        return len(siblings) == 1
+    if not name.startswith('nth'):
+        return index == 0
+
+    argument = (argument or '').split(' of ', 1)[0].strip().lower()
+    position = index + 1
+    if argument == 'odd':
+        return position % 2 == 1
+    if argument == 'even':
+        return position % 2 == 0
+    m = NTH_RE.match(argument)
+    if not m:
+        return True
+    if m.group(4) is not None:
+        return position == int(m.group(4))
+    a = {'': 1, '+': 1, '-': -1}.get(m.group(1), None)
+    a = int(m.group(1)) if a is None else a
+    b = int(m.group(3) or 0) * (-1 if m.group(2) == '-' else 1)
+    if a == 0:
+        return position == b
+    return (position - b) % a == 0 and (position - b) // a >= 0
+
+
+# ---------------------- Розділення правил ----------------------
+
+
+def _is_custom(declaration: str) -> bool:
+    return declaration.startswith('--')
+
+
+def _property(declaration: str) -> str:
+    return declaration.split(':', 1)[0].strip().lower()
+
+
+def _value(declaration: str) -> str:
+    return declaration.split(':', 1)[1] if ':' in declaration else ''
+
+
+class CriticalExtractor:
+    """Розділення правил джерел на критичні та відкладені."""
+
+    def __init__(self, documents: Sequence[Element], inline_css: str = '') -> None:
+        self.elements = [element for document in documents for element in document.walk()]
+        self.matcher = Matcher()
+        self.inline_css = inline_css
+        # id(вузол) -> селектори, що збігаються
+        self.matched: Dict[int, List[str]] = {}
+
+    def _select(self, nodes: Sequence[CssNode], parent: Optional[str] = None) -> None:
+        for node in nodes:
+            at_rule = node.at_rule
+            if at_rule is not None:
+                if at_rule == 'media' and _print_only(node.prelude):
+                    continue
+                if at_rule in ('media', 'supports', 'layer', 'container'):
+                    self._select(node.children, parent)
+                continue
+            selectors = resolve_nesting(node.prelude, parent)
+            matched = [sel for sel in selectors if self.matcher.matches_any(sel, self.elements)]
+            if matched:
+                self.matched[id(node)] = matched
+            if node.children:
+                self._select(node.children, ', '.join(selectors))
+
+    def _critical_nodes(self, nodes: Sequence[CssNode]) -> Iterator[CssNode]:
+        for node in nodes:
+            if id(node) in self.matched:
+                yield node
+            yield from self._critical_nodes(node.children)
+
+    def split(self, sources: Sequence[Tuple[str, List[CssNode]]]) -> Tuple[List[CssNode], List[CssNode], Dict]:
+        """(критичні вузли, відкладені вузли, статистика)."""
+        for _, nodes in sources:
+            self._select(nodes)
+
+        # Змінні, анімації та шрифти, на які посилаються критичні правила
+        definitions: Dict[str, List[str]] = {}
+        used_vars = set(VAR_REF_RE.findall(self.inline_css))
+        animations: Set[str] = set()
+        families: Set[str] = set()
+        for _, nodes in sources:
+            for node in self._critical_nodes(nodes):
+                for declaration in node.declarations:
+                    prop = _property(declaration)
+                    refs = VAR_REF_RE.findall(_value(declaration))
+                    if _is_custom(declaration):
+                        definitions.setdefault(prop, []).extend(refs)
+                        continue
+                    used_vars.update(refs)
+                    if prop in ('animation', 'animation-name'):
+                        animations.update(IDENT_RE.findall(_value(declaration)))
+                    elif prop in ('font', 'font-family'):
+                        families.update(f.strip(' "\'').lower() for f in _value(declaration).split(','))
+
+        pending = list(used_vars)
+        while pending:
+            for ref in definitions.get(pending.pop(), []):
+                if ref not in used_vars:
+                    used_vars.add(ref)
+                    pending.append(ref)
+
+        self.used_vars = used_vars
+        self.animations = animations
+        self.families = families
+        critical: List[CssNode] = []
+        deferred: List[CssNode] = []
+        for _, nodes in sources:
+            c, d = self._split_nodes(nodes, None)
+            critical.extend(c)
+            deferred.extend(d)
+
+        stats = {
+            'rules': sum(1 for _ in _rules(critical)),
+            'deferred_rules': sum(1 for _ in _rules(deferred)),
+            'variables': len(used_vars),
+            'elements': len(self.elements),
+        }
+        return critical, deferred, stats
+
+    def _keep_declaration(self, declaration: str) -> bool:
+        return not _is_custom(declaration) or _property(declaration) in self.used_vars
+
+    def _split_nodes(self, nodes: Sequence[CssNode], parent: Optional[str]) -> Tuple[List[CssNode], List[CssNode]]:
+        critical: List[CssNode] = []
+        deferred: List[CssNode] = []
+        for node in nodes:
+            at_rule = node.at_rule
+            if at_rule is None:
+                c, d = self._split_rule(node, parent)
+            elif not node.block:
+                c, d = [], [node]
+            elif at_rule == 'keyframes' or at_rule.endswith('-keyframes'):
+                name = node.prelude.split(' ', 1)[-1].strip()
+                c, d = ([node], []) if name in self.animations else ([], [node])
+            elif at_rule == 'font-face':
+                family = next((_value(decl).strip(' "\'').lower() for decl in node.declarations
+                               if _property(decl) == 'font-family'), '')
+                c, d = ([node], []) if family in self.families else ([], [node])
+            elif at_rule in ('media', 'supports', 'layer', 'container') and not (
+                at_rule == 'media' and _print_only(node.prelude)
+            ):
+                inner_c, inner_d = self._split_nodes(node.children, parent)
+                c = [node.copy(children=inner_c)] if inner_c else []
+                d = [node.copy(children=inner_d)] if inner_d else []
+            else:
+                c, d = [], [node]
+            critical.extend(c)
+            deferred.extend(d)
+        return critical, deferred
+
+    def _split_rule(self, node: CssNode, parent: Optional[str]) -> Tuple[List[CssNode], List[CssNode]]:
+        selectors = resolve_nesting(node.prelude, parent)
+        matched = self.matched.get(id(node), [])
+        rest = [sel for sel in selectors if sel not in matched]
+        kept = [decl for decl in node.declarations if self._keep_declaration(decl)]
+        dropped = [decl for decl in node.declarations if not self._keep_declaration(decl)]
+
+        critical: List[CssNode] = []
+        deferred: List[CssNode] = []
+        if matched and kept:
+            critical.append(node.copy(prelude=', '.join(matched), declarations=kept, children=[]))
+        if rest and node.declarations:
+            deferred.append(node.copy(prelude=', '.join(rest), children=[]))
+        if matched and dropped:
+            deferred.append(node.copy(prelude=', '.join(matched), declarations=dropped, children=[]))
+        if not matched and not rest and node.declarations:
+            deferred.append(node.copy(children=[]))
+
+        # Вкладені правила (CSS nesting) виводяться плоско з повними селекторами
+        if node.children:
+            c, d = self._split_nodes(node.children, ', '.join(selectors))
+            critical.extend(c)
+            deferred.extend(d)
+        return critical, deferred
+
+
+def _print_only(prelude: str) -> bool:
+    return prelude[len('@media'):].strip().lower().startswith('print')
+
+
+def _rules(nodes: Sequence[CssNode]) -> Iterator[CssNode]:
+    for node in nodes:
+        if node.at_rule is None:
+            yield node
+        yield from _rules(node.children)
+
+
+# ---------------------- Вивід ----------------------
+
+
+def _header(title: str, inputs: str) -> str:
+    templates = ', '.join(path.relative_to(BASE_PATH).as_posix() for path in ABOVE_THE_FOLD)
+    sources = '\n'.join(f" *   {path.relative_to(BASE_PATH).as_posix()}" for path in SOURCE_STYLESHEETS)
+    return (
+        f"/**\n"
+        f" * {title}\n"
+        f" *\n"
+        f" * GENERATED by scripts/critical_css.py - do not edit by hand.\n"
+        f" * Above the fold: {templates}\n"
+        f" * Sources:\n{sources}\n"
+        f" *\n"
+        f" * @package Medici\n"
+        f" * Inputs: {inputs}\n"
+        f" */\n\n"
+    )
+
+
+def inputs_hash() -> str:
+    """Хеш усіх вхідних файлів і коду генератора."""
+    digest = hashlib.sha1()
+    for path in [*ABOVE_THE_FOLD, *SOURCE_STYLESHEETS, Path(__file__), Path(__file__).with_name('css_index.py')]:
+        digest.update(path.relative_to(BASE_PATH).as_posix().encode())
+        digest.update(path.read_bytes() if path.exists() else b'')
+    return digest.hexdigest()
+
+
+def current_hash(path: Path = CRITICAL_PATH) -> Optional[str]:
+    """Хеш входів, з яких згенеровано наявний файл."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            m = INPUTS_RE.search(f.read(4096))
+    except OSError:
+        return None
+    return m.group(1) if m else None
+
+
+def _style_values(styles: Dict) -> Iterator[str]:
+    """Рядкові значення styles блоку, включно з вкладеними (@media, :hover)."""
+    for value in styles.values():
+        if isinstance(value, dict):
+            yield from _style_values(value)
+        elif isinstance(value, str):
+            yield value
+
+
+def inline_styles(markup: Sequence[str]) -> str:
+    """Inline CSS блоків: атрибут css та значення styles.
+
+    GenerateBlocks друкує обидва в <head>, тож змінні з них мають бути в
+    critical.css.
+    """
+    parts: List[str] = []
+    for text in markup:
+        _, blocks = parse_document(text)
+        for block in blocks:
+            parts.append(block.attrs.get('css', ''))
+            parts.extend(_style_values(block.styles))
+    return '\n'.join(parts).replace(ESCAPED_DASH, '-')
+
+
+def missing_variables(path: Path = CRITICAL_PATH) -> List[str]:
+    """Змінні джерел, на які посилаються блоки першого екрану, але яких немає у файлі."""
+    used = set(VAR_REF_RE.findall(inline_styles([p.read_text(encoding='utf-8') for p in ABOVE_THE_FOLD])))
+    defined: Set[str] = set()
+    for source in SOURCE_STYLESHEETS:
+        if source.exists():
+            defined.update(VAR_DEF_RE.findall(source.read_text(encoding='utf-8')))
+    try:
+        present = set(VAR_DEF_RE.findall(path.read_text(encoding='utf-8')))
+    except OSError:
+        present = set()
+    return sorted(used & defined - present)
+
+
+def generate(inputs: str) -> Tuple[str, Dict]:
+    """Текст critical.css та статистика."""
+    markup = [path.read_text(encoding='utf-8') for path in ABOVE_THE_FOLD]
+    inline_css = inline_styles(markup)
+
+    documents = [build_document(markup), build_document(markup, 'dark')]
+    sources = [
+        (path.relative_to(BASE_PATH).as_posix(), parse_stylesheet(path.read_text(encoding='utf-8')))
+        for path in SOURCE_STYLESHEETS if path.exists()
+    ]
+    extractor = CriticalExtractor(documents, inline_css)
+    critical, _, stats = extractor.split(sources)
+
+    critical_css = _header('Critical CSS - Above the Fold Styles', inputs) + render_stylesheet(critical)
+    stats['source_bytes'] = sum(path.stat().st_size for path in SOURCE_STYLESHEETS if path.exists())
+    return critical_css, stats
+
+
+# ---------------------- CLI ----------------------
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    parser = argparse.ArgumentParser(description='Генерація css/critical.css з шаблонів першого екрану')
+    parser.add_argument('--check', action='store_true', help='лише перевірити, що critical.css актуальний')
+    parser.add_argument('--force', action='store_true', help='згенерувати навіть без змін у входах')
+    parser.add_argument('--stats', action='store_true', help='вивести розміри та кількість правил')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    inputs = inputs_hash()
+    fresh = current_hash(CRITICAL_PATH) == inputs
+
+    if args.check:
+        if not fresh:
+            print("❌ critical.css застарів: python3 scripts/critical_css.py", file=sys.stderr)
+            return 1
+        missing = missing_variables()
+        if missing:
+            print(f"❌ critical.css не визначає змінні блоків першого екрану: {', '.join(missing)}", file=sys.stderr)
+            return 1
+        print(f"✅ critical.css актуальний ({(time.perf_counter() - started) * 1000:.1f} мс)")
+        return 0
+
+    if fresh and not args.force:
+        print(f"critical.css актуальний, входи не змінились ({(time.perf_counter() - started) * 1000:.1f} мс)")
+        return 0
+
+    critical_css, stats = generate(inputs)
+    CRITICAL_PATH.write_text(critical_css, encoding='utf-8')
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {CRITICAL_PATH.relative_to(BASE_PATH)}: {len(critical_css.encode()) / 1024:.1f} КБ "
+          f"({elapsed * 1000:.0f} мс)")
+    if args.stats:
+        print(f"  Елементів першого екрану: {stats['elements']}")
+        print(f"  Правил: критичних {stats['rules']}, відкладених {stats['deferred_rules']}")
+        print(f"  CSS змінних у critical.css: {stats['variables']}")
+        print(f"  Джерела: {stats['source_bytes'] / 1024:.1f} КБ")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Індекс CSS селекторів теми
+
+Кожна таблиця стилів у css/ токенізується один раз: коментарі, рядки,
+@media/@supports та вкладені блоки розбираються за один прохід. Індекс
+зберігає для кожного класу, де він визначений: файл, рядок, media query,
+селектор та специфічність (a, b, c). Результат лежить у .css-index;
+при наступному запуску перечитуються лише змінені файли (mtime/розмір,
+потім sha1), тож запит до індексу займає мілісекунди.
+
+Використання:
+    python3 scripts/css_index.py                    # статистика індексу
+    python3 scripts/css_index.py --class gbp-section
+    python3 scripts/css_index.py --rebuild
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+BASE_PATH = Path(__file__).parent.parent
+CSS_DIR = BASE_PATH / 'css'
+INDEX_PATH = BASE_PATH / '.css-index'
+
+# Коментарі, рядки та межі блоків; усе інше — текст прелюдії або декларацій
+TOKEN_RE = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[{};]', re.S)
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+ATTR_RE = re.compile(r'\[[^\]]*\]')
+IDENT_RE = re.compile(r'-?[_a-zA-Z][\w-]*')
+# Рядок у лапках (як у TOKEN_RE) — група, щоб re.split залишав рядки в списку
+STRING_RE = re.compile(r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')')
+SPACE_RE = re.compile(r'\s+')
+
+# At-rules, всередині яких стоять звичайні правила
+CONDITIONAL_AT_RULES = {'media', 'supports', 'layer', 'container', 'document'}
+# Псевдоелементи з однією двокрапкою (CSS2)
+LEGACY_PSEUDO_ELEMENTS = {'before', 'after', 'first-line', 'first-letter'}
+
+Specificity = Tuple[int, int, int]
+# (рядок, media, селектор, специфічність, класи)
+Rule = Tuple[int, Optional[str], str, Specificity, List[str]]
+
+
+# ---------------------- Токенізація ----------------------
+
+
+class CssNode:
+    """Вузол таблиці стилів: правило (селектор) або at-rule (@media ...).
+
+    declarations — декларації без ';' у порядку файлу; children — вкладені
+    вузли (@media, CSS nesting). Для @import/@charset обидва порожні.
+    """
+
+    __slots__ = ('prelude', 'line', 'declarations', 'children', 'block')
+
+    def __init__(self, prelude: str, line: int, block: bool = True) -> None:
+        self.prelude = prelude
+        self.line = line
+        self.declarations: List[str] = []
+        self.children: List['CssNode'] = []
+        self.block = block
+
+    @property
+    def at_rule(self) -> Optional[str]:
+        """Назва at-rule в нижньому регістрі ('media', 'font-face') або None."""
+        if not self.prelude.startswith('@'):
+            return None
+        return self.prelude[1:].split(' ', 1)[0].split('(', 1)[0].lower()
+
+    def copy(self, **changes) -> 'CssNode':
+        """Копія вузла із заміненими полями (prelude, declarations, children)."""
+        node = CssNode(changes.get('prelude', self.prelude), self.line, self.block)
+        node.declarations = changes.get('declarations', self.declarations)
+        node.children = changes.get('children', self.children)
+        return node
+
+    def __repr__(self) -> str:
+        return f"<CssNode {self.prelude!r}:{self.line}>"
+
+
+def normalize_space(text: str) -> str:
+    """Пробіли поза рядками в лапках — один пробіл; рядки (content: "a  b") без змін."""
+    if '"' not in text and "'" not in text:
+        return ' '.join(text.split())
+    parts = STRING_RE.split(text)
+    parts[::2] = [SPACE_RE.sub(' ', part) for part in parts[::2]]
+    return ''.join(parts).strip()
+
+
+def parse_stylesheet(css: str) -> List[CssNode]:
+    """Дерево вузлів таблиці стилів за один прохід токенізатора.
+
+    ';' всередині дужок (url(data:...;base64,...)) не розділяє декларації.
+    """
+    roots: List[CssNode] = []
+    stack: List[CssNode] = []
+    parts: List[str] = []
+    seg_start = 0
+    line = 1
+    counted = 0
+
+    def flush(end: int) -> str:
+        nonlocal parts, seg_start
+        text = ''.join(parts) + css[seg_start:end]
+        parts = []
+        return text
+
+    for m in TOKEN_RE.finditer(css):
+        token = m.group()
+        if token.startswith('/*'):
+            parts.append(css[seg_start:m.start()])
+            seg_start = m.end()
+            continue
+        if token[0] in '"\'':
+            continue
+
+        text = flush(m.start())
+        if token == ';' and text.count('(') > text.count(')'):
+            # Крапка з комою всередині дужок — частина значення
+            parts.append(text + ';')
+            seg_start = m.end()
+            continue
+        seg_start = m.end()
+        statement = normalize_space(text)
+
+        if token == '{':
+            start = m.start() - len(text.lstrip()) if statement else m.start()
+            line += css.count('\n', counted, start)
+            counted = start
+            node = CssNode(statement, line)
+            (stack[-1].children if stack else roots).append(node)
+            stack.append(node)
+        elif token == ';':
+            if not statement:
+                continue
+            if stack:
+                stack[-1].declarations.append(statement)
+            else:
+                roots.append(CssNode(statement, line, block=False))
+        else:
+            if statement and stack:
+                stack[-1].declarations.append(statement)
+            if stack:
+                stack.pop()
+    return roots
+
+
+def parse_rules(css: str) -> Iterator[Tuple[int, Optional[str], str]]:
+    """Правила стилів у порядку файлу: (рядок, media query, селектор).
+
+    Селектори з комою повертаються окремо. Вміст @keyframes, @font-face,
+    @page тощо пропускається; @media всередині @media об'єднується через and.
+    """
+    yield from _walk_rules(parse_stylesheet(css), [], None)
+
+
+def _walk_rules(
+    nodes: Sequence[CssNode], media: List[str], parent: Optional[str]
+) -> Iterator[Tuple[int, Optional[str], str]]:
+    for node in nodes:
+        at_rule = node.at_rule
+        if at_rule is not None:
+            if at_rule == 'media':
+                condition = node.prelude[len('@media'):].strip()
+                yield from _walk_rules(node.children, media + [condition], parent)
+            elif at_rule in CONDITIONAL_AT_RULES:
+                yield from _walk_rules(node.children, media, parent)
+            continue
+
+        selectors = resolve_nesting(node.prelude, parent)
+        for single in selectors:
+            yield node.line, ' and '.join(media) or None, single
+        if node.children:
+            yield from _walk_rules(node.children, media, ', '.join(selectors))
+
+
+def resolve_nesting(selector: str, parent: Optional[str]) -> List[str]:
+    """Список селекторів правила з підставленим батьківським (CSS nesting)."""
+    selectors = split_selector_list(selector)
+    if parent is None:
+        return selectors
+    # & — батьківський селектор, без & — нащадок
+    parent = f':is({parent})' if ',' in parent else parent
+    return [item.replace('&', parent) if '&' in item else f'{parent} {item}' for item in selectors]
+
+
+def render_stylesheet(nodes: Sequence[CssNode], indent: str = '') -> str:
+    """Форматування вузлів у стилі таблиць стилів теми (таби, правило на блок)."""
+    blocks = []
+    for node in nodes:
+        if not node.block:
+            blocks.append(f"{indent}{node.prelude};\n")
+            continue
+        if node.at_rule is None:
+            head = ',\n'.join(f"{indent}{sel}" for sel in split_selector_list(node.prelude))
+        else:
+            head = f"{indent}{node.prelude}"
+        body = ''.join(f"{indent}\t{decl};\n" for decl in node.declarations)
+        if node.children:
+            body += render_stylesheet(node.children, indent + '\t')
+        blocks.append(f"{head} {{\n{body}{indent}}}\n")
+    return '\n'.join(blocks)
+
+
+def split_selector_list(selector: str) -> List[str]:
+    """Розбити список селекторів по комах верхнього рівня."""
+    result: List[str] = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(selector):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            result.append(selector[start:i].strip())
+            start = i + 1
+    result.append(selector[start:].strip())
+    return [item for item in result if item]
+
+
+# ---------------------- Специфічність ----------------------
+
+
+def _closing_paren(selector: str, start: int) -> int:
+    depth = 0
+    for i in range(start, len(selector)):
+        if selector[i] == '(':
+            depth += 1
+        elif selector[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(selector)
+
+
+def specificity(selector: str) -> Specificity:
+    """Специфічність (id, класи/атрибути/псевдокласи, типи/псевдоелементи)."""
+    a = b = c = 0
+    i = 0
+    n = len(selector)
+    while i < n:
+        char = selector[i]
+        if char == '#':
+            m = IDENT_RE.match(selector, i + 1)
+            a += 1
+            i = m.end() if m else i + 1
+        elif char == '.':
+            m = IDENT_RE.match(selector, i + 1)
+            b += 1
+            i = m.end() if m else i + 1
+        elif char == '[':
+            b += 1
+            end = selector.find(']', i)
+            i = end + 1 if end != -1 else n
+        elif char == ':':
+            element = selector.startswith('::', i)
+            m = IDENT_RE.match(selector, i + (2 if element else 1))
+            if not m:
+                i += 1
+                continue
+            name = m.group().lower()
+            i = m.end()
+            argument = None
+            if i < n and selector[i] == '(':
+                close = _closing_paren(selector, i)
+                argument = selector[i + 1:close]
+                i = close + 1
+
+            if element or name in LEGACY_PSEUDO_ELEMENTS:
+                c += 1
+            elif name == 'where':
+                pass
+            elif name in ('is', 'not', 'has', 'matches') and argument is not None:
+                # Специфічність найбільш специфічного аргументу
+                best = max((specificity(arg) for arg in split_selector_list(argument)), default=(0, 0, 0))
+                a, b, c = a + best[0], b + best[1], c + best[2]
+            else:
+                b += 1
+        elif char.isalpha() or char == '_' or (char == '-' and i + 1 < n and not selector[i + 1].isspace()):
+            m = IDENT_RE.match(selector, i)
+            if m:
+                c += 1
+                i = m.end()
+            else:
+                i += 1
+        else:
+            i += 1
+    return a, b, c
+
+
+def selector_classes(selector: str) -> List[str]:
+    """Класи селектора (без вмісту атрибутних селекторів)."""
+    return list(dict.fromkeys(CLASS_RE.findall(ATTR_RE.sub('', selector))))
+
+
+def index_stylesheet(css: str) -> List[Rule]:
+    """Правила таблиці стилів, що містять хоча б один клас."""
+    rules: List[Rule] = []
+    for line, media, selector in parse_rules(css):
+        classes = selector_classes(selector)
+        if classes:
+            rules.append((line, media, selector, specificity(selector), classes))
+    return rules
+
+
+# ---------------------- Індекс ----------------------
+
+
+def engine_version() -> str:
+    """Хеш коду токенізатора: зміна правил розбору перебудовує індекс."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+class CssIndex:
+    """Персистентний індекс клас -> визначення в таблицях стилів."""
+
+    def __init__(self, root: Path = CSS_DIR, path: Path = INDEX_PATH) -> None:
+        self.root = root
+        self.path = path
+        self.version = engine_version()
+        # відносний шлях -> {mtime_ns, size, sha1, rules}
+        self.files: Dict[str, Dict] = {}
+        self.by_class: Dict[str, List[Tuple[str, Rule]]] = {}
+        self.reindexed: List[str] = []
+        self.dirty = False
+
+    @classmethod
+    def load(cls, root: Path = CSS_DIR, path: Path = INDEX_PATH) -> 'CssIndex':
+        """Індекс з диску (порожній, якщо файлу немає або версія інша)."""
+        index = cls(root, path)
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = {}
+        if data.get('version') == index.version:
+            index.files = {
+                name: dict(entry, rules=[
+                    (line, media, selector, tuple(spec), classes)
+                    for line, media, selector, spec, classes in entry['rules']
+                ])
+                for name, entry in data.get('files', {}).items()
+            }
+        index._build()
+        return index
+
+    def stylesheets(self) -> List[Path]:
+        """Таблиці стилів під root (без .min.css та збірок у dist/ — це похідні файли)."""
+        return sorted(
+            p for p in self.root.rglob('*.css')
+            if not p.name.endswith('.min.css') and 'dist' not in p.relative_to(self.root).parts
+        )
+
+    def update(self) -> List[str]:
+        """Перечитати змінені, додати нові та прибрати видалені файли."""
+        self.reindexed = []
+        seen: Set[str] = set()
+        for sheet in self.stylesheets():
+            name = sheet.relative_to(self.root).as_posix()
+            seen.add(name)
+            stat = sheet.stat()
+            entry = self.files.get(name)
+            if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                continue
+
+            raw = sheet.read_bytes()
+            digest = hashlib.sha1(raw).hexdigest()
+            if entry is None or entry['sha1'] != digest:
+                rules = index_stylesheet(raw.decode('utf-8'))
+                self.reindexed.append(name)
+            else:
+                rules = entry['rules']
+            self.files[name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': digest, 'rules': rules}
+            self.dirty = True
+
+        for name in set(self.files) - seen:
+            del self.files[name]
+            self.dirty = True
+
+        if self.dirty:
+            self._build()
+        return self.reindexed
+
+    def save(self) -> None:
+        """Атомарний запис, лише якщо індекс змінився."""
+        if not self.dirty:
+            return
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps({'version': self.version, 'files': self.files}, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def _build(self) -> None:
+        by_class: Dict[str, List[Tuple[str, Rule]]] = defaultdict(list)
+        for name, entry in self.files.items():
+            for rule in entry['rules']:
+                for cls in rule[4]:
+                    by_class[cls].append((name, rule))
+        self.by_class = dict(by_class)
+
+    def classes(self) -> Set[str]:
+        """Усі класи, що зустрічаються в селекторах."""
+        return set(self.by_class)
+
+    def lookup(self, cls: str) -> List[Dict]:
+        """Визначення класу: файл, рядок, media, селектор, специфічність."""
+        return [
+            {'file': name, 'line': line, 'media': media, 'selector': selector, 'specificity': spec}
+            for name, (line, media, selector, spec, _) in self.by_class.get(cls, [])
+        ]
+
+
+def load_index(root: Path = CSS_DIR, path: Path = INDEX_PATH) -> CssIndex:
+    """Актуальний індекс: завантажити, оновити змінені файли, зберегти."""
+    index = CssIndex.load(root, path)
+    index.update()
+    try:
+        index.save()
+    except OSError:
+        # Read-only checkout: індекс усе одно актуальний у пам'яті
+        pass
+    return index
+
+
+# ---------------------- CLI ----------------------
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    parser = argparse.ArgumentParser(description='Індекс CSS селекторів теми')
+    parser.add_argument('--class', dest='cls', metavar='NAME', help='де визначено клас')
+    parser.add_argument('--prefix', help='класи з префіксом (напр. gbp-)')
+    parser.add_argument('--rebuild', action='store_true', help='перебудувати індекс з нуля')
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        INDEX_PATH.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    index = load_index()
+    elapsed = time.perf_counter() - started
+
+    if args.cls:
+        found = index.lookup(args.cls)
+        for item in found:
+            media = f"  @media {item['media']}" if item['media'] else ''
+            spec = ','.join(map(str, item['specificity']))
+            print(f"css/{item['file']}:{item['line']}  ({spec})  {item['selector']}{media}")
+        return 0 if found else 1
+
+    if args.prefix:
+        for cls in sorted(c for c in index.by_class if c.startswith(args.prefix)):
+            print(cls)
+        return 0
+
+    rules = sum(len(entry['rules']) for entry in index.files.values())
+    print(f"Файлів: {len(index.files)}, правил з класами: {rules}, класів: {len(index.by_class)}")
+    print(f"Перечитано: {len(index.reindexed)}, час: {elapsed * 1000:.1f} мс")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
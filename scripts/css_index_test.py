@@ -0,0 +1,34 @@
+import unittest
+
+from css_index import normalize_space, parse_stylesheet, render_stylesheet
+
+
+# Запуск: cd scripts && python3 -m unittest css_index_test
+class TestWhitespace(unittest.TestCase):
+
+    def test_spaces_inside_content_string_kept(self):
+        """Подвійний пробіл і ';' у content: "..." не змінюються"""
+        nodes = parse_stylesheet('.a::before {\n  content:  "a  b;";\n  color :\tred;\n}')
+        self.assertEqual(nodes[0].declarations, ['content: "a  b;"', 'color : red'])
+
+    def test_single_quoted_string_kept(self):
+        """Рядки в одинарних лапках теж не нормалізуються"""
+        self.assertEqual(normalize_space("  font-family:\n 'My  Font',  serif "), "font-family: 'My  Font', serif")
+
+    def test_escaped_quote_inside_string(self):
+        """Екранована лапка не закриває рядок"""
+        self.assertEqual(normalize_space('content:  "a \\"  b"'), 'content: "a \\"  b"')
+
+    def test_selector_whitespace_collapsed(self):
+        """Селектори без лапок нормалізуються як і раніше"""
+        nodes = parse_stylesheet('.a   >\n  .b[data-x="1  2"]  { color: red }')
+        self.assertEqual(nodes[0].prelude, '.a > .b[data-x="1  2"]')
+
+    def test_render_roundtrip(self):
+        """Відрендерений CSS зберігає вміст рядка"""
+        css = render_stylesheet(parse_stylesheet('.a::after { content: "x  y" }'))
+        self.assertIn('"x  y"', css)
+
+
+if __name__ == '__main__':
+    unittest.main()
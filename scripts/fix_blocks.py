@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Пакетне виправлення блочного HTML GenerateBlocks
+
+Правила (escaping CSS змінних і ampersand, transition, media queries)
+застосовуються одним проходом re.subn кожне, файли обробляються
+паралельно в пулі процесів. Запис атомарний: тимчасовий файл у тій самій
+директорії + os.replace, тож перерваний запуск не лишає обрізаних файлів.
+
+Використання:
+    python3 scripts/fix_blocks.py                       # gutenberg/ та templates/
+    python3 scripts/fix_blocks.py --diff                # unified diff, без запису
+    python3 scripts/fix_blocks.py gutenberg/TEAM.html --rules ampersand
+    python3 scripts/fix_blocks.py --benchmark 5         # порівняння зі старим циклом replace
+    python3 scripts/fix_blocks.py --unique-ids --diff   # конфлікти uniqueId між файлами
+
+UniqueId перевіряються глобально: --unique-ids будує один індекс усіх
+файлів і видає нові 8 hex ідентифікатори невалідним та повторним (перше
+входження в порядку файлів зберігається). Заміна — у власній розмітці
+блоку ("uniqueId", селектори в "css" та класи .gb-*-<id>) і в селекторах
+.gb-*-<id> з "css" інших блоків того ж документа.
+"""
+
+import argparse
+import difflib
+import os
+import re
+import secrets
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from gutenberg_blocks import Block, BlockIndex, BlockParseError, collect_files, parse_document
+
+BASE_PATH = Path(__file__).parent.parent
+DEFAULT_DIRS = [BASE_PATH / 'gutenberg', BASE_PATH / 'templates']
+
+# (назва, підпис, шаблон, заміна). Правильна форма в сирому тексті —
+# подвійний backslash: var(\\u002d\\u002d...) та \\u0026. Поза var()
+# одинарний \u002d коректний (globalClasses: "gbp-section\u002d\u002dalt")
+RULES: List[Tuple[str, str, Pattern, str]] = [
+    (
+        'css-vars', 'CSS Variables',
+        re.compile(r'var\((?:\\u005cu002d\\u005cu002d|\\u002d\\u002d)'),
+        r'var(\\\\u002d\\\\u002d',
+    ),
+    (
+        'ampersand', 'Ampersand',
+        re.compile(r'\\u005cu0026|(?<!\\)\\u0026'),
+        r'\\\\u0026',
+    ),
+    (
+        'transition', 'Transition',
+        re.compile(r'"transition":\s*"all\s+0\.5s\s+ease\s+0s"'),
+        '"transition": "all 0.3s ease 0s"',
+    ),
+    (
+        'media-queries', 'Media Queries',
+        re.compile(r'max-width:(\d+px)'),
+        r'max-width: \1',
+    ),
+]
+RULE_NAMES = [name for name, _, _, _ in RULES]
+UNIQUE_ID_RE = re.compile(r'[0-9a-f]{8}')
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+# ---------------------- Виправлення ----------------------
+
+
+def fix_content(content: str, rules: Optional[Sequence[str]] = None) -> Tuple[str, Dict[str, int]]:
+    """Застосувати правила до тексту: (новий текст, кількість замін по правилах)."""
+    counts: Dict[str, int] = {}
+    for name, _, pattern, repl in RULES:
+        if rules is not None and name not in rules:
+            continue
+        content, counts[name] = pattern.subn(repl, content)
+    return content, counts
+
+
+def invalid_unique_ids(content: str) -> List[str]:
+    """UniqueId, що не є 8 hex символами в нижньому регістрі."""
+    _, blocks = parse_document(content)
+    return [
+        block.unique_id for block in blocks
+        if block.unique_id is not None and not UNIQUE_ID_RE.fullmatch(block.unique_id)
+    ]
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Запис через тимчасовий файл і os.replace (права доступу зберігаються)."""
+    fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def fix_file(path: Path, rules: Optional[Sequence[str]] = None, write: bool = True, diff: bool = False) -> Dict:
+    """Виправити один файл; виконується у процесі пулу."""
+    result = {'file': str(path), 'counts': {}, 'changed': False, 'invalid_ids': [], 'diff': '', 'error': None}
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            original = f.read()
+        content, result['counts'] = fix_content(original, rules)
+        result['changed'] = content != original
+        try:
+            result['invalid_ids'] = invalid_unique_ids(content)
+        except BlockParseError as e:
+            result['error'] = f"структура блоків: {e}"
+
+        if result['changed'] and diff:
+            result['diff'] = ''.join(difflib.unified_diff(
+                original.splitlines(keepends=True),
+                content.splitlines(keepends=True),
+                fromfile=f"a/{str(path).lstrip('/')}",
+                tofile=f"b/{str(path).lstrip('/')}",
+            ))
+        if result['changed'] and write:
+            write_atomic(path, content)
+    except (OSError, UnicodeDecodeError) as e:
+        result['error'] = str(e)
+    return result
+
+
+def fix_paths(
+    paths: Sequence[Path],
+    rules: Optional[Sequence[str]] = None,
+    write: bool = True,
+    diff: bool = False,
+    jobs: Optional[int] = None,
+) -> List[Dict]:
+    """Виправити файли паралельно; результати в порядку paths."""
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+    if jobs <= 1:
+        return [fix_file(path, rules, write, diff) for path in paths]
+
+    count = len(paths)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(
+            fix_file, paths, [rules] * count, [write] * count, [diff] * count,
+            chunksize=max(1, count // (jobs * 4)),
+        ))
+
+
+# ---------------------- UniqueId ----------------------
+
+
+def unique_id_conflicts(index: BlockIndex) -> Dict[str, List[Block]]:
+    """Блоки, яким потрібен новий uniqueId (старий id -> блоки).
+
+    Один прохід по індексу: невалідні id — усі блоки, повторні — усі,
+    крім першого входження (документи індексуються в порядку файлів).
+    """
+    conflicts = {}
+    for uid, blocks in index.by_unique_id.items():
+        if not UNIQUE_ID_RE.fullmatch(uid):
+            conflicts[uid] = blocks
+        elif len(blocks) > 1:
+            conflicts[uid] = blocks[1:]
+    return conflicts
+
+
+def new_unique_id(taken: set) -> str:
+    while True:
+        uid = secrets.token_hex(4)
+        if uid not in taken:
+            taken.add(uid)
+            return uid
+
+
+def _own_segments(block: Block) -> List[Tuple[int, int]]:
+    """Ділянки тексту блоку без дочірніх блоків."""
+    segments = []
+    pos = block.start
+    for child in block.children:
+        segments.append((pos, child.start))
+        pos = child.end
+    segments.append((pos, block.end))
+    return segments
+
+
+def rename_unique_ids(content: str, renames: Sequence[Tuple[Block, str]]) -> str:
+    """Замінити uniqueId блоків у їхній розмітці та в css інших блоків документа.
+
+    Посилання на id — значення "uniqueId" (після лапки) та суфікс класу
+    .gb-<тип>-<id> у "css" і HTML (після дефіса); дочірні блоки з тим самим
+    id не зачіпаються. Селектори .gb-<тип>-<id> у "css" решти блоків
+    (".gb-element-X .gb-text-<id>" у батька) переписуються на новий id
+    першого перейменованого блоку; блок, що зберігає старий id (перше
+    входження), свої селектори не змінює.
+    """
+    edits = []
+    for block, new in renames:
+        pattern = re.compile(r'(?<=["-])' + re.escape(block.unique_id) + r'(?![0-9A-Za-z])')
+        for start, end in _own_segments(block):
+            edits.append((start, end, pattern.sub(new, content[start:end])))
+    content = _apply_edits(content, edits)
+
+    targets: Dict[str, str] = {}
+    for block, new in sorted(renames, key=lambda item: item[0].start):
+        targets.setdefault(block.unique_id, new)
+    if not targets:
+        return content
+
+    selector = re.compile(r'(\.gb-[a-z-]+-)(' + '|'.join(map(re.escape, targets)) + r')(?![0-9A-Za-z])')
+    edits = []
+    # Після першої заміни перейменовані блоки вже мають нові id
+    for block in parse_document(content)[1]:
+        css = block.attrs.get('css')
+        if not block.attrs_span or not isinstance(css, str) or not selector.search(css):
+            continue
+        start, end = block.attrs_span
+        own = block.unique_id
+        text = selector.sub(
+            lambda m: m.group() if m.group(2) == own else m.group(1) + targets[m.group(2)],
+            content[start:end],
+        )
+        edits.append((start, end, text))
+    return _apply_edits(content, edits)
+
+
+def _apply_edits(content: str, edits: Sequence[Tuple[int, int, str]]) -> str:
+    """Текст з заміненими ділянками (start, end, новий текст), що не перетинаються."""
+    parts = []
+    pos = 0
+    for start, end, text in sorted(edits):
+        parts.append(content[pos:start])
+        parts.append(text)
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+def regenerate_unique_ids(paths: Sequence[Path], write: bool = True, diff: bool = False) -> List[Dict]:
+    """Нові uniqueId для конфліктних блоків у всіх файлах одним індексом."""
+    contents = {str(path): path.read_text(encoding='utf-8') for path in paths}
+    index = BlockIndex()
+    for name, content in contents.items():
+        index.add(name, content)
+
+    taken = set(index.by_unique_id)
+    renames: Dict[str, List[Tuple[Block, str]]] = {}
+    for uid, blocks in unique_id_conflicts(index).items():
+        for block in blocks:
+            renames.setdefault(block.path, []).append((block, new_unique_id(taken)))
+
+    results = []
+    for name, items in renames.items():
+        original = contents[name]
+        content = rename_unique_ids(original, items)
+        result = {
+            'file': name,
+            'renamed': [(block.unique_id, new, block.line) for block, new in items],
+            'diff': '',
+        }
+        if diff:
+            result['diff'] = ''.join(difflib.unified_diff(
+                original.splitlines(keepends=True),
+                content.splitlines(keepends=True),
+                fromfile=f"a/{name.lstrip('/')}",
+                tofile=f"b/{name.lstrip('/')}",
+            ))
+        if write:
+            write_atomic(Path(name), content)
+        results.append(result)
+    return results
+
+
+# ---------------------- Бенчмарк ----------------------
+
+
+def _legacy_fix(content: str) -> str:
+    """Старий fix_html_escaping.py: content.replace(old, new, 1) на кожен збіг."""
+    for match in list(re.finditer(r'var\(\\u002d\\u002d([^)]+)\)', content)):
+        old = match.group(0)
+        content = content.replace(old, old.replace('\\u002d\\u002d', '\\\\u002d\\\\u002d'), 1)
+    for match in list(re.finditer(r'(?<!\\)\\u0026(:is\([^)]+\))', content)):
+        old = match.group(0)
+        content = content.replace(old, old.replace('\\u0026', '\\\\u0026'), 1)
+    return content
+
+
+def benchmark(sources: Sequence[Path], copies: int) -> None:
+    """Цикл replace проти одного re.subn на правило на великому документі."""
+    content = ''.join(path.read_text(encoding='utf-8') for path in sources) * copies
+    print(f"Документ: {len(content) / 1024 / 1024:.1f} МБ")
+
+    started = time.perf_counter()
+    _legacy_fix(content)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fix_content(content, ['css-vars', 'ampersand'])
+    single = time.perf_counter() - started
+
+    print(f"  цикл replace:   {legacy:.3f} с")
+    print(f"  re.subn:        {single:.3f} с  (x{legacy / single:.1f})")
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Пакетне виправлення блочного HTML')
+    parser.add_argument('paths', nargs='*', type=Path, help='файли або директорії (за замовчуванням gutenberg/ та templates/)')
+    parser.add_argument('--rules', nargs='+', choices=RULE_NAMES, help='лише вказані правила')
+    parser.add_argument('--dry-run', action='store_true', help='не записувати зміни')
+    parser.add_argument('--diff', action='store_true', help='вивести unified diff (без запису)')
+    parser.add_argument('--jobs', '-j', type=int, help='кількість процесів (за замовчуванням — кількість CPU)')
+    parser.add_argument('--unique-ids', action='store_true', help='перегенерувати невалідні та повторні (між файлами) uniqueId')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='порівняти зі старим циклом replace на N копіях файлів')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    files = collect_files(args.paths or DEFAULT_DIRS)
+    if not files:
+        print(f"{RED}✗ HTML файли не знайдені!{RESET}", file=sys.stderr)
+        return 1
+
+    if args.benchmark:
+        benchmark(files, args.benchmark)
+        return 0
+
+    write = not (args.dry_run or args.diff)
+    if args.unique_ids:
+        return regenerate_ids_cli(files, write, args.diff)
+
+    results = fix_paths(files, args.rules, write=write, diff=args.diff, jobs=args.jobs)
+
+    if args.diff:
+        sys.stdout.writelines(result['diff'] for result in results)
+        return 1 if any(result['error'] for result in results) else 0
+
+    labels = {name: label for name, label, _, _ in RULES}
+    totals: Dict[str, int] = dict.fromkeys(labels, 0)
+    errors = 0
+    for result in results:
+        name = Path(result['file']).name
+        if result['error']:
+            errors += 1
+            print(f"{RED}✗ {name}: {result['error']}{RESET}")
+            continue
+        fixed = {rule: count for rule, count in result['counts'].items() if count}
+        if not fixed and not result['invalid_ids']:
+            continue
+        print(f"{GREEN}✓{RESET} {name}")
+        for rule, count in fixed.items():
+            print(f"  • {labels[rule]}: {count} виправлень")
+            totals[rule] += count
+        for uid in result['invalid_ids']:
+            print(f"  {RED}⚠ Invalid UniqueId:{RESET} {uid}")
+
+    print(f"\n{BLUE}Файлів: {len(results)}, змінено: {sum(r['changed'] for r in results)}{RESET}")
+    for rule, label in labels.items():
+        if args.rules is None or rule in args.rules:
+            print(f"{label} виправлено: {totals[rule]}")
+    if not write:
+        print(f"\n{YELLOW}⚠ DRY RUN - зміни НЕ збережені.{RESET}")
+    return 1 if errors else 0
+
+
+def regenerate_ids_cli(files: Sequence[Path], write: bool, diff: bool) -> int:
+    try:
+        results = regenerate_unique_ids(files, write=write, diff=diff)
+    except BlockParseError as e:
+        print(f"{RED}✗ структура блоків: {e}{RESET}", file=sys.stderr)
+        return 1
+
+    if diff:
+        sys.stdout.writelines(result['diff'] for result in results)
+        return 0
+
+    for result in results:
+        print(f"{GREEN}✓{RESET} {Path(result['file']).name}")
+        for old, new, line in result['renamed']:
+            print(f"  • рядок {line}: {old} → {new}")
+    renamed = sum(len(result['renamed']) for result in results)
+    print(f"\n{BLUE}Файлів: {len(files)}, змінено: {len(results)}, нових uniqueId: {renamed}{RESET}")
+    if not write:
+        print(f"\n{YELLOW}⚠ DRY RUN - зміни НЕ збережені.{RESET}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
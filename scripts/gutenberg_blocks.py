@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Парсер коментарів блоків Gutenberg та індекс дерева блоків
+
+Розбирає розмітку <!-- wp:namespace/name {json} --> ... <!-- /wp:name -->
+за один прохід по тексту (той самий граматичний розбір, що й
+WP_Block_Parser) і будує дерево блоків з розібраними атрибутами. Індекс
+дає доступ до блоків за uniqueId, глобальним класом та типом блоку, тож
+перевірки та виправлення стають пошуком у словнику замість окремого
+проходу регулярним виразом.
+
+JSON атрибутів декодується (тобто "\\\\u002d" стає "\\u002d", а "\\u002d" —
+"-"), тому для перевірок escaping кожен блок також зберігає позицію
+сирого JSON у тексті файлу.
+
+Використання:
+    python3 scripts/gutenberg_blocks.py gutenberg/HERO.html
+    python3 scripts/gutenberg_blocks.py --find-id 4f7a2e8c
+    python3 scripts/gutenberg_blocks.py --find-class gbp-section
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+BASE_PATH = Path(__file__).parent.parent
+DEFAULT_DIRS = [BASE_PATH / 'gutenberg', BASE_PATH / 'templates']
+
+# Початок роздільника блоку: відкриваючий, закриваючий або самозакритий
+# коментар. JSON атрибутів за ним розбирає json.JSONDecoder.raw_decode
+# прямо з тексту — регулярний вираз не проходить по тілу атрибутів
+DELIMITER_RE = re.compile(
+    r'<!--\s+(?P<closer>/)?wp:(?P<namespace>[a-z][a-z0-9_-]*/)?(?P<name>[a-z][a-z0-9_-]*)\s+'
+)
+DELIMITER_END_RE = re.compile(r'\s*(?P<void>/)?-->')
+_decode_attrs = json.JSONDecoder().raw_decode
+
+
+class BlockParseError(ValueError):
+    """Некоректна структура блоків (незакритий блок, зайвий закриваючий)."""
+
+    def __init__(self, message: str, line: int) -> None:
+        super().__init__(f"рядок {line}: {message}")
+        self.line = line
+
+
+# ---------------------- Дерево блоків ----------------------
+
+
+class Block:
+    """Блок Gutenberg з розібраними атрибутами та дочірніми блоками."""
+
+    __slots__ = ('name', 'attrs', 'attrs_span', 'start', 'end', 'line', 'parent', 'children', 'path')
+
+    def __init__(
+        self,
+        name: str,
+        attrs: Dict,
+        attrs_span: Optional[Tuple[int, int]],
+        start: int,
+        line: int,
+        parent: Optional['Block'] = None,
+        path: str = '',
+    ) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.attrs_span = attrs_span
+        self.start = start
+        self.end = start
+        self.line = line
+        self.parent = parent
+        self.children: List['Block'] = []
+        self.path = path
+
+    @property
+    def unique_id(self) -> Optional[str]:
+        return self.attrs.get('uniqueId')
+
+    @property
+    def global_classes(self) -> List[str]:
+        return self.attrs.get('globalClasses') or []
+
+    @property
+    def styles(self) -> Dict:
+        return self.attrs.get('styles') or {}
+
+    def walk(self) -> Iterator['Block']:
+        """Блок і всі його нащадки в порядку документа."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def __repr__(self) -> str:
+        return f"<Block {self.name} {self.unique_id or ''} {self.path}:{self.line}>"
+
+
+def parse_document(content: str, path: str = '') -> Tuple[List[Block], List[Block]]:
+    """Кореневі блоки документа та плоский список усіх блоків у порядку документа.
+
+    Текст поза блоками ігнорується.
+    """
+    roots: List[Block] = []
+    blocks: List[Block] = []
+    stack: List[Block] = []
+    search = DELIMITER_RE.search
+    match_end = DELIMITER_END_RE.match
+    pos = 0
+
+    while True:
+        m = search(content, pos)
+        if m is None:
+            break
+        start = m.start()
+        closer, namespace, name = m.groups()
+        name = (namespace or 'core/') + name
+        pos = m.end()
+
+        attrs: Dict = {}
+        span = None
+        if not closer and content.startswith('{', pos):
+            try:
+                attrs, attrs_end = _decode_attrs(content, pos)
+            except json.JSONDecodeError as e:
+                raise BlockParseError(f"некоректний JSON атрибутів {name}: {e.msg}", _line_at(content, start)) from e
+            span = (pos, attrs_end)
+            pos = attrs_end
+
+        end = match_end(content, pos)
+        if end is None:
+            raise BlockParseError(f"роздільник {name} не закрито '-->'", _line_at(content, start))
+        pos = end.end()
+
+        if closer:
+            if not stack or stack[-1].name != name:
+                expected = stack[-1].name if stack else 'нічого'
+                raise BlockParseError(f"закриваючий {name}, очікувався {expected}", _line_at(content, start))
+            stack.pop().end = pos
+            continue
+
+        parent = stack[-1] if stack else None
+        block = Block(name, attrs, span, start, 0, parent, path)
+        (parent.children if parent else roots).append(block)
+        blocks.append(block)
+        if end.group('void'):
+            block.end = pos
+        else:
+            stack.append(block)
+
+    if stack:
+        raise BlockParseError(f"блок {stack[-1].name} не закрито", _line_at(content, stack[-1].start))
+
+    # Номери рядків — одним інкрементальним проходом по вже впорядкованих блоках
+    line = 1
+    last = 0
+    for block in blocks:
+        line += content.count('\n', last, block.start)
+        last = block.start
+        block.line = line
+    return roots, blocks
+
+
+def _line_at(content: str, pos: int) -> int:
+    return content.count('\n', 0, pos) + 1
+
+
+def parse_blocks(content: str, path: str = '') -> List[Block]:
+    """Кореневі блоки документа."""
+    return parse_document(content, path)[0]
+
+
+# Роздільник цілком — граматика WP_Block_Parser: JSON атрибутів закінчується
+# першою "}", за якою йдуть пробіли та "-->" або "/-->". Хвіст після імені
+# необов'язковий, тож роздільник, який parse_document почав би розбирати,
+# знаходиться завжди, а нерозпізнаний хвіст дає порожню групу "-->".
+# Посесивні квантори не дають re повертатися по тілу атрибутів
+BLOCK_RE = re.compile(
+    r'<!--\s+(/)?wp:((?:[a-z][a-z0-9_-]*/)?[a-z][a-z0-9_-]*)\s+'
+    r'(?:(?:(\{(?:[^}]++|}(?!\s+/?-->))*+})\s+)?(/)?(-->))?'
+)
+# Сканер json без обгортки decode: кожен JSON атрибутів починається з "{" і
+# закінчується "}", тож коректний той, що прочитаний до кінця (end == len)
+_scan_json = json.JSONDecoder().scan_once
+
+
+def check_structure(content: str, path: str = '') -> List[Dict]:
+    """Атрибути блоків (лише тих, що їх мають) у порядку документа.
+
+    Те саме, що parse_document, але без дерева та номерів рядків: один
+    прохід BLOCK_RE і json на кожен JSON атрибутів. Якщо прохід знаходить
+    розбіжність, роздільник, якого не розпізнав, або некоректний JSON,
+    документ розбирається повністю: parse_document піднімає BlockParseError
+    з точним повідомленням (або нічого, якщо розбіжність хибна).
+    """
+    stack: List[str] = []
+    spans: List[str] = []
+    for closer, name, attrs, void, end in BLOCK_RE.findall(content):
+        if not end or closer and attrs:
+            break
+        if closer:
+            if not stack or stack.pop() != name:
+                break
+            continue
+        if attrs:
+            spans.append(attrs)
+        if not void:
+            stack.append(name)
+    else:
+        if not stack:
+            try:
+                # Помилку сканер повідомляє StopIteration: лише списковий вираз, не map
+                decoded = [_scan_json(span, 0) for span in spans]
+            except (ValueError, StopIteration):
+                pass
+            else:
+                if sum([end for _, end in decoded]) == sum(map(len, spans)):
+                    return [attrs for attrs, _ in decoded]
+    _, blocks = parse_document(content, path)
+    return [block.attrs for block in blocks if block.attrs_span]
+
+
+# ---------------------- Індекс ----------------------
+
+
+class BlockIndex:
+    """Індекс блоків одного або кількох файлів."""
+
+    def __init__(self) -> None:
+        self.documents: Dict[str, List[Block]] = {}
+        self.by_unique_id: Dict[str, List[Block]] = defaultdict(list)
+        self.by_class: Dict[str, List[Block]] = defaultdict(list)
+        self.by_type: Dict[str, List[Block]] = defaultdict(list)
+
+    def add(self, path: str, content: str) -> List[Block]:
+        """Розібрати документ і додати його блоки до індексу."""
+        roots, blocks = parse_document(content, path)
+        self.documents[path] = roots
+        for block in blocks:
+            self.by_type[block.name].append(block)
+            if block.unique_id is not None:
+                self.by_unique_id[block.unique_id].append(block)
+            for cls in block.global_classes:
+                self.by_class[cls].append(block)
+        return roots
+
+    def add_file(self, path: Path) -> List[Block]:
+        return self.add(str(path), path.read_text(encoding='utf-8'))
+
+    @classmethod
+    def from_paths(cls, paths: Sequence[Path]) -> 'BlockIndex':
+        index = cls()
+        for path in paths:
+            index.add_file(path)
+        return index
+
+    def blocks(self, path: Optional[str] = None) -> Iterator[Block]:
+        """Усі блоки (або блоки одного документа) в порядку документа."""
+        documents = [self.documents[path]] if path is not None else self.documents.values()
+        for roots in documents:
+            for root in roots:
+                yield from root.walk()
+
+    def duplicate_ids(self) -> Dict[str, List[Block]]:
+        """uniqueId, що зустрічаються більше одного разу."""
+        return {uid: blocks for uid, blocks in self.by_unique_id.items() if len(blocks) > 1}
+
+
+def collect_files(targets: Sequence[Path]) -> List[Path]:
+    """HTML файли з переданих файлів та директорій."""
+    files: List[Path] = []
+    for target in targets:
+        if target.is_dir():
+            files.extend(sorted(target.glob('*.html')))
+        elif target.suffix == '.html' and target.exists():
+            files.append(target)
+    return files
+
+
+# ---------------------- CLI ----------------------
+
+
+def print_tree(blocks: Sequence[Block], depth: int = 0) -> None:
+    for block in blocks:
+        label = block.attrs.get('metadata', {}).get('name', '')
+        classes = ' '.join(block.global_classes)
+        print(f"{'  ' * depth}{block.line:>5}  {block.name} {block.unique_id or ''} {classes} {label}".rstrip())
+        print_tree(block.children, depth + 1)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    parser = argparse.ArgumentParser(description='Дерево та індекс блоків Gutenberg')
+    parser.add_argument('paths', nargs='*', type=Path, help='файли або директорії (за замовчуванням gutenberg/ та templates/)')
+    parser.add_argument('--find-id', help='знайти блок за uniqueId')
+    parser.add_argument('--find-class', help='знайти блоки з глобальним класом')
+    parser.add_argument('--find-type', help='знайти блоки типу (напр. generateblocks/text)')
+    args = parser.parse_args(argv)
+
+    index = BlockIndex()
+    for path in collect_files(args.paths or DEFAULT_DIRS):
+        try:
+            index.add_file(path)
+        except BlockParseError as e:
+            print(f"✗ {path}: {e}", file=sys.stderr)
+            return 1
+
+    if args.find_id or args.find_class or args.find_type:
+        found = (
+            index.by_unique_id.get(args.find_id, []) if args.find_id
+            else index.by_class.get(args.find_class, []) if args.find_class
+            else index.by_type.get(args.find_type, [])
+        )
+        for block in found:
+            print(f"{block.path}:{block.line}  {block.name} {block.unique_id or ''}")
+        return 0 if found else 1
+
+    for path, roots in index.documents.items():
+        print(f"📄 {path}")
+        print_tree(roots, 1)
+
+    total = sum(1 for _ in index.blocks())
+    print(f"\nБлоків: {total}, uniqueId: {len(index.by_unique_id)}, "
+          f"глобальних класів: {len(index.by_class)}, типів: {len(index.by_type)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+Лінтер блочного HTML (GenerateBlocks) для Medici theme
+
+Замінює окремі analyze_html.py, check_global_classes.py та
+check_faq_variables.py. Файл читається один раз; вкладеність блоків
+та JSON атрибутів перевіряє один прохід gutenberg_blocks.check_structure
+(без побудови дерева), перевірки атрибутів шукають у декодованих
+словниках, а сирий текст — кілька скомпільованих шаблонів з літеральним
+префіксом.
+
+Перевірки:
+- unique-id: формат (8 hex, lowercase) та дублікати у файлі
+- css-var-escaping: var(\\u002d\\u002d...) з подвійним backslash
+- ampersand-escaping: \\u0026 з подвійним backslash
+- breakpoints: наявність 1024px / 767px, пробіл після "max-width:"
+- transition: стандарт 0.3s замість 0.5s
+- global-classes: кожен клас з globalClasses визначено в CSS
+- a11y: непорожні aria-label, alt у зображень
+- styles-vars: змінні з "styles" присутні у "css" (колишня перевірка FAQ)
+
+Використання:
+    python3 scripts/lint_blocks.py
+    python3 scripts/lint_blocks.py gutenberg/HERO.html --format json
+    python3 scripts/lint_blocks.py --benchmark 200
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+import gutenberg_blocks
+from css_index import load_index
+from gutenberg_blocks import BlockParseError, check_structure, collect_files, parse_document
+
+BASE_PATH = Path(__file__).parent.parent
+DEFAULT_DIRS = [BASE_PATH / 'gutenberg', BASE_PATH / 'templates']
+
+# Підсумки файлів між запусками (шлях + хеш вмісту -> результат)
+CACHE_PATH = BASE_PATH / '.lint-cache'
+BENCHMARK_REPEATS = 5
+
+# Брейкпоінти теми (CODING-RULES)
+BREAKPOINTS = {'767', '768', '1024'}
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+# ---------------------- Шаблони ----------------------
+
+# Кожен прохід по тексту коштує стільки ж, скільки один re.findall старих
+# скриптів, тож проходів менше, ніж у ланцюжку, який лінтер замінив.
+# Атрибути блоків декодує gutenberg_blocks.check_structure (кожен JSON —
+# одним викликом json, без дерева), і перевірки атрибутів — пошук у
+# словниках. Шаблон з літеральним префіксом re шукає як підрядок, тож
+# решта проходів по сирому тексту — саме такі.
+TRANSITION_RE = re.compile(r'"transition"\s*:\s*"(all\s+0\.5s\s+ease\s+0s)"')
+MAX_WIDTH_RE = re.compile(r'max-width:(\s*)(\d+)px')
+UNIQUE_ID_RE = re.compile(r'[0-9a-f]{8}')
+
+# Escaping — властивість сирого тексту: після декодування правильний
+# "\\u002d" і помилковий "-" вже не розрізнити. Обидві форми — одним
+# проходом: подвійна (правильна) та одинарні (помилка).
+RAW_VAR_RE = re.compile(
+    r'var\(\\(?:\\u002d\\\\u002d([\w-]+)'
+    r'|(u005cu002d\\u005cu002d|u002d\\u002d)([\w-]*)([^)]*)\))'
+)
+# Змінні в декодованому css: "--", подвійна форма та u005c
+CSS_VAR_RE = re.compile(r'var\((?:--|\\u002d\\u002d|\\u005cu002d\\u005cu002d)([\w-]+)')
+RAW_AMP_RE = re.compile(r'\\(\\u0026|u005cu0026|u0026)')
+IMG_RE = re.compile(r'<img\b([^>]*)>')
+ARIA_HTML = 'aria-label="'
+ALT_RE = re.compile(r'\balt\s*=')
+
+
+# ---------------------- Перевірки файлу ----------------------
+
+
+class FileLint:
+    """Стан перевірки одного файлу: лічильники, зібрані дані та проблеми."""
+
+    def __init__(self, name: str, content: str) -> None:
+        self.name = name
+        self.content = content
+        self.stats: Counter = Counter()
+        self.issues: List[List] = []
+        self.unique_ids: List[str] = []
+        self.global_classes: Set[str] = set()
+        self.styles_vars: Set[str] = set()
+        self.css_vars: Set[str] = set()
+        self.rewind()
+
+    def rewind(self) -> None:
+        """Почати новий прохід по тексту (номери рядків рахуються з початку)."""
+        self._line = 1
+        self._line_pos = 0
+
+    def line_of(self, pos: int) -> int:
+        """Номер рядка для позиції (у межах проходу позиції не спадають)."""
+        self._line += self.content.count('\n', self._line_pos, pos)
+        self._line_pos = pos
+        return self._line
+
+    def block_line(self, pos: int) -> int:
+        """Номер рядка роздільника блоку, в атрибутах якого стоїть позиція."""
+        return self.line_of(max(self.content.rfind('<!--', 0, pos), 0))
+
+    def report(self, severity: str, check: str, line: int, message: str) -> None:
+        self.issues.append([severity, check, line, message])
+
+    def summary(self) -> Dict:
+        """Підсумок файлу у форматі, придатному для JSON."""
+        return {
+            'file': self.name,
+            'issues': self.issues,
+            'stats': dict(self.stats),
+            'unique_ids': self.unique_ids,
+            'global_classes': sorted(self.global_classes),
+        }
+
+
+def _attr_lines(lint: FileLint) -> List[int]:
+    """Рядки блоків з атрибутами — у тому ж порядку, що й check_structure.
+
+    Потрібні лише для звіту про проблему, тож дерево будується тільки тоді.
+    """
+    _, blocks = parse_document(lint.content, lint.name)
+    return [block.line for block in blocks if block.attrs_span]
+
+
+def check_attrs(lint: FileLint, attrs: Sequence[Dict]) -> None:
+    """Перевірки атрибутів блоків — пошук у декодованих словниках.
+
+    Дані збираються списковими виразами; номери рядків рахуються лише
+    тоді, коли в зібраному є проблема. transition та max-width (у ключах
+    @media зі styles та в css) — проходами по сирому тексту.
+    """
+    content = lint.content
+    stats = lint.stats
+
+    unique_ids = [attr['uniqueId'] for attr in attrs if 'uniqueId' in attr]
+    if not all(type(uid) is str for uid in unique_ids):
+        unique_ids = [uid if type(uid) is str else json.dumps(uid) for uid in unique_ids]
+    if unique_ids:
+        stats['unique_ids'] += len(unique_ids)
+        lint.unique_ids.extend(unique_ids)
+
+    for classes in [attr['globalClasses'] for attr in attrs if attr.get('globalClasses')]:
+        stats['global_classes'] += 1
+        lint.global_classes.update(classes)
+
+    labels = [
+        html['aria-label'] for html in [attr.get('htmlAttributes') for attr in attrs]
+        if type(html) is dict and 'aria-label' in html
+    ]
+    if labels:
+        stats['aria_labels'] += len(labels)
+
+    lint.css_vars.update(CSS_VAR_RE.findall('\n'.join(
+        css for css in [attr.get('css') for attr in attrs] if type(css) is str
+    )))
+
+    bad_ids = not all(map(UNIQUE_ID_RE.fullmatch, unique_ids)) or len(set(unique_ids)) < len(unique_ids)
+    if bad_ids or not all(type(label) is str and label.strip() for label in labels):
+        seen: Set[str] = set()
+        for attr, line in zip(attrs, _attr_lines(lint)):
+            if 'uniqueId' in attr:
+                uid = attr['uniqueId']
+                uid = uid if type(uid) is str else json.dumps(uid)
+                if not UNIQUE_ID_RE.fullmatch(uid):
+                    lint.report(ERROR, 'unique-id', line, f"UniqueId '{uid}' має бути 8 hex lowercase")
+                elif uid in seen:
+                    lint.report(ERROR, 'unique-id', line, f"UniqueId '{uid}' повторюється у файлі")
+                seen.add(uid)
+            html = attr.get('htmlAttributes')
+            if type(html) is dict and 'aria-label' in html:
+                label = html['aria-label']
+                if not (type(label) is str and label.strip()):
+                    lint.report(ERROR, 'a11y', line, "порожній aria-label в htmlAttributes")
+
+    # Повільний transition рідкісний: прохід лише якщо в тексті є "0.5s"
+    if '0.5s' in content:
+        lint.rewind()
+        for m in TRANSITION_RE.finditer(content):
+            lint.report(WARNING, 'transition', lint.block_line(m.start()), f"transition '{m.group(1)}' (стандарт — 0.3s)")
+
+    widths = MAX_WIDTH_RE.findall(content)
+    for space, px in widths:
+        if px in BREAKPOINTS:
+            stats[f'breakpoint_{px}'] += 1
+    if not all(space for space, _ in widths):
+        lint.rewind()
+        for m in MAX_WIDTH_RE.finditer(content):
+            space, px = m.groups()
+            if not space:
+                lint.report(WARNING, 'breakpoints', lint.block_line(m.start()), f"max-width:{px}px без пробілу після двокрапки")
+
+
+def check_blocks(lint: FileLint) -> None:
+    """Вкладеність, JSON та атрибути блоків; помилка структури — BlockParseError."""
+    check_attrs(lint, check_structure(lint.content, lint.name))
+
+
+def check_raw(lint: FileLint) -> None:
+    """Перевірки сирого тексту: escaping у JSON атрибутів та розмітка.
+
+    Прохід по змінним заодно збирає styles_vars — імена з подвійним
+    escaping (css_vars збирає check_attrs з декодованого css).
+    """
+    content = lint.content
+    stats = lint.stats
+    issues = lint.issues
+    line_of = lint.line_of
+    styles_vars = lint.styles_vars
+
+    double_count = single_count = 0
+    lint.rewind()
+    for m in RAW_VAR_RE.finditer(content):
+        if m.lastindex == 1:
+            double_count += 1
+            styles_vars.add(m[1])
+        else:
+            form, name, rest = m.group(2, 3, 4)
+            single_count += 1
+            issues.append([ERROR, 'css-var-escaping', line_of(m.start()), f"var(\\{form}{name}{rest}) — має бути подвійний backslash"])
+            if form[:5] == 'u005c':
+                styles_vars.add(name)  # після декодування — та сама подвійна форма
+    if double_count:
+        stats['css_vars_double'] += double_count
+    if single_count:
+        stats['css_vars_single'] += single_count
+
+    lint.rewind()
+    for m in RAW_AMP_RE.finditer(content):
+        form = m.group(1)
+        if form[0] == '\\':
+            stats['ampersand_double'] += 1
+        else:
+            stats['ampersand_single'] += 1
+            issues.append([ERROR, 'ampersand-escaping', line_of(m.start()), f"\\{form} — має бути подвійний backslash"])
+
+    lint.rewind()
+    for m in IMG_RE.finditer(content):
+        stats['images'] += 1
+        if not ALT_RE.search(m.group(1)):
+            lint.report(ERROR, 'a11y', line_of(m.start()), "<img> без атрибута alt")
+
+    # Рідкісний довгий літерал str.find знаходить удвічі швидше за re
+    lint.rewind()
+    pos = content.find(ARIA_HTML)
+    while pos != -1:
+        start = pos + len(ARIA_HTML)
+        end = content.find('"', start)
+        if end == -1:
+            break
+        stats['aria_labels'] += 1
+        if not content[start:end].strip():
+            lint.report(ERROR, 'a11y', line_of(pos), "порожній aria-label")
+        pos = content.find(ARIA_HTML, end + 1)
+
+
+def lint_content(name: str, content: str) -> Dict:
+    """Усі перевірки одного файлу: атрибути блоків та сирий текст."""
+    lint = FileLint(name, content)
+    try:
+        check_blocks(lint)
+        blocks_ok = True
+    except BlockParseError as e:
+        lint = FileLint(name, content)  # дані частково перевірених блоків відкидаються
+        lint.report(ERROR, 'blocks', e.line, str(e))
+        blocks_ok = False
+    check_raw(lint)
+
+    if lint.unique_ids and not any(lint.stats[f'breakpoint_{px}'] for px in BREAKPOINTS):
+        lint.report(WARNING, 'breakpoints', 1, "responsive breakpoints відсутні")
+
+    if blocks_ok:
+        for var in sorted(lint.styles_vars - lint.css_vars):
+            lint.report(WARNING, 'styles-vars', 1, f"--{var} є в 'styles', але відсутня в 'css'")
+
+    lint.issues.sort(key=lambda issue: issue[2])
+    return lint.summary()
+
+
+def lint_file(path: Path) -> Dict:
+    """Лінт файлу з диску (файл читається рівно один раз)."""
+    return lint_content(str(path), path.read_text(encoding='utf-8'))
+
+
+# ---------------------- Кеш ----------------------
+
+
+def engine_version() -> str:
+    """Хеш коду лінтера: зміна правил інвалідує весь кеш."""
+    digest = hashlib.sha1()
+    for module in (Path(__file__), Path(gutenberg_blocks.__file__)):
+        digest.update(module.read_bytes())
+    return digest.hexdigest()
+
+
+class LintCache:
+    """Підсумки файлів, ключ — шлях і sha1 вмісту.
+
+    Перевірки між файлами в кеш не потрапляють: вони щоразу
+    перераховуються з підсумків (globalClasses, uniqueId), тож після зміни
+    одного файлу лінтується лише він.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH) -> None:
+        self.path = path
+        self.version = engine_version()
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') == self.version:
+            self.entries = data.get('files', {})
+
+    def lint(self, path: Path) -> Dict:
+        """Підсумок файлу: з кешу, якщо вміст не змінився."""
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        # Відносний і абсолютний шлях до одного файлу — один запис
+        key = str(path.resolve())
+        entry = self.entries.get(key)
+        if entry is not None and entry['sha1'] == digest:
+            self.hits += 1
+            return entry['summary']
+
+        self.misses += 1
+        summary = lint_content(key, raw.decode('utf-8'))
+        self.entries[key] = {'sha1': digest, 'summary': summary}
+        return summary
+
+    def save(self) -> None:
+        """Атомарний запис; записи видалених файлів відкидаються."""
+        entries = {key: entry for key, entry in self.entries.items() if os.path.exists(key)}
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps({'version': self.version, 'files': entries}, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+# ---------------------- Перевірки між файлами ----------------------
+
+
+def cross_file_issues(summaries: Sequence[Dict], css_classes: Set[str]) -> Dict[str, List[List]]:
+    """Перевірки між файлами по підсумках (файл -> проблеми).
+
+    - глобальні класи без CSS визначення;
+    - uniqueId, що зустрічаються в кількох файлах (конфлікт CSS .gb-*-<id>,
+      якщо блоки опиняться на одній сторінці).
+    """
+    issues: Dict[str, List[List]] = defaultdict(list)
+    owners: Dict[str, List[str]] = defaultdict(list)
+    basenames = {summary['file']: os.path.basename(summary['file']) for summary in summaries}
+    for summary in summaries:
+        for cls in summary['global_classes']:
+            if cls not in css_classes:
+                issues[summary['file']].append(
+                    [ERROR, 'global-classes', 1, f"клас {cls} не визначено в CSS"]
+                )
+        for uid in set(summary['unique_ids']):
+            owners[uid].append(summary['file'])
+
+    for uid, files in owners.items():
+        if len(files) < 2:
+            continue
+        names = [basenames[name] for name in files[:4]]
+        for name in files:
+            others = [other for other in names if other != basenames[name]][:3]
+            more = len(files) - 1 - len(others)
+            listed = ', '.join(others) + (f" та ще {more}" if more > 0 else '')
+            issues[name].append([WARNING, 'unique-id', 1, f"UniqueId '{uid}' також у {listed}"])
+    return issues
+
+
+def lint_paths(
+    paths: Sequence[Path],
+    css_classes: Optional[Set[str]] = None,
+    cache: Optional[LintCache] = None,
+    report: Optional[Sequence[Path]] = None,
+) -> List[Dict]:
+    """Лінт набору файлів з перевірками між файлами.
+
+    css_classes — класи з CSS (за замовчуванням з індексу css_index.py);
+    report — файли, для яких повертати підсумки (за замовчуванням усі);
+    решта paths бере участь лише в перевірках між файлами.
+    """
+    summaries = [cache.lint(path) if cache else lint_file(path) for path in paths]
+    cross_issues = cross_file_issues(summaries, css_classes if css_classes is not None else load_index().classes())
+
+    wanted = set(report) if report is not None else None
+    result = []
+    for path, summary in zip(paths, summaries):
+        if wanted is not None and path not in wanted:
+            continue
+        # Підсумки з кешу не змінюються: проблеми між файлами додаються до копії
+        extra = cross_issues.get(summary['file'], [])
+        result.append(dict(summary, issues=summary['issues'] + extra) if extra else summary)
+    return result
+
+
+# ---------------------- Вивід ----------------------
+
+
+def print_text(summaries: Sequence[Dict]) -> None:
+    """Звіт для терміналу, згрупований по файлах."""
+    totals: Counter = Counter()
+    for summary in summaries:
+        totals.update(summary['stats'])
+        name = summary['file']
+        try:
+            name = str(Path(name).relative_to(BASE_PATH))
+        except ValueError:
+            pass
+
+        if not summary['issues']:
+            print(f"{GREEN}✓{RESET} {name}")
+            continue
+
+        print(f"{RED}✗{RESET} {name}")
+        for severity, check, line, message in summary['issues']:
+            color = RED if severity == ERROR else YELLOW
+            print(f"  {color}{line:>5}{RESET}  [{check}] {message}")
+
+    errors = sum(1 for s in summaries for issue in s['issues'] if issue[0] == ERROR)
+    warnings = sum(1 for s in summaries for issue in s['issues'] if issue[0] == WARNING)
+
+    print(f"\n{BLUE}{'=' * 60}{RESET}")
+    print(f"Файлів: {len(summaries)}, UniqueIds: {totals['unique_ids']}, "
+          f"CSS Vars (подвійний backslash): {totals['css_vars_double']}, "
+          f"Ampersand (подвійний): {totals['ampersand_double']}")
+    print(f"Breakpoints 1024px: {totals['breakpoint_1024']}, 767px: {totals['breakpoint_767']}, "
+          f"ARIA labels: {totals['aria_labels']}")
+    print(f"Помилок: {errors}, попереджень: {warnings}")
+
+
+def print_json(summaries: Sequence[Dict]) -> None:
+    json.dump(summaries, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+
+
+# ---------------------- Бенчмарк ----------------------
+
+
+def _legacy_lint(paths: Sequence[Path]) -> int:
+    """Ланцюжок старих скриптів: кожен читає файл і робить свої re.findall."""
+    found = 0
+    for path in paths:
+        # analyze_html.py
+        content = path.read_text(encoding='utf-8')
+        for uid in re.findall(r'"uniqueId":"([^"]+)"', content):
+            found += not re.match(r'^[0-9a-f]{8}$', uid)
+        found += len(re.findall(r'var\(\\u002d\\u002d([^)]+)\)', content))
+        re.findall(r'var\(\\\\u002d\\\\u002d([^)]+)\)', content)
+        found += len(re.findall(r'\\u0026:is\(([^)]+)\)', content))
+        re.findall(r'\\\\u0026:is\(([^)]+)\)', content)
+        re.findall(r'@media \(max-width:\s*767?px\)', content)
+        re.findall(r'@media \(max-width:\s*1024px\)', content)
+        re.findall(r'"globalClasses":\s*\[([^\]]+)\]', content)
+        re.findall(r'"aria-label":"([^"]+)"', content)
+        # check_global_classes.py
+        content = path.read_text(encoding='utf-8')
+        for match in re.findall(r'"globalClasses":\s*\[([^\]]+)\]', content):
+            re.findall(r'"([^"]+)"', match)
+        # check_faq_variables.py
+        content = path.read_text(encoding='utf-8')
+        re.findall(r'"styles":\{[^}]+?"color":"var\(\\\\u002d\\\\u002d([^)]+)\)', content)
+        re.findall(r'"css":"[^"]*var\(--([^)]+)\)', content)
+        # refactor-html.py (check_unique_ids)
+        content = path.read_text(encoding='utf-8')
+        re.findall(r'"uniqueId":\s*"([^"]+)"', content)
+    return found
+
+
+def benchmark(sources: Sequence[Path], copies: int) -> None:
+    """Порівняння з ланцюжком старих скриптів на синтетичному корпусі."""
+    workdir = Path(tempfile.mkdtemp(prefix='lint-blocks-'))
+    try:
+        corpus = []
+        for i in range(copies):
+            for source in sources:
+                target = workdir / f'{source.stem}-{i}.html'
+                shutil.copyfile(source, target)
+                corpus.append(target)
+        size = sum(path.stat().st_size for path in corpus)
+        print(f"Корпус: {len(corpus)} файлів, {size / 1024 / 1024:.1f} МБ")
+
+        # Найкращий з кількох запусків, старі скрипти й лінтер по черзі:
+        # одиничний замір на спільній машині коливається на десятки відсотків
+        legacy = engine = cached = float('inf')
+        cache_path = workdir / '.lint-cache'
+        for _ in range(BENCHMARK_REPEATS):
+            started = time.perf_counter()
+            _legacy_lint(corpus)
+            legacy = min(legacy, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for path in corpus:
+                lint_file(path)
+            engine = min(engine, time.perf_counter() - started)
+
+            # Повторний запуск з кешем після зміни одного файлу
+            cache = LintCache(cache_path)
+            lint_paths(corpus, cache=cache)
+            cache.save()
+            with open(corpus[0], 'a', encoding='utf-8') as f:
+                f.write('\n')
+            started = time.perf_counter()
+            cache = LintCache(cache_path)
+            lint_paths(corpus, cache=cache)
+            cached = min(cached, time.perf_counter() - started)
+
+        print(f"  старі скрипти:  {legacy:.3f} с")
+        print(f"  lint_blocks:    {engine:.3f} с  (x{legacy / engine:.1f})")
+        print(f"  з кешем:        {cached:.3f} с  (змінено 1 файл, x{legacy / cached:.1f})")
+    finally:
+        shutil.rmtree(workdir)
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Лінтер блочного HTML Medici')
+    parser.add_argument('paths', nargs='*', type=Path, help='файли або директорії (за замовчуванням gutenberg/ та templates/)')
+    parser.add_argument('--format', choices=('text', 'json'), default='text')
+    parser.add_argument('--cache', action='store_true', help=f'використати кеш підсумків ({CACHE_PATH.name})')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='порівняти зі старими скриптами на N копіях файлів')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    files = collect_files(args.paths or DEFAULT_DIRS)
+    if not files:
+        print(f"{RED}✗ HTML файли не знайдені!{RESET}")
+        return 1
+
+    if args.benchmark:
+        benchmark(files, args.benchmark)
+        return 0
+
+    if args.cache:
+        # Перевірки між файлами завжди бачать увесь проект; звіт — лише по files
+        # Шляхи з CLI та pre-commit відносні, а DEFAULT_DIRS — абсолютні
+        cache = LintCache()
+        files = [path.resolve() for path in files]
+        project = [path.resolve() for path in collect_files(DEFAULT_DIRS)]
+        known = set(project)
+        project.extend(path for path in files if path not in known)
+        summaries = lint_paths(project, cache=cache, report=files)
+        cache.save()
+        print(f"Кеш: {cache.hits} з {cache.hits + cache.misses} файлів без змін", file=sys.stderr)
+    else:
+        summaries = lint_paths(files)
+
+    if args.format == 'json':
+        print_json(summaries)
+    else:
+        print_text(summaries)
+
+    has_errors = any(issue[0] == ERROR for s in summaries for issue in s['issues'])
+    return 1 if has_errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
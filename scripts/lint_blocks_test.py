@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import lint_blocks
+from lint_blocks import BASE_PATH, LintCache, lint_content
+
+
+# Запуск: cd scripts && python3 -m unittest lint_blocks_test
+class TestLintCachePaths(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_path = Path(tmp.name) / '.lint-cache'
+        cwd = os.getcwd()
+        os.chdir(BASE_PATH)
+        self.addCleanup(os.chdir, cwd)
+
+    def run_cli(self, *argv):
+        """JSON-звіт main() з кешем у тимчасовому файлі."""
+        stdout = io.StringIO()
+        with mock.patch.object(lint_blocks, 'LintCache', lambda: LintCache(self.cache_path)), \
+                contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            lint_blocks.main(['--format', 'json', *argv])
+        return json.loads(stdout.getvalue())
+
+    def test_relative_and_absolute_path_share_cache_entry(self):
+        """Відносний шлях — той самий ключ кешу, що й абсолютний"""
+        cache = LintCache(self.cache_path)
+        cache.lint(Path('gutenberg/HERO.html'))
+        cache.lint(BASE_PATH / 'gutenberg' / 'HERO.html')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_relative_path_not_linted_twice(self):
+        """Файл з CLI, що вже є в проекті, не конфліктує сам із собою"""
+        summaries = self.run_cli('--cache', 'gutenberg/HERO.html')
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(Path(summaries[0]['file']), (BASE_PATH / 'gutenberg' / 'HERO.html').resolve())
+        for _, check, _, message in summaries[0]['issues']:
+            if check == 'unique-id':
+                self.assertNotIn('HERO.html', message)
+                self.assertNotIn('також у  ', message)
+
+        entries = json.loads(self.cache_path.read_text(encoding='utf-8'))['files']
+        project = lint_blocks.collect_files(lint_blocks.DEFAULT_DIRS)
+        self.assertEqual(len(entries), len(project))
+
+
+class TestAttributeJson(unittest.TestCase):
+
+    def lint(self, attrs):
+        """Проблеми одного блоку з атрибутами attrs (як у файлі)."""
+        content = (
+            f'<!-- wp:generateblocks/element {attrs} -->\n'
+            '<div class="gb-element-abcd1234"></div>\n'
+            '<!-- /wp:generateblocks/element -->\n'
+        )
+        return lint_content('test.html', content)['issues']
+
+    def assertJsonError(self, attrs):
+        issues = self.lint(attrs)
+        self.assertIn('blocks', [check for severity, check, _, _ in issues if severity == lint_blocks.ERROR])
+        self.assertTrue(any('JSON' in message for _, _, _, message in issues))
+
+    def test_trailing_comma_reported(self):
+        """Кома після останнього ключа — некоректний JSON"""
+        self.assertJsonError('{"uniqueId":"abcd1234","css":"x",}')
+
+    def test_bare_word_reported(self):
+        """Слово без лапок у JSON атрибутів — помилка"""
+        self.assertJsonError('{"uniqueId":"abcd1234","css":"x", oops}')
+
+    def test_valid_attrs_pass(self):
+        """Коректний JSON атрибутів не дає помилки blocks"""
+        issues = self.lint('{"uniqueId":"abcd1234","css":"x"}')
+        self.assertNotIn('blocks', [check for _, check, _, _ in issues])
+
+
+if __name__ == '__main__':
+    unittest.main()
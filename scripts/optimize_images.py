@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Оптимізація зображень і адаптивні варіанти для блочного HTML
+
+- Растрові зображення (png, jpg, gif), на які посилаються gutenberg/*.html
+  та templates/*.html, отримують варіанти WebP і AVIF кількох ширин у
+  img/variants/. Ім'я варіанту містить sha1 джерела, тож він не
+  перегенеровується, поки джерело не змінилось; img/variants/manifest.json —
+  джерело -> розміри та варіанти.
+- SVG у img/ мінімізуються на місці (коментарі, XML декларація, пробіли).
+- <img> у блочному HTML отримують width/height, srcset і sizes (WebP),
+  loading="lazy" і decoding="async" — крім шаблонів над першим екраном
+  (HEADER, HERO). З --picture растрові <img> обгортаються в <picture> з
+  AVIF та WebP <source>.
+
+Обробка зображень — паралельно в пулі процесів. Pillow потрібен лише за
+наявності растрових зображень: pip install -r scripts/requirements.txt
+
+Використання:
+    python3 scripts/optimize_images.py                 # варіанти, SVG, HTML
+    python3 scripts/optimize_images.py --dry-run       # що буде змінено
+    python3 scripts/optimize_images.py --picture gutenberg/TEAM.html
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from critical_css import ABOVE_THE_FOLD
+from fix_blocks import write_atomic
+from gutenberg_blocks import collect_files
+from page_budget import resolve_ref
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+DEFAULT_DIRS = [BASE_PATH / 'gutenberg', BASE_PATH / 'templates']
+IMG_DIR = BASE_PATH / 'img'
+VARIANTS_DIR = IMG_DIR / 'variants'
+MANIFEST_PATH = VARIANTS_DIR / 'manifest.json'
+THEME_URL = '/wp-content/themes/medici/'
+
+WIDTHS = [320, 640, 960, 1280, 1920]
+FORMATS = {'avif': 'AVIF', 'webp': 'WEBP'}
+QUALITY = {'avif': 50, 'webp': 80}
+RASTER_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif'}
+SOURCE_HASH_LENGTH = 10
+
+IMG_TAG_RE = re.compile(r'<img\b([^>]*?)\s*/?>', re.DOTALL)
+ATTR_RE = re.compile(r'''([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?''')
+# width="640" або "640px"; "100%", "auto" тощо — не пікселі
+PX_WIDTH_RE = re.compile(r'\s*(\d+)(?:px)?\s*')
+SVG_SIZE_RE = re.compile(r'<svg\b[^>]*>', re.DOTALL)
+SVG_COMMENT_RE = re.compile(r'<\?xml[^>]*\?>|<!--.*?-->|<!DOCTYPE[^>]*>|<metadata\b.*?</metadata>', re.DOTALL)
+SVG_TAG_RE = re.compile(r'<[^>]+>')
+SVG_EMPTY_RE = re.compile(r'<(\w+)((?:\s[^<>]*)?)></\1>')
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+# ---------------------- SVG ----------------------
+
+
+def optimize_svg(svg: str) -> str:
+    """Мінімізація без зміни геометрії: текст елементів не чіпається."""
+    svg = SVG_COMMENT_RE.sub('', svg)
+    svg = re.sub(r'>\s+<', '><', svg.strip())
+    svg = SVG_TAG_RE.sub(lambda m: re.sub(r'\s*/>$', '/>', ' '.join(m.group().split())), svg)
+    svg = re.sub(r'="\s+', '="', svg)
+    svg = re.sub(r'\s+"', '"', svg)
+    svg = SVG_EMPTY_RE.sub(r'<\1\2/>', svg)
+    return svg + '\n'
+
+
+def svg_size(path: Path) -> Optional[Tuple[int, int]]:
+    """Розміри SVG з width/height або viewBox."""
+    m = SVG_SIZE_RE.search(path.read_text(encoding='utf-8'))
+    if not m:
+        return None
+    attrs = dict(parse_attrs(m.group()[4:-1]))
+    try:
+        if attrs.get('width') and attrs.get('height'):
+            return int(float(attrs['width'].rstrip('px'))), int(float(attrs['height'].rstrip('px')))
+        if attrs.get('viewBox'):
+            _, _, width, height = (float(value) for value in attrs['viewBox'].replace(',', ' ').split())
+            return int(width), int(height)
+    except ValueError:
+        pass
+    return None
+
+
+def optimize_svg_file(path: str, write: bool) -> Dict:
+    """Виконується у процесі пулу."""
+    source = Path(path)
+    original = source.read_text(encoding='utf-8')
+    optimized = optimize_svg(original)
+    saved = len(original.encode()) - len(optimized.encode())
+    if saved > 0 and write:
+        write_atomic(source, optimized)
+    return {'file': path, 'saved': max(saved, 0), 'size': len(optimized.encode())}
+
+
+# ---------------------- Растрові варіанти ----------------------
+
+
+def source_hash(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()[:SOURCE_HASH_LENGTH]
+
+
+def variant_name(path: Path, digest: str, width: int, fmt: str) -> str:
+    return f"{path.stem}.{digest}-{width}.{fmt}"
+
+
+def generate_variants(path: str, write: bool) -> Dict:
+    """Варіанти WebP/AVIF; наявні (той самий sha1 джерела) пропускаються."""
+    from PIL import Image, features
+
+    source = Path(path)
+    digest = source_hash(source)
+    formats = [fmt for fmt in FORMATS if fmt != 'avif' or features.check('avif')]
+    with Image.open(source) as image:
+        width, height = image.size
+        widths = sorted({w for w in WIDTHS if w < width} | {width})
+        variants = []
+        created = 0
+        for fmt in formats:
+            for target in widths:
+                name = variant_name(source, digest, target, fmt)
+                out = VARIANTS_DIR / name
+                if not out.exists() and write:
+                    resized = image if target == width else image.resize(
+                        (target, round(height * target / width)), Image.LANCZOS
+                    )
+                    if resized.mode not in ('RGB', 'RGBA'):
+                        resized = resized.convert('RGBA')
+                    tmp = out.with_name(f".{name}.tmp")
+                    resized.save(tmp, FORMATS[fmt], quality=QUALITY[fmt])
+                    os.replace(tmp, out)
+                    created += 1
+                variants.append({'file': name, 'width': target, 'format': fmt})
+    return {
+        'file': path,
+        'hash': digest,
+        'width': width,
+        'height': height,
+        'variants': variants,
+        'created': created,
+    }
+
+
+def run_pool(func, paths: Sequence[str], write: bool, jobs: Optional[int]) -> List[Dict]:
+    if not paths:
+        return []
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+    if jobs <= 1:
+        return [func(path, write) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(func, paths, [write] * len(paths)))
+
+
+def load_manifest() -> Dict[str, Dict]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, Dict]) -> None:
+    """Атомарний запис (fix_blocks.write_atomic потребує наявного файлу)."""
+    tmp = MANIFEST_PATH.with_name(MANIFEST_PATH.name + '.tmp')
+    tmp.write_text(json.dumps(manifest, indent=2) + '\n', encoding='utf-8')
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def prune_variants(manifest: Dict[str, Dict]) -> int:
+    """Видалити варіанти старих версій джерел."""
+    current = {variant['file'] for entry in manifest.values() for variant in entry['variants']}
+    removed = 0
+    for path in VARIANTS_DIR.glob('*.*'):
+        if path.suffix.lstrip('.') in FORMATS and path.name not in current:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+# ---------------------- Переписування HTML ----------------------
+
+
+def parse_attrs(text: str) -> List[List[Optional[str]]]:
+    """Атрибути тегу [назва, значення]; у атрибута без значення (hidden) — None."""
+    attrs: List[List[Optional[str]]] = []
+    for m in ATTR_RE.finditer(text):
+        name, *values = m.groups()
+        # Для кожного атрибута окремо: alt="" — порожній рядок, hidden — None
+        attrs.append([name, next((value for value in values if value is not None), None)])
+    return attrs
+
+
+def _attr_value(name: str, value: Optional[str]) -> str:
+    if value is None:
+        return name
+    return f"{name}='{value}'" if '"' in value else f'{name}="{value}"'
+
+
+def pixel_width(value: Optional[str]) -> Optional[int]:
+    """Ширина в пікселях з атрибута width або None (відсоток, auto, 0)."""
+    m = PX_WIDTH_RE.fullmatch(value or '')
+    return int(m.group(1)) or None if m else None
+
+
+def render_img(attrs: List[List[Optional[str]]], original: str) -> str:
+    """<img> у форматуванні оригіналу: в один рядок або атрибут на рядок."""
+    if '\n' not in original:
+        return '<img ' + ' '.join(_attr_value(name, value) for name, value in attrs) + ' />'
+    indent = re.search(r'\n([ \t]*)\S', original).group(1)
+    closing = re.search(r'\n([ \t]*)/?>$', original)
+    closing = closing.group(1) if closing else indent
+    lines = ''.join(f"\n{indent}{_attr_value(name, value)}" for name, value in attrs)
+    return f"<img{lines}\n{closing}/>"
+
+
+def theme_url(path: Path) -> str:
+    return THEME_URL + path.relative_to(BASE_PATH).as_posix()
+
+
+def rewrite_img(tag: str, page: Path, manifest: Dict[str, Dict], lazy: bool, picture: bool) -> str:
+    """Доповнити один <img> атрибутами; повернути новий тег (або розмітку <picture>)."""
+    attrs = parse_attrs(IMG_TAG_RE.match(tag).group(1))
+    values = {name: value for name, value in attrs}
+    src = values.get('src')
+    path = resolve_ref(src, page) if src else None
+    if path is None or not path.exists():
+        return tag
+
+    def set_attr(name: str, value: str, replace: bool = False) -> None:
+        for attr in attrs:
+            if attr[0] == name:
+                if replace:
+                    attr[1] = value
+                return
+        attrs.append([name, value])
+
+    key = path.relative_to(BASE_PATH).as_posix()
+    entry = manifest.get(key)
+    if entry is not None:
+        size = (entry['width'], entry['height'])
+    elif path.suffix == '.svg':
+        size = svg_size(path)
+    else:
+        size = None
+
+    # Пропорційна висота — лише для ширини в пікселях (width="100%" лишається як є)
+    width_attr = values.get('width')
+    display_width = pixel_width(width_attr)
+    if size and not (width_attr and values.get('height')) and (display_width or not width_attr):
+        width, height = size
+        if display_width:
+            height = round(display_width * height / width)
+            width = display_width
+        set_attr('width', str(width))
+        set_attr('height', str(height))
+
+    sources = ''
+    if entry is not None:
+        display = pixel_width(dict(attrs).get('width')) or entry['width']
+        webp = [variant for variant in entry['variants'] if variant['format'] == 'webp']
+        srcset = ', '.join(f"{theme_url(VARIANTS_DIR / v['file'])} {v['width']}w" for v in webp)
+        sizes = f"(max-width: {display}px) 100vw, {display}px"
+        if picture:
+            for fmt in FORMATS:
+                group = [v for v in entry['variants'] if v['format'] == fmt]
+                if group:
+                    fmt_srcset = ', '.join(f"{theme_url(VARIANTS_DIR / v['file'])} {v['width']}w" for v in group)
+                    sources += f'<source type="image/{fmt}" srcset="{fmt_srcset}" sizes="{sizes}" />'
+        elif webp:
+            set_attr('srcset', srcset, replace=True)
+            set_attr('sizes', sizes, replace=True)
+
+    if lazy:
+        set_attr('loading', 'lazy')
+    set_attr('decoding', 'async')
+
+    rendered = render_img(attrs, tag)
+    return f"<picture>{sources}{rendered}</picture>" if sources else rendered
+
+
+def rewrite_html(page: Path, manifest: Dict[str, Dict], picture: bool = False) -> Tuple[str, int]:
+    """Новий текст сторінки та кількість змінених <img>."""
+    content = page.read_text(encoding='utf-8')
+    lazy = page.resolve() not in {path.resolve() for path in ABOVE_THE_FOLD}
+    changed = 0
+
+    def _rewrite(m: 're.Match') -> str:
+        nonlocal changed
+        # Уже в <picture>: не обгортати вдруге
+        wrapped = content.rfind('<picture', 0, m.start()) > content.rfind('</picture>', 0, m.start())
+        new = rewrite_img(m.group(), page, manifest, lazy, picture and not wrapped)
+        if new != m.group():
+            changed += 1
+        return new
+
+    return IMG_TAG_RE.sub(_rewrite, content), changed
+
+
+def referenced_images(pages: Sequence[Path]) -> Tuple[List[Path], List[str]]:
+    """Растрові зображення з <img src> сторінок та посилання, яких немає в дереві."""
+    raster = set()
+    missing = []
+    for page in pages:
+        for m in IMG_TAG_RE.finditer(page.read_text(encoding='utf-8')):
+            src = dict(parse_attrs(m.group(1))).get('src')
+            path = resolve_ref(src, page) if src else None
+            if path is None:
+                continue
+            if not path.exists():
+                missing.append(f"{page.name}: {src}")
+            elif path.suffix.lower() in RASTER_EXTENSIONS:
+                raster.add(path)
+    return sorted(raster), missing
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Оптимізація зображень і адаптивні варіанти')
+    parser.add_argument('paths', nargs='*', type=Path, help='HTML файли або директорії (за замовчуванням gutenberg/ та templates/)')
+    parser.add_argument('--dry-run', action='store_true', help='не записувати файли')
+    parser.add_argument('--picture', action='store_true', help='обгортати растрові <img> у <picture> з AVIF/WebP')
+    parser.add_argument('--jobs', '-j', type=int, help='кількість процесів (за замовчуванням — кількість CPU)')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    write = not args.dry_run
+    pages = [path.resolve() for path in collect_files(args.paths or DEFAULT_DIRS)]
+    if not pages:
+        print(f"{RED}✗ HTML файли не знайдені!{RESET}", file=sys.stderr)
+        return 1
+
+    raster, missing = referenced_images(pages)
+    for ref in missing:
+        print(f"{YELLOW}⚠ файл не знайдено: {ref}{RESET}")
+
+    manifest = load_manifest()
+    if raster:
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            print(f"{RED}✗ Для растрових зображень потрібен Pillow: pip install -r scripts/requirements.txt{RESET}", file=sys.stderr)
+            return 1
+        if write:
+            VARIANTS_DIR.mkdir(exist_ok=True)
+        for result in run_pool(generate_variants, [str(path) for path in raster], write, args.jobs):
+            key = Path(result.pop('file')).relative_to(BASE_PATH).as_posix()
+            created = result.pop('created')
+            manifest[key] = result
+            status = f"{GREEN}+{created}{RESET}" if created else f"{BLUE}={RESET}"
+            print(f"  {status} {key}: {result['width']}×{result['height']}, {len(result['variants'])} варіантів")
+        if write and not args.paths:
+            # Повний прогін: варіанти зображень, на які більше не посилаються, зайві
+            manifest = {key: entry for key, entry in manifest.items() if BASE_PATH / key in raster}
+        if write:
+            save_manifest(manifest)
+            prune_variants(manifest)
+
+    svgs = sorted(str(path) for path in IMG_DIR.glob('*.svg'))
+    saved = sum(result['saved'] for result in run_pool(optimize_svg_file, svgs, write, args.jobs))
+    print(f"{GREEN}✓{RESET} SVG: {len(svgs)} файлів, зекономлено {saved} B")
+
+    rewritten = 0
+    for page in pages:
+        content, changed = rewrite_html(page, manifest, args.picture)
+        if changed:
+            rewritten += 1
+            print(f"  {GREEN}✓{RESET} {page.relative_to(BASE_PATH)}: {changed} <img>")
+            if write:
+                write_atomic(page, content)
+
+    print(f"\n{BLUE}Растрових: {len(raster)}, HTML змінено: {rewritten}{RESET}")
+    if not write:
+        print(f"{YELLOW}⚠ DRY RUN - зміни НЕ збережені.{RESET}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Бюджет ваги сторінок для блочних шаблонів
+
+Для кожного gutenberg/*.html і templates/*.html визначаються ресурси, які
+завантажить сторінка з цим шаблоном: спільні (стилі та скрипти з
+inc/assets.php, шрифти, inline critical.css) і власні (зображення, SVG,
+емоджі зі спрайту Twemoji, умовні стилі на кшталт faq.css, якщо шаблон
+використовує їхні класи). Для кожного ресурсу рахується розмір raw і gzip;
+якщо сума перевищує бюджет зі scripts/page-budgets.json, код виходу 1.
+
+Якщо є збірки (dist/manifest.json, fonts/subset/manifest.json), рахуються
+саме вони — так, як їх віддасть medici_asset() і medici_get_font_faces().
+
+Кеш .page-budget-cache: розміри ресурсів за mtime/розміром і sha1, аналіз
+шаблонів за sha1 вмісту, тож перевірка в pre-commit коштує кілька мс.
+
+Використання:
+    python3 scripts/page_budget.py                        # усі шаблони
+    python3 scripts/page_budget.py gutenberg/HERO.html -v # з переліком ресурсів
+    python3 scripts/page_budget.py --format json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+from build_assets import SCRIPTS, STYLES
+from css_index import load_index
+from gutenberg_blocks import collect_files
+from purge_css import TemplateUsage
+from twemoji_sprite import EmojiMatcher, unescape
+
+BASE_PATH = Path(__file__).parent.parent
+DEFAULT_DIRS = [BASE_PATH / 'gutenberg', BASE_PATH / 'templates']
+BUDGETS_PATH = BASE_PATH / 'scripts' / 'page-budgets.json'
+CACHE_PATH = BASE_PATH / '.page-budget-cache'
+ASSET_MANIFEST = BASE_PATH / 'dist' / 'manifest.json'
+FONT_MANIFEST = BASE_PATH / 'fonts' / 'subset' / 'manifest.json'
+SPRITE_MANIFEST = BASE_PATH / 'assets' / 'twemoji' / 'sprite.json'
+CRITICAL_CSS = BASE_PATH / 'css' / 'critical.css'
+
+# Handles з inc/assets.php, що підключаються на кожній сторінці
+# (forms.css — на всіх desktop сторінках через exit-intent)
+SHARED_STYLES = ['medici-core', 'medici-layout', 'medici-child-theme', 'medici-forms']
+CONDITIONAL_STYLES = ['medici-cards', 'medici-faq', 'medici-blog', 'medici-blog-single']
+SHARED_SCRIPTS = ['medici-app', 'medici-events', 'medici-event-forms', 'medici-faq-accordion', 'medici-lazy-load']
+EXTRA_SCRIPTS = ['js/module-loader.js', 'js/twemoji/twemoji.min.js']
+FONTS = ['montserrat-regular', 'montserrat-600', 'montserrat-700']
+
+THEME_URL_RE = re.compile(r'^(?:https?://[^/]+)?/wp-content/themes/[^/]+/')
+REF_RE = re.compile(
+    r'''\b(?:src|href|poster|data-src)=["']([^"']+)["']'''
+    r'''|\bsrcset=["']([^"']+)["']'''
+    r'''|url\(\s*\\?["']?([^"')\\]+)\\?["']?\s*\)'''
+)
+BLOCK_COMMENT_RE = re.compile(r'<!--\s*/?wp:.*?-->\n?', re.DOTALL)
+ASSET_EXTENSIONS = {
+    '.svg', '.png', '.jpg', '.jpeg', '.webp', '.avif', '.gif', '.ico',
+    '.woff', '.woff2', '.css', '.js', '.mp4', '.webm',
+}
+CATEGORIES = {
+    '.css': 'css', '.js': 'js', '.woff': 'fonts', '.woff2': 'fonts',
+    '.mp4': 'media', '.webm': 'media',
+}
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+def engine_version() -> str:
+    """Хеш коду аналізатора: зміна правил розбору скидає кеш шаблонів."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+def _read_json(path: Path) -> Dict:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+# ---------------------- Кеш ----------------------
+
+
+class BudgetCache:
+    """Розміри файлів (raw/gzip) та аналіз шаблонів за sha1."""
+
+    def __init__(self, path: Path = CACHE_PATH) -> None:
+        self.path = path
+        self.version = engine_version()
+        self.sizes: Dict[str, Dict] = {}
+        self.pages: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._matcher: Optional[EmojiMatcher] = None
+        data = _read_json(path)
+        if data.get('version') == self.version:
+            self.sizes = data.get('sizes', {})
+            self.pages = data.get('pages', {})
+
+    def size(self, path: Path) -> Dict[str, int]:
+        """{'raw', 'gzip'}: з кешу, якщо файл не змінився."""
+        key = path.relative_to(BASE_PATH).as_posix()
+        stat = path.stat()
+        entry = self.sizes.get(key)
+        if entry is not None and entry['mtime'] == stat.st_mtime_ns and entry['raw'] == stat.st_size:
+            return entry
+
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        if entry is None or entry['sha1'] != digest:
+            # woff2/зображення вже стиснуті: сервер їх не gzip-ить
+            compressed = len(raw) if path.suffix in ('.woff2', '.woff', '.png', '.jpg', '.jpeg', '.webp', '.avif', '.gif', '.mp4', '.webm') \
+                else len(gzip.compress(raw, 9))
+        else:
+            compressed = entry['gzip']
+        entry = {'mtime': stat.st_mtime_ns, 'raw': len(raw), 'gzip': compressed, 'sha1': digest}
+        self.sizes[key] = entry
+        self.dirty = True
+        return entry
+
+    def analyze(self, path: Path) -> Dict:
+        """Посилання, класи та емоджі шаблону (кеш за sha1 вмісту)."""
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        entry = self.pages.get(digest)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        markup = raw.decode('utf-8')
+        html = BLOCK_COMMENT_RE.sub('', markup).encode()
+        refs: Set[str] = set()
+        for m in REF_RE.finditer(markup):
+            if m.group(2):
+                refs.update(part.strip().split(' ')[0] for part in m.group(2).split(','))
+            else:
+                refs.add(m.group(1) or m.group(3))
+        if self._matcher is None:
+            self._matcher = EmojiMatcher.from_directory()
+        entry = {
+            'refs': sorted(ref for ref in refs if ref),
+            'classes': sorted(TemplateUsage(markup).classes),
+            'emoji': sorted(set(self._matcher.find(unescape(markup)))),
+            'html': {'raw': len(html), 'gzip': len(gzip.compress(html, 9))},
+        }
+        self.pages[digest] = entry
+        self.dirty = True
+        return entry
+
+    def save(self, keep: Set[str]) -> None:
+        """Атомарний запис; аналіз лише поточних версій шаблонів."""
+        self.pages = {digest: entry for digest, entry in self.pages.items() if digest in keep}
+        if not self.dirty:
+            return
+        sizes = {key: entry for key, entry in self.sizes.items() if (BASE_PATH / key).exists()}
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(json.dumps({'version': self.version, 'sizes': sizes, 'pages': self.pages}), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+# ---------------------- Ресурси ----------------------
+
+
+def resolve_ref(ref: str, page: Path) -> Optional[Path]:
+    """Файл у дереві теми для URL з розмітки; None для зовнішніх і якорів."""
+    ref = ref.split('#', 1)[0].split('?', 1)[0]
+    theme_ref = THEME_URL_RE.sub('', ref)
+    if theme_ref != ref:
+        path = BASE_PATH / theme_ref
+    elif re.match(r'^(?:[a-z]+:|/|$)', ref, re.IGNORECASE):
+        return None
+    else:
+        path = page.parent / ref
+    if path.suffix.lower() not in ASSET_EXTENSIONS:
+        return None
+    return path.resolve()
+
+
+def handle_files(section: str, handle: str, manifest: Dict) -> List[Path]:
+    """Файли, які віддасть medici_asset(): бандл або вихідні джерела."""
+    entry = manifest.get(section, {}).get(handle)
+    if entry and (BASE_PATH / 'dist' / entry['file']).exists():
+        return [BASE_PATH / 'dist' / entry['file']]
+    sources = (STYLES if section == 'styles' else SCRIPTS)[handle]
+    return [BASE_PATH / rel for rel in sources if (BASE_PATH / rel).exists()]
+
+
+def shared_assets() -> List[Path]:
+    """Ресурси, спільні для всіх сторінок."""
+    manifest = _read_json(ASSET_MANIFEST)
+    fonts = _read_json(FONT_MANIFEST)
+    files: List[Path] = []
+    for handle in SHARED_STYLES:
+        files.extend(handle_files('styles', handle, manifest))
+    for handle in SHARED_SCRIPTS:
+        files.extend(handle_files('scripts', handle, manifest))
+    files.extend(BASE_PATH / rel for rel in EXTRA_SCRIPTS if (BASE_PATH / rel).exists())
+    for key in FONTS:
+        subset = fonts.get(key, {}).get('file')
+        if subset and (FONT_MANIFEST.parent / subset).exists():
+            files.append(FONT_MANIFEST.parent / subset)
+        else:
+            files.append(BASE_PATH / 'fonts' / f'{key}.woff2')
+    return files
+
+
+def conditional_styles(classes: Sequence[str], index) -> Dict[str, List[str]]:
+    """Умовні стилі, класи яких використовує шаблон: handle -> класи."""
+    sources = {
+        Path(rel).relative_to('css').as_posix(): handle
+        for handle in CONDITIONAL_STYLES for rel in STYLES[handle] if rel.startswith('css/')
+    }
+    used: Dict[str, List[str]] = {}
+    for cls in classes:
+        for definition in index.lookup(cls):
+            handle = sources.get(definition['file'])
+            if handle and cls not in used.setdefault(handle, []):
+                used[handle].append(cls)
+    return used
+
+
+def page_assets(page: Path, analysis: Dict, index) -> List[Path]:
+    """Власні ресурси сторінки."""
+    manifest = _read_json(ASSET_MANIFEST)
+    files: List[Path] = []
+    for handle in conditional_styles(analysis['classes'], index):
+        files.extend(handle_files('styles', handle, manifest))
+        if handle in SCRIPTS:
+            files.extend(handle_files('scripts', handle, manifest))
+
+    sprite = _read_json(SPRITE_MANIFEST)
+    icons = sprite.get('icons', {})
+    if any(name in icons for name in analysis['emoji']):
+        files.append(SPRITE_MANIFEST.parent / sprite['sprite'])
+    files.extend(
+        BASE_PATH / 'assets' / 'twemoji' / 'svg' / f'{name}.svg'
+        for name in analysis['emoji'] if name not in icons
+    )
+
+    for ref in analysis['refs']:
+        path = resolve_ref(ref, page)
+        if path is not None:
+            files.append(path)
+    return files
+
+
+def category(path: Path) -> str:
+    return CATEGORIES.get(path.suffix.lower(), 'images')
+
+
+# ---------------------- Бюджет ----------------------
+
+
+def load_budgets(path: Path = BUDGETS_PATH) -> Dict:
+    """Бюджети в KB: {'default': {...}, 'pages': {'gutenberg/X.html': {...}}}."""
+    budgets = _read_json(path)
+    budgets.setdefault('default', {})
+    budgets.setdefault('pages', {})
+    return budgets
+
+
+def page_budget(budgets: Dict, name: str) -> Dict[str, float]:
+    return {**budgets['default'], **budgets['pages'].get(name, {})}
+
+
+def analyze_pages(pages: Sequence[Path], cache: BudgetCache, budgets: Dict) -> List[Dict]:
+    """Звіт по сторінках: ресурси, суми raw/gzip, бюджет і перевищення."""
+    index = load_index()
+    critical = cache.size(CRITICAL_CSS) if CRITICAL_CSS.exists() else {'raw': 0, 'gzip': 0}
+    shared = shared_assets()
+    reports = []
+    for page in pages:
+        name = page.relative_to(BASE_PATH).as_posix()
+        analysis = cache.analyze(page)
+        assets: List[Dict] = []
+        seen: Set[Path] = set()
+        missing = []
+        for path in shared + page_assets(page, analysis, index):
+            if path in seen:
+                continue
+            seen.add(path)
+            if not path.exists():
+                missing.append(path.relative_to(BASE_PATH).as_posix() if path.is_relative_to(BASE_PATH) else str(path))
+                continue
+            size = cache.size(path)
+            assets.append({
+                'file': path.relative_to(BASE_PATH).as_posix(),
+                'category': category(path),
+                'shared': path in shared,
+                'raw': size['raw'],
+                'gzip': size['gzip'],
+            })
+
+        # HTML документа: розмітка шаблону + inline critical.css
+        html = {'raw': analysis['html']['raw'] + critical['raw'], 'gzip': analysis['html']['gzip'] + critical['gzip']}
+        totals = {'html': dict(html)}
+        for asset in assets:
+            bucket = totals.setdefault(asset['category'], {'raw': 0, 'gzip': 0})
+            bucket['raw'] += asset['raw']
+            bucket['gzip'] += asset['gzip']
+        total = {
+            'raw': sum(bucket['raw'] for bucket in totals.values()),
+            'gzip': sum(bucket['gzip'] for bucket in totals.values()),
+        }
+
+        budget = page_budget(budgets, name)
+        over = []
+        if 'transfer' in budget and total['gzip'] > budget['transfer'] * 1024:
+            over.append(f"transfer {total['gzip'] / 1024:.1f} KB > {budget['transfer']} KB")
+        if 'raw' in budget and total['raw'] > budget['raw'] * 1024:
+            over.append(f"raw {total['raw'] / 1024:.1f} KB > {budget['raw']} KB")
+        if 'requests' in budget and len(assets) + 1 > budget['requests']:
+            over.append(f"запитів {len(assets) + 1} > {budget['requests']}")
+
+        reports.append({
+            'page': name,
+            'assets': assets,
+            'missing': missing,
+            'totals': totals,
+            'total': total,
+            'requests': len(assets) + 1,
+            'budget': budget,
+            'over': over,
+        })
+    return reports
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Бюджет ваги сторінок для блочних шаблонів')
+    parser.add_argument('paths', nargs='*', type=Path, help='файли або директорії (за замовчуванням gutenberg/ та templates/)')
+    parser.add_argument('--budgets', type=Path, default=BUDGETS_PATH, help='файл бюджетів (KB)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('--verbose', '-v', action='store_true', help='перелік ресурсів кожної сторінки')
+    parser.add_argument('--no-cache', action='store_true', help='не читати і не писати .page-budget-cache')
+    return parser.parse_args(argv)
+
+
+def print_report(report: Dict, verbose: bool) -> None:
+    total = report['total']
+    budget = report['budget'].get('transfer')
+    mark = f"{RED}✗{RESET}" if report['over'] else f"{GREEN}✓{RESET}"
+    limit = f" / {budget} KB" if budget else ''
+    print(
+        f"{mark} {report['page']:<38} {total['gzip'] / 1024:7.1f}{limit} gzip  "
+        f"{total['raw'] / 1024:7.1f} KB raw  {report['requests']:>3} запитів"
+    )
+    if verbose:
+        parts = ', '.join(
+            f"{name} {bucket['gzip'] / 1024:.1f}" for name, bucket in sorted(report['totals'].items())
+        )
+        print(f"    {BLUE}{parts} (KB gzip){RESET}")
+        for asset in sorted(report['assets'], key=lambda item: -item['gzip']):
+            scope = '' if asset['shared'] else f" {YELLOW}(сторінка){RESET}"
+            print(f"    {asset['gzip'] / 1024:6.1f} KB  {asset['file']}{scope}")
+    for problem in report['over']:
+        print(f"    {RED}перевищено: {problem}{RESET}")
+    for path in report['missing']:
+        print(f"    {YELLOW}⚠ файл не знайдено: {path}{RESET}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    pages = collect_files(args.paths or DEFAULT_DIRS)
+    if not pages:
+        print(f"{RED}✗ HTML файли не знайдені!{RESET}", file=sys.stderr)
+        return 1
+    pages = [page.resolve() for page in pages]
+
+    cache = BudgetCache(Path(os.devnull) if args.no_cache else CACHE_PATH)
+    reports = analyze_pages(pages, cache, load_budgets(args.budgets))
+    if not args.no_cache:
+        keep = {hashlib.sha1(path.read_bytes()).hexdigest() for path in collect_files(DEFAULT_DIRS)}
+        cache.save(keep | set(cache.pages) if args.paths else keep)
+
+    failed = [report for report in reports if report['over']]
+    if args.format == 'json':
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+        return 1 if failed else 0
+
+    for report in reports:
+        print_report(report, args.verbose)
+    print(f"\n{BLUE}Сторінок: {len(reports)}, понад бюджет: {len(failed)}, кеш: {cache.hits}/{cache.hits + cache.misses}{RESET}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
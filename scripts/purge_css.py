@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Аналіз невикористаного CSS для кожного шаблону
+
+Для кожного gutenberg/*.html та templates/*.html у пам'яті очищаються
+css/components/*.css та css/layout/layout.css: лишаються тільки селектори,
+усі класи, id та теги яких є в розмітці шаблону або в safelist. Звіт
+показує, скільки CSS потрібно шаблону, і класи, не використані жодним
+шаблоном (кандидати на видалення з джерел). Safelist збирається з js/*.js: класи в
+classList.add/remove/toggle, присвоєннях className, властивостях
+*Class: '...' та розмітці class="..." в рядках; шаблонні рядки
+(`form__message--${type}`) дають префікси.
+
+Псевдокласи (:hover, :focus) не відкидають селектор — це стан того
+самого елемента; аргументи :not() не вимагають присутності класу.
+
+Окремі бандли на шаблон не збираються: gutenberg/*.html — фрагменти
+секцій, а не сторінки, і тема не знає, з яких секцій складається сторінка,
+тож такий бандл нічим підключити замість спільних стилів.
+
+Використання:
+    python3 scripts/purge_css.py                     # усі шаблони
+    python3 scripts/purge_css.py gutenberg/HERO.html
+    python3 scripts/purge_css.py --unused            # класи без жодного використання
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from critical_css import IDENT_RE, build_document, compile_selector
+from css_index import CssNode, parse_stylesheet, render_stylesheet, resolve_nesting, selector_classes
+from gutenberg_blocks import collect_files
+
+BASE_PATH = Path(__file__).parent.parent
+CSS_DIR = BASE_PATH / 'css'
+JS_DIR = BASE_PATH / 'js'
+DEFAULT_DIRS = [BASE_PATH / 'gutenberg', BASE_PATH / 'templates']
+
+# Порядок компонентів як у inc/assets.php; решта — за алфавітом, layout останнім
+COMPONENT_ORDER = ['buttons', 'sections', 'navigation', 'lazy-load', 'cards', 'faq', 'forms']
+LAYOUT_CSS = CSS_DIR / 'layout/layout.css'
+
+STRING_RE = re.compile(r'`([^`]*)`|\'([^\'\n]*)\'|"([^"\n]*)"')
+CLASSLIST_RE = re.compile(r'classList\.(?:add|remove|toggle|replace|contains)\(([^)]*)\)')
+CLASSNAME_RE = re.compile(r'className\s*\+?=\s*(`[^`]*`|\'[^\'\n]*\'|"[^"\n]*")')
+CLASS_PROP_RE = re.compile(r'\b\w*[cC]lass(?:Name)?\s*:\s*(`[^`]*`|\'[^\'\n]*\'|"[^"\n]*")')
+CLASS_ATTR_RE = re.compile(r'class=\\?["\']([^"\'\\]*)')
+SET_CLASS_RE = re.compile(r'setAttribute\(\s*[\'"]class[\'"]\s*,\s*(`[^`]*`|\'[^\'\n]*\'|"[^"\n]*")')
+CLASS_TOKEN_RE = re.compile(r'-?[_a-zA-Z][\w-]*$')
+SET_ATTRIBUTE_RE = re.compile(r'(?:set|toggle)Attribute\(\s*[\'"]([\w-]+)[\'"]')
+
+# Теги, що є на кожній сторінці незалежно від шаблону
+PAGE_TAGS = {'html', 'body'}
+
+
+# ---------------------- Safelist ----------------------
+
+
+class Safelist:
+    """Класи, які JS додає під час роботи: точні назви та префікси."""
+
+    def __init__(self, classes: Set[str], prefixes: Set[str], attributes: Set[str] = frozenset()) -> None:
+        self.classes = classes
+        self.prefixes = tuple(sorted(prefixes))
+        # Атрибути, які JS виставляє елементам (data-theme на <html> тощо)
+        self.attributes = set(attributes)
+
+    def __contains__(self, cls: str) -> bool:
+        return cls in self.classes or cls.startswith(self.prefixes)
+
+    @classmethod
+    def from_js(cls, paths: Sequence[Path]) -> 'Safelist':
+        classes: Set[str] = set()
+        prefixes: Set[str] = set()
+        attributes: Set[str] = set()
+        for path in paths:
+            source = path.read_text(encoding='utf-8')
+            attributes.update(name.lower() for name in SET_ATTRIBUTE_RE.findall(source))
+            values: List[str] = []
+            for m in CLASSLIST_RE.finditer(source):
+                values.extend(''.join(groups) for groups in STRING_RE.findall(m.group(1)))
+            for regex in (CLASSNAME_RE, CLASS_PROP_RE, SET_CLASS_RE):
+                values.extend(m.group(1)[1:-1] for m in regex.finditer(source))
+            values.extend(m.group(1) for m in CLASS_ATTR_RE.finditer(source))
+
+            for value in values:
+                for token in value.split():
+                    if '${' in token:
+                        prefix = token.split('${', 1)[0]
+                        if len(prefix) > 2 and prefix[-1] in '-_':
+                            prefixes.add(prefix)
+                    elif CLASS_TOKEN_RE.match(token):
+                        classes.add(token)
+        return cls(classes, prefixes, attributes)
+
+
+def js_sources() -> List[Path]:
+    return sorted(JS_DIR.glob('*.js'))
+
+
+# ---------------------- Очищення ----------------------
+
+
+def css_sources() -> List[Path]:
+    """Компоненти в порядку підключення, потім layout."""
+    components = {path.stem: path for path in (CSS_DIR / 'components').glob('*.css')}
+    ordered = [components.pop(name) for name in COMPONENT_ORDER if name in components]
+    ordered.extend(components[name] for name in sorted(components))
+    if LAYOUT_CSS.exists():
+        ordered.append(LAYOUT_CSS)
+    return ordered
+
+
+class TemplateUsage:
+    """Класи, id, теги та назви атрибутів з розмітки шаблону."""
+
+    def __init__(self, markup: str) -> None:
+        self.classes: Set[str] = set()
+        self.ids: Set[str] = set()
+        self.tags: Set[str] = set(PAGE_TAGS)
+        self.attributes: Set[str] = set()
+        for element in build_document([markup]).walk():
+            self.tags.add(element.tag)
+            self.classes.update(element.classes)
+            self.attributes.update(element.attrs)
+            if element.attrs.get('id'):
+                self.ids.add(element.attrs['id'])
+
+
+class Purger:
+    """Видалення з дерева правил селекторів, не використаних шаблоном."""
+
+    def __init__(self, usage: TemplateUsage, safelist: Safelist) -> None:
+        self.usage = usage
+        self.safelist = safelist
+        self.kept = 0
+        self.removed = 0
+
+    def used(self, selector: str) -> bool:
+        for (tag, id_, classes, attrs, _), _ in compile_selector(selector):
+            if tag is not None and tag not in self.usage.tags:
+                return False
+            for name, _, _ in attrs:
+                if name not in self.usage.attributes and name not in self.safelist.attributes:
+                    return False
+            if id_ is not None and id_ not in self.usage.ids and id_ not in self.safelist:
+                return False
+            for cls in classes:
+                if cls not in self.usage.classes and cls not in self.safelist:
+                    return False
+        return True
+
+    def purge(self, nodes: Sequence[CssNode]) -> List[CssNode]:
+        """Очищене дерево таблиці стилів."""
+        return _drop_unused_keyframes(self._purge(nodes, None))
+
+    def _purge(self, nodes: Sequence[CssNode], parent: Optional[str]) -> List[CssNode]:
+        result: List[CssNode] = []
+        for node in nodes:
+            at_rule = node.at_rule
+            if at_rule is None:
+                selectors = resolve_nesting(node.prelude, parent)
+                kept = [sel for sel in selectors if self.used(sel)]
+                self.kept += len(kept)
+                self.removed += len(selectors) - len(kept)
+                children = self._purge(node.children, ', '.join(selectors)) if node.children else []
+                if kept and node.declarations:
+                    result.append(node.copy(prelude=', '.join(kept), children=[]))
+                result.extend(children)
+            elif node.block and at_rule in ('media', 'supports', 'layer', 'container'):
+                children = self._purge(node.children, parent)
+                if children:
+                    result.append(node.copy(children=children))
+            else:
+                # @keyframes, @font-face, @import — залежать від решти правил
+                result.append(node)
+        return result
+
+
+def _drop_unused_keyframes(nodes: List[CssNode]) -> List[CssNode]:
+    text = render_stylesheet([node for node in nodes if node.at_rule != 'keyframes'])
+    names = set(IDENT_RE.findall(' '.join(
+        decl.split(':', 1)[1] for decl in re.findall(r'animation(?:-name)?\s*:[^;\n]+', text)
+    )))
+    return [
+        node for node in nodes
+        if node.at_rule != 'keyframes' or node.prelude.split(' ', 1)[-1].strip() in names
+    ]
+
+
+# ---------------------- Звіт ----------------------
+
+
+def purge_template(
+    template: Path,
+    parsed: Sequence[Tuple[Path, List[CssNode]]],
+    safelist: Safelist,
+) -> Tuple[str, Purger]:
+    """Очищений CSS шаблону (лише в пам'яті) та статистика очищення."""
+    purger = Purger(TemplateUsage(template.read_text(encoding='utf-8')), safelist)
+    sections = [render_stylesheet(kept) for kept in (purger.purge(nodes) for _, nodes in parsed) if kept]
+    return '\n'.join(sections), purger
+
+
+def report(templates: Sequence[Path]) -> List[Dict]:
+    """Скільки CSS лишається кожному шаблону після очищення."""
+    sources = css_sources()
+    safelist = Safelist.from_js(js_sources())
+    parsed = [(path, parse_stylesheet(path.read_text(encoding='utf-8'))) for path in sources]
+    source_bytes = sum(path.stat().st_size for path in sources)
+
+    results = []
+    for template in templates:
+        text, purger = purge_template(template, parsed, safelist)
+        results.append({'template': template, 'bytes': len(text.encode()), 'source_bytes': source_bytes,
+                        'kept': purger.kept, 'removed': purger.removed})
+    return results
+
+
+def unused_classes(templates: Sequence[Path]) -> Dict[str, List[str]]:
+    """Класи з джерел, яких немає в жодному шаблоні та safelist (файл -> класи)."""
+    used: Set[str] = set()
+    for template in templates:
+        used |= TemplateUsage(template.read_text(encoding='utf-8')).classes
+    safelist = Safelist.from_js(js_sources())
+
+    unused: Dict[str, List[str]] = {}
+    for path in css_sources():
+        defined: Set[str] = set()
+        for node in _style_rules(parse_stylesheet(path.read_text(encoding='utf-8'))):
+            defined.update(selector_classes(node.prelude))
+        missing = sorted(cls for cls in defined if cls not in used and cls not in safelist)
+        if missing:
+            unused[path.relative_to(BASE_PATH).as_posix()] = missing
+    return unused
+
+
+def _style_rules(nodes: Sequence[CssNode]) -> Iterator[CssNode]:
+    for node in nodes:
+        if node.at_rule is None:
+            yield node
+        yield from _style_rules(node.children)
+
+
+# ---------------------- CLI ----------------------
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    parser = argparse.ArgumentParser(description='Аналіз невикористаного CSS для шаблонів')
+    parser.add_argument('paths', nargs='*', type=Path, help='шаблони або директорії (за замовчуванням gutenberg/ та templates/)')
+    parser.add_argument('--unused', action='store_true', help='лише вивести класи, не використані жодним шаблоном')
+    args = parser.parse_args(argv)
+
+    templates = collect_files(args.paths or DEFAULT_DIRS)
+    if not templates:
+        print("✗ HTML шаблони не знайдені", file=sys.stderr)
+        return 1
+
+    if args.unused:
+        for name, classes in unused_classes(collect_files(DEFAULT_DIRS)).items():
+            print(f"📄 {name}: {len(classes)}")
+            for cls in classes:
+                print(f"   .{cls}")
+        return 0
+
+    started = time.perf_counter()
+    results = report(templates)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        saved = 100 - result['bytes'] * 100 / result['source_bytes']
+        print(f"  {result['template'].relative_to(BASE_PATH)}: {result['bytes'] / 1024:6.1f} КБ "
+              f"(-{saved:.0f}%)  {result['kept']} селекторів, -{result['removed']}")
+    total = sum(result['bytes'] for result in results)
+    print(f"\nШаблонів: {len(results)}, "
+          f"джерела: {results[0]['source_bytes'] / 1024:.1f} КБ, "
+          f"в середньому на шаблон: {total / len(results) / 1024:.1f} КБ ({elapsed * 1000:.0f} мс)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,17 +2,17 @@
 """
 Рефакторинг HTML файлів GenerateBlocks для Medici theme
 Виправляє:
-- CSS Variables escaping: \u002d\u002d → \\u002d\\u002d
+- CSS Variables escaping у var(): \u002d\u002d → \\u002d\\u002d
 - Ampersand escaping: \u0026 → \\u0026
 - Transition timing: 0.5s → 0.3s
-- UniqueId перевірка (hex, 8 chars, lowercase)
+- UniqueId перевірка (hex, 8 chars, lowercase, унікальність між файлами)
 """
 
-import re
-import os
 import sys
 from pathlib import Path
-from typing import List, Tuple
+
+from fix_blocks import fix_file, fix_paths, unique_id_conflicts
+from gutenberg_blocks import BlockIndex, BlockParseError
 
 # Кольори для виводу
 RED = '\033[91m'
@@ -21,130 +21,25 @@ YELLOW = '\033[93m'
 BLUE = '\033[94m'
 RESET = '\033[0m'
 
-def is_valid_hex_id(unique_id: str) -> bool:
-    """Перевірка чи UniqueId валідний (8 hex chars, lowercase)"""
-    if len(unique_id) != 8:
-        return False
-    return bool(re.match(r'^[0-9a-f]{8}$', unique_id))
-
-def fix_css_variables(content: str) -> Tuple[str, int]:
-    """Виправлення CSS Variables escaping"""
-    # Знайти всі неправильні варіанти
-    pattern = r'\\u005cu002d\\u005cu002d'  # \u005cu002d\u005cu002d
-    count = len(re.findall(pattern, content))
-
-    # Замінити на правильний варіант
-    fixed = re.sub(pattern, r'\\u002d\\u002d', content)
-
-    # Також перевірити одинарні \u002d (без подвійного backslash)
-    pattern2 = r'(?<!\\)\\u002d\\u002d'
-    count2 = len(re.findall(pattern2, fixed))
-    if count2 > 0:
-        fixed = re.sub(pattern2, r'\\u002d\\u002d', fixed)
-        count += count2
-
-    return fixed, count
-
-def fix_ampersand(content: str) -> Tuple[str, int]:
-    """Виправлення Ampersand escaping"""
-    # Знайти всі неправильні варіанти
-    pattern = r'\\u005cu0026'  # \u005cu0026
-    count = len(re.findall(pattern, content))
-
-    # Замінити на правильний варіант
-    fixed = re.sub(pattern, r'\\u0026', content)
-
-    # Також перевірити одинарні \u0026 (без подвійного backslash)
-    pattern2 = r'(?<!\\)\\u0026'
-    count2 = len(re.findall(pattern2, fixed))
-    if count2 > 0:
-        fixed = re.sub(pattern2, r'\\u0026', fixed)
-        count += count2
-
-    return fixed, count
-
-def fix_transition_timing(content: str) -> Tuple[str, int]:
-    """Стандартизація transition timing до 0.3s"""
-    pattern = r'"transition":\s*"all\s+0\.5s\s+ease\s+0s"'
-    count = len(re.findall(pattern, content))
-
-    # Замінити на стандартний варіант
-    fixed = re.sub(pattern, r'"transition": "all 0.3s ease 0s"', content)
-
-    return fixed, count
-
-def fix_media_queries(content: str) -> Tuple[str, int]:
-    """Стандартизація media queries форматування (max-width:XXXpx → max-width: XXXpx)"""
-    # Знайти всі варіанти без пробілу після двокрапки
-    pattern = r'max-width:(\d+px)'
-    matches = re.findall(pattern, content)
-    count = len(matches)
-
-    # Замінити на варіант з пробілом
-    fixed = re.sub(pattern, r'max-width: \1', content)
-
-    return fixed, count
-
-def check_unique_ids(content: str) -> List[str]:
-    """Перевірка всіх UniqueId на валідність"""
-    pattern = r'"uniqueId":\s*"([^"]+)"'
-    matches = re.findall(pattern, content)
 
-    invalid_ids = []
-    for uid in matches:
-        if not is_valid_hex_id(uid):
-            invalid_ids.append(uid)
-
-    return invalid_ids
-
-def refactor_file(filepath: Path, dry_run: bool = False) -> dict:
-    """Рефакторинг одного HTML файлу"""
-    result = {
-        'file': filepath.name,
-        'css_vars_fixed': 0,
-        'ampersand_fixed': 0,
-        'transition_fixed': 0,
-        'media_queries_fixed': 0,
-        'invalid_ids': [],
-        'success': False
+def _to_report(result: dict) -> dict:
+    """Результат fix_blocks у форматі звіту цього скрипта."""
+    counts = result['counts']
+    if result['error']:
+        print(f"{RED}✗ Помилка при обробці {Path(result['file']).name}: {result['error']}{RESET}")
+    return {
+        'file': Path(result['file']).name,
+        'css_vars_fixed': counts.get('css-vars', 0),
+        'ampersand_fixed': counts.get('ampersand', 0),
+        'transition_fixed': counts.get('transition', 0),
+        'media_queries_fixed': counts.get('media-queries', 0),
+        'invalid_ids': result['invalid_ids'],
+        'success': result['error'] is None,
     }
 
-    try:
-        # Читання файлу
-        content = filepath.read_text(encoding='utf-8')
-        original = content
-
-        # Виправлення CSS Variables
-        content, css_count = fix_css_variables(content)
-        result['css_vars_fixed'] = css_count
-
-        # Виправлення Ampersand
-        content, amp_count = fix_ampersand(content)
-        result['ampersand_fixed'] = amp_count
-
-        # Виправлення Transition
-        content, trans_count = fix_transition_timing(content)
-        result['transition_fixed'] = trans_count
-
-        # Виправлення Media Queries
-        content, media_count = fix_media_queries(content)
-        result['media_queries_fixed'] = media_count
-
-        # Перевірка UniqueId
-        result['invalid_ids'] = check_unique_ids(content)
-
-        # Запис змін (якщо не dry run)
-        if not dry_run and content != original:
-            filepath.write_text(content, encoding='utf-8')
-            result['success'] = True
-        elif content == original:
-            result['success'] = True  # Нічого не змінилось, але це OK
-
-    except Exception as e:
-        print(f"{RED}✗ Помилка при обробці {filepath.name}: {e}{RESET}")
-        return result
-
-    return result
+def refactor_file(filepath: Path, dry_run: bool = False) -> dict:
+    """Рефакторинг одного HTML файлу (правила та атомарний запис — fix_blocks.py)"""
+    return _to_report(fix_file(filepath, write=not dry_run))
 
 def main():
     """Головна функція"""
@@ -181,8 +76,8 @@ def main():
         'invalid_ids': []
     }
 
-    for filepath in sorted(html_files):
-        result = refactor_file(filepath, dry_run)
+    # Файли обробляються паралельно, звіт — у відсортованому порядку
+    for result in map(_to_report, fix_paths(sorted(html_files), write=not dry_run)):
 
         # Вивід результату для файлу
         if result['css_vars_fixed'] or result['ampersand_fixed'] or result['transition_fixed'] or result['media_queries_fixed'] or result['invalid_ids']:
@@ -226,12 +121,26 @@ def main():
             print(f"  {file}: {uid}")
         print(f"\n{YELLOW}Рекомендація: Згенеруйте нові hex UniqueId для невалідних записів{RESET}")
 
+    # Повтори uniqueId між файлами — один глобальний індекс
+    try:
+        duplicates = {
+            uid: blocks for uid, blocks in unique_id_conflicts(BlockIndex.from_paths(sorted(html_files))).items()
+            if uid not in {invalid for _, invalid in total_stats['invalid_ids']}
+        }
+    except BlockParseError:
+        duplicates = {}
+    if duplicates:
+        print(f"\n{RED}⚠ UniqueId повторюються між файлами: {len(duplicates)}{RESET}")
+        for uid, blocks in duplicates.items():
+            print(f"  {uid}: {', '.join(f'{Path(block.path).name}:{block.line}' for block in blocks)}")
+        print(f"\n{YELLOW}Рекомендація: python3 scripts/fix_blocks.py --unique-ids{RESET}")
+
     if dry_run:
         print(f"\n{YELLOW}⚠ DRY RUN - зміни НЕ збережені. Запустіть без --dry-run для застосування.{RESET}")
     else:
         print(f"\n{GREEN}✓ Рефакторинг завершено успішно!{RESET}")
 
-    return 0 if not total_stats['invalid_ids'] else 1
+    return 0 if not (total_stats['invalid_ids'] or duplicates) else 1
 
 if __name__ == '__main__':
     sys.exit(main())
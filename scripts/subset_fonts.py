@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Subset шрифтів Montserrat за символами, що використовуються в темі
+
+Символи збираються з gutenberg/, templates/ та PHP теми (разом з HTML
+entities і JSON \\uXXXX) і додаються до базового набору: латиниця,
+Latin-1, українська/російська кирилиця та типографські знаки, щоб
+динамічний контент блогу не випадав на системний шрифт.
+
+Для кожної накреслення у fonts/subset/ пишеться montserrat-<вага>.<хеш>.woff2,
+а fonts/subset/manifest.json містить файл і unicode-range для @font-face
+(читає medici_get_font_faces() в inc/assets.php).
+
+Повторна збірка кешується: manifest зберігає хеш входів (шрифт, набір
+символів, код скрипту) для кожного накреслення, і незмінені пропускаються
+без завантаження fontTools.
+
+Залежності (лише для збірки): pip install -r scripts/requirements.txt
+
+Використання:
+    python3 scripts/subset_fonts.py              # зібрати subsets
+    python3 scripts/subset_fonts.py --chars      # вивести символи поза базовим набором
+    python3 scripts/subset_fonts.py --check      # код 1, якщо subsets застаріли
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+from twemoji_sprite import unescape
+
+BASE_PATH = Path(__file__).parent.parent
+FONTS_DIR = BASE_PATH / 'fonts'
+SUBSET_DIR = FONTS_DIR / 'subset'
+MANIFEST_PATH = SUBSET_DIR / 'manifest.json'
+HASH_LENGTH = 10
+
+# Ключ manifest -> (вага, вихідний файл). .woff читається без brotli
+FACES: Dict[str, tuple] = {
+    'montserrat-regular': (400, 'montserrat-regular.woff'),
+    'montserrat-600': (600, 'montserrat-600.woff'),
+    'montserrat-700': (700, 'montserrat-700.woff'),
+}
+
+SOURCE_GLOBS = [
+    'gutenberg/*.html',
+    'templates/*.html',
+    '*.php',
+    'inc/**/*.php',
+    'templates/**/*.php',
+]
+
+# Базовий набір: потрібен контенту блогу, навіть якщо в шаблонах його немає
+BASELINE_RANGES = [
+    (0x0020, 0x007E),  # Basic Latin
+    (0x00A0, 0x00FF),  # Latin-1 Supplement
+    (0x0400, 0x045F),  # Кирилиця
+    (0x0490, 0x0491),  # Ґ ґ
+    (0x2013, 0x2014),  # – —
+    (0x2018, 0x201E),  # ‘ ’ ‚ “ ” „
+    (0x2022, 0x2022),  # •
+    (0x2026, 0x2026),  # …
+    (0x02BC, 0x02BC),  # ʼ (апостроф у нормативному правописі)
+    (0x20AC, 0x20AC),  # €
+    (0x20B4, 0x20B4),  # ₴
+    (0x2116, 0x2116),  # №
+    (0x2122, 0x2122),  # ™
+]
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+def engine_version() -> str:
+    """Хеш коду скрипту: зміна опцій subset інвалідує всі накреслення."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+# ---------------------- Символи ----------------------
+
+
+def baseline() -> Set[int]:
+    return {point for start, end in BASELINE_RANGES for point in range(start, end + 1)}
+
+
+def collect_sources() -> List[Path]:
+    paths: Set[Path] = set()
+    for pattern in SOURCE_GLOBS:
+        paths.update(BASE_PATH.glob(pattern))
+    return sorted(paths)
+
+
+def collect_codepoints(sources: Sequence[Path]) -> Set[int]:
+    """Усі друковані символи джерел (керівні та emoji відкидає cmap шрифту)."""
+    points: Set[int] = set()
+    for path in sources:
+        text = unescape(path.read_text(encoding='utf-8', errors='replace'))
+        points.update(ord(char) for char in set(text) if char.isprintable() or char == ' ')
+    return points
+
+
+def unicode_range(points: Sequence[int]) -> str:
+    """Значення unicode-range для @font-face: U+20-7E, U+A0-FF, ..."""
+    ranges: List[List[int]] = []
+    for point in sorted(points):
+        if ranges and ranges[-1][1] == point - 1:
+            ranges[-1][1] = point
+        else:
+            ranges.append([point, point])
+    return ', '.join(
+        f"U+{start:X}" if start == end else f"U+{start:X}-{end:X}"
+        for start, end in ranges
+    )
+
+
+def inputs_hash(source: Path, points: Set[int]) -> str:
+    digest = hashlib.sha1(engine_version().encode())
+    digest.update(source.read_bytes())
+    digest.update(','.join(map(str, sorted(points))).encode())
+    return digest.hexdigest()
+
+
+# ---------------------- Subset ----------------------
+
+
+def subset_face(source: Path, points: Set[int]) -> tuple:
+    """(woff2 байти, кодові точки, що є у шрифті)."""
+    from io import BytesIO
+
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(source)
+    available = sorted(points & set(font.getBestCmap()))
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']  # лігатури та кернінг
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=available)
+    subsetter.subset(font)
+
+    out = BytesIO()
+    font.flavor = 'woff2'
+    font.save(out)
+    return out.getvalue(), available
+
+
+def load_manifest() -> Dict[str, Dict]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def stale_faces(manifest: Dict[str, Dict], points: Set[int]) -> Dict[str, str]:
+    """Накреслення, які треба перезібрати: ключ -> хеш входів."""
+    stale = {}
+    for key, (_, filename) in FACES.items():
+        inputs = inputs_hash(FONTS_DIR / filename, points)
+        entry = manifest.get(key, {})
+        if entry.get('inputs') != inputs or not (SUBSET_DIR / entry.get('file', '')).is_file():
+            stale[key] = inputs
+    return stale
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Subset шрифтів Montserrat за символами теми')
+    parser.add_argument('--check', action='store_true', help='лише перевірити актуальність (код 1, якщо застаріли)')
+    parser.add_argument('--chars', action='store_true', help='вивести знайдені символи поза базовим набором')
+    parser.add_argument('--force', action='store_true', help='перезібрати всі накреслення')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    started = time.perf_counter()
+    base = baseline()
+    used = collect_codepoints(collect_sources())
+    points = base | used
+
+    if args.chars:
+        extra = sorted(used - base)
+        print(f"Поза базовим набором ({len(extra)}): {''.join(chr(point) for point in extra)}")
+
+    manifest = load_manifest()
+    stale = {key: inputs_hash(FONTS_DIR / FACES[key][1], points) for key in FACES} if args.force else stale_faces(manifest, points)
+
+    if args.check:
+        if not stale:
+            print(f"{GREEN}✓ subsets шрифтів актуальні{RESET}")
+            return 0
+        print(f"{RED}✗ Застарілі subsets: {', '.join(stale)}. Запустіть python3 scripts/subset_fonts.py{RESET}")
+        return 1
+
+    if stale:
+        try:
+            import fontTools  # noqa: F401
+            import brotli  # noqa: F401
+        except ImportError:
+            print(f"{RED}✗ Потрібні fonttools і brotli: pip install -r scripts/requirements.txt{RESET}", file=sys.stderr)
+            return 1
+
+    for key, inputs in stale.items():
+        weight, filename = FACES[key]
+        data, available = subset_face(FONTS_DIR / filename, points)
+        name = f"{key}.{hashlib.sha1(data).hexdigest()[:HASH_LENGTH]}.woff2"
+        old = manifest.get(key, {}).get('file')
+        write_atomic(SUBSET_DIR / name, data)
+        if old and old != name:
+            (SUBSET_DIR / old).unlink(missing_ok=True)
+        manifest[key] = {
+            'weight': weight,
+            'file': name,
+            'unicode_range': unicode_range(available),
+            'glyphs': len(available),
+            'size': len(data),
+            'inputs': inputs,
+        }
+
+    if stale:
+        write_atomic(MANIFEST_PATH, (json.dumps(manifest, indent=2, ensure_ascii=False) + '\n').encode())
+
+    for key, (weight, filename) in FACES.items():
+        entry = manifest[key]
+        full = (FONTS_DIR / filename).with_suffix('.woff2').stat().st_size
+        mark = f"{GREEN}✓{RESET}" if key in stale else f"{BLUE}={RESET}"
+        print(f"  {mark} {weight}: {entry['glyphs']} символів, {full / 1024:.1f} → {entry['size'] / 1024:.1f} KB  {entry['file']}")
+
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{BLUE}Перезібрано: {len(stale)}, {elapsed:.0f} мс{RESET}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Спрайт Twemoji з емоджі, що реально використовуються в темі
+
+Шаблони, блочний HTML, PHP/JS теми та експорти контенту блогу
+скануються на емоджі (найдовший збіг по дереву кодових точок з імен
+файлів assets/twemoji/svg, як twemoji.parse). Знайдені SVG мінімізуються
+і пакуються в один assets/twemoji/sprite.svg; assets/twemoji/sprite.json —
+manifest codepoint -> id символу, за яким inc/twemoji-local.php підставляє
+sprite.svg#id замість окремого файлу.
+
+Спрайт — "SVG stack": вкладені <svg id> з правилом :target, тож
+<img src="sprite.svg#e-1f600"> показує лише один символ.
+
+Інкрементальність: у .twemoji-cache для кожного джерела зберігаються
+mtime/розмір, sha1 та список емоджі, для кожного SVG — мінімізований
+символ. Повторний запуск без змін лише перевіряє stat файлів.
+
+Використання:
+    python3 scripts/twemoji_sprite.py                          # оновити спрайт
+    python3 scripts/twemoji_sprite.py --content export.xml     # + експорт WordPress
+    python3 scripts/twemoji_sprite.py --check                  # код 1, якщо спрайт застарів
+    python3 scripts/twemoji_sprite.py --stats                  # які емоджі і де
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+BASE_PATH = Path(__file__).parent.parent
+TWEMOJI_DIR = BASE_PATH / 'assets' / 'twemoji'
+SVG_DIR = TWEMOJI_DIR / 'svg'
+SPRITE_PATH = TWEMOJI_DIR / 'sprite.svg'
+MANIFEST_PATH = TWEMOJI_DIR / 'sprite.json'
+CACHE_PATH = BASE_PATH / '.twemoji-cache'
+
+# Експорти контенту блогу (WXR XML, HTML, JSON з REST API)
+CONTENT_DIR = BASE_PATH / 'content-exports'
+CONTENT_EXTENSIONS = {'.xml', '.html', '.htm', '.json', '.md', '.txt'}
+
+SOURCE_GLOBS = [
+    'gutenberg/*.html',
+    'templates/*.html',
+    '*.php',
+    'inc/**/*.php',
+    'templates/**/*.php',
+    'js/*.js',
+]
+
+SYMBOL_PREFIX = 'e-'
+VS16 = 0xFE0F  # emoji presentation
+VS15 = 0xFE0E  # text presentation: twemoji.parse такі символи пропускає
+# Символи з текстовим поданням за замовчуванням: twemoji.parse бере їх
+# лише з FE0F (©️), а #, * і цифри — лише як keycap (#️⃣)
+TEXT_DEFAULT = {0xA9, 0xAE, 0x2122, 0x265F}
+
+# Емоджі в сирому тексті бувають екрановані: HTML entities у контенті
+# та \\uXXXX (surrogate pairs) у JSON атрибутах блоків
+ENTITY_RE = re.compile(r'&#(?:x([0-9a-fA-F]{2,6})|(\d{2,7}));')
+JSON_ESCAPE_RE = re.compile(r'\\u(d[89ab][0-9a-f]{2})\\u(d[c-f][0-9a-f]{2})|\\u([0-9a-f]{4})', re.IGNORECASE)
+
+XML_DECL_RE = re.compile(r'<\?xml[^>]*\?>|<!--.*?-->|<!DOCTYPE[^>]*>', re.DOTALL)
+BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+ROOT_RE = re.compile(r'^\s*<svg\b([^>]*)>(.*)</svg>\s*$', re.DOTALL)
+VIEWBOX_RE = re.compile(r'\bviewBox="([^"]+)"')
+ID_RE = re.compile(r'\bid="([^"]+)"')
+INPUTS_RE = re.compile(r'Inputs: ([0-9a-f]{40})')
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+def engine_version() -> str:
+    """Хеш коду генератора: зміна мінімізації інвалідує кеш символів."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+# ---------------------- Пошук емоджі ----------------------
+
+
+def _char_class(points: Set[int]) -> str:
+    """[...] з діапазонами: клас з тисяч окремих символів у re повільний."""
+    ranges: List[List[int]] = []
+    for point in sorted(points):
+        if ranges and ranges[-1][1] == point - 1:
+            ranges[-1][1] = point
+        else:
+            ranges.append([point, point])
+    parts = (
+        re.escape(chr(start)) if start == end else f'{re.escape(chr(start))}-{re.escape(chr(end))}'
+        for start, end in ranges
+    )
+    return f"[{''.join(parts)}]"
+
+
+class EmojiMatcher:
+    """Дерево кодових точок з імен SVG файлів (1f468-200d-1f469.svg).
+
+    Ім'я файлу — кодові точки без FE0F, якщо в послідовності немає ZWJ
+    (grabTheRightIcon у twemoji). Тому FE0F у тексті пропускається, коли
+    дерево не має на нього гілки.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.root: Dict = {}
+        first: Set[int] = set()
+        for name in names:
+            node = self.root
+            points = [int(part, 16) for part in name.split('-')]
+            first.add(points[0])
+            for point in points:
+                node = node.setdefault(point, {})
+            node[None] = name
+        keycaps = {point for point in first if point < 0x80}
+        text_default = first & TEXT_DEFAULT
+        self.start_re = re.compile(
+            f'{_char_class(keycaps)}(?=\\ufe0f?\\u20e3)'
+            f'|{_char_class(text_default)}(?=\\ufe0f)'
+            f'|{_char_class(first - keycaps - text_default)}'
+        )
+
+    @classmethod
+    def from_directory(cls, directory: Path = SVG_DIR) -> 'EmojiMatcher':
+        return cls(entry.name[:-4] for entry in os.scandir(directory) if entry.name.endswith('.svg'))
+
+    def find(self, text: str) -> List[str]:
+        """Імена SVG усіх емоджі в тексті (з повтореннями, у порядку появи)."""
+        found = []
+        size = len(text)
+        search = self.start_re.search
+        match = search(text)
+        while match:
+            pos = match.start()
+            node = self.root
+            best: Optional[Tuple[str, int]] = None
+            i = pos
+            while i < size:
+                point = ord(text[i])
+                child = node.get(point)
+                if child is None:
+                    if point == VS16 and VS16 not in node and node is not self.root:
+                        i += 1
+                        if None in node:
+                            best = (node[None], i)
+                        continue
+                    break
+                node = child
+                i += 1
+                if None in node:
+                    best = (node[None], i)
+            if best is not None and not (best[1] < size and ord(text[best[1]]) == VS15):
+                found.append(best[0])
+                match = search(text, best[1])
+            else:
+                match = search(text, pos + 1)
+        return found
+
+
+def unescape(text: str) -> str:
+    """Розкрити HTML entities і JSON \\uXXXX, в яких можуть бути емоджі."""
+    if '&#' in text:
+        text = ENTITY_RE.sub(lambda m: chr(int(m.group(1), 16) if m.group(1) else int(m.group(2))), text)
+    if '\\u' in text:
+        def _json(m: 're.Match') -> str:
+            if m.group(3):
+                return chr(int(m.group(3), 16))
+            high, low = int(m.group(1), 16), int(m.group(2), 16)
+            return chr(0x10000 + ((high - 0xD800) << 10) + (low - 0xDC00))
+        text = JSON_ESCAPE_RE.sub(_json, text)
+    return text
+
+
+def collect_sources(content: Sequence[Path] = ()) -> List[Path]:
+    """Файли теми, експорти з content-exports/ та явно вказані шляхи."""
+    paths: Set[Path] = set()
+    for pattern in SOURCE_GLOBS:
+        paths.update(path for path in BASE_PATH.glob(pattern) if not path.name.endswith('.min.js'))
+    for root in [CONTENT_DIR, *content]:
+        if root.is_dir():
+            paths.update(path for path in root.rglob('*') if path.suffix.lower() in CONTENT_EXTENSIONS)
+        elif root.is_file():
+            paths.add(root)
+    return sorted(path.resolve() for path in paths)
+
+
+# ---------------------- Мінімізація та спрайт ----------------------
+
+
+def minify_symbol(name: str, svg: str) -> str:
+    """SVG файл -> <svg id viewBox> для спрайту.
+
+    Внутрішні id (clipPath, gradient) отримують префікс символу разом з
+    посиланнями url(#..) та href="#..", щоб не конфліктувати між емоджі.
+    """
+    svg = BETWEEN_TAGS_RE.sub('><', XML_DECL_RE.sub('', svg)).strip()
+    m = ROOT_RE.match(svg)
+    if not m:
+        raise ValueError(f"{name}.svg: немає кореневого <svg>")
+    attrs, body = m.groups()
+    viewbox = VIEWBOX_RE.search(attrs)
+    symbol_id = SYMBOL_PREFIX + name
+
+    for local in set(ID_RE.findall(body)):
+        scoped = f'{symbol_id}-{local}'
+        body = (
+            body.replace(f'id="{local}"', f'id="{scoped}"')
+            .replace(f'url(#{local})', f'url(#{scoped})')
+            .replace(f'href="#{local}"', f'href="#{scoped}"')
+        )
+    return f'<svg id="{symbol_id}" viewBox="{viewbox.group(1) if viewbox else "0 0 36 36"}">{body}</svg>'
+
+
+def render_sprite(symbols: Sequence[str], inputs: str) -> str:
+    """Спрайт: видимий лише символ з фрагмента URL (:target)."""
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        f'<!-- GENERATED by scripts/twemoji_sprite.py - do not edit by hand. Inputs: {inputs} -->'
+        '<style>svg svg{display:none}svg svg:target{display:inline}</style>'
+        + ''.join(symbols)
+        + '</svg>\n'
+    )
+
+
+def current_hash(path: Path = SPRITE_PATH) -> Optional[str]:
+    """Хеш входів, з яких згенеровано наявний спрайт."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            m = INPUTS_RE.search(f.read(512))
+    except OSError:
+        return None
+    return m.group(1) if m else None
+
+
+def write_atomic(path: Path, content: str) -> None:
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(content, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+# ---------------------- Інкрементальна збірка ----------------------
+
+
+class SpriteBuilder:
+    """Кеш сканування джерел і мінімізованих символів (.twemoji-cache)."""
+
+    def __init__(self, path: Path = CACHE_PATH) -> None:
+        self.path = path
+        self.version = engine_version()
+        self.sources: Dict[str, Dict] = {}
+        self.symbols: Dict[str, Dict] = {}
+        self.scanned = 0
+        self.minified = 0
+        self.dirty = False
+        self._matcher: Optional[EmojiMatcher] = None
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('version') == self.version:
+            self.sources = data.get('sources', {})
+            self.symbols = data.get('symbols', {})
+
+    @property
+    def matcher(self) -> EmojiMatcher:
+        # Дерево з 4000+ імен потрібне лише, якщо якесь джерело змінилось
+        if self._matcher is None:
+            self._matcher = EmojiMatcher.from_directory()
+        return self._matcher
+
+    def scan(self, path: Path) -> List[str]:
+        """Емоджі файлу: з кешу, якщо mtime/розмір або sha1 не змінились."""
+        key = str(path)
+        stat = path.stat()
+        entry = self.sources.get(key)
+        if entry is not None and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['emoji']
+
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        if entry is None or entry['sha1'] != digest:
+            self.scanned += 1
+            text = unescape(raw.decode('utf-8', errors='replace'))
+            emoji = sorted(set(self.matcher.find(text)))
+        else:
+            emoji = entry['emoji']
+        self.sources[key] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': digest, 'emoji': emoji}
+        self.dirty = True
+        return emoji
+
+    def symbol(self, name: str) -> Dict:
+        """Мінімізований символ і sha1 вихідного SVG."""
+        path = SVG_DIR / f'{name}.svg'
+        stat = path.stat()
+        entry = self.symbols.get(name)
+        if entry is not None and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry
+
+        self.minified += 1
+        raw = path.read_bytes()
+        entry = {
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha1': hashlib.sha1(raw).hexdigest(),
+            'svg': minify_symbol(name, raw.decode('utf-8')),
+        }
+        self.symbols[name] = entry
+        self.dirty = True
+        return entry
+
+    def usage(self, sources: Sequence[Path]) -> Dict[str, List[str]]:
+        """Емоджі -> файли, де воно зустрічається."""
+        used: Dict[str, List[str]] = {}
+        for path in sources:
+            for name in self.scan(path):
+                used.setdefault(name, []).append(path.relative_to(BASE_PATH).as_posix() if path.is_relative_to(BASE_PATH) else str(path))
+        return used
+
+    def inputs_hash(self, names: Sequence[str]) -> str:
+        """Хеш набору емоджі, їх SVG та коду генератора."""
+        digest = hashlib.sha1(self.version.encode())
+        for name in names:
+            digest.update(f"{name}:{self.symbol(name)['sha1']}\n".encode())
+        return digest.hexdigest()
+
+    def build(self, names: Sequence[str], inputs: str) -> Tuple[str, str]:
+        """Тексти sprite.svg та sprite.json."""
+        sprite = render_sprite([self.symbol(name)['svg'] for name in names], inputs)
+        manifest = {
+            'sprite': SPRITE_PATH.name,
+            'version': inputs[:10],
+            'icons': {name: SYMBOL_PREFIX + name for name in names},
+        }
+        return sprite, json.dumps(manifest, indent=2) + '\n'
+
+    def save(self) -> None:
+        """Атомарний запис; записи видалених джерел відкидаються."""
+        if not self.dirty:
+            return
+        sources = {key: entry for key, entry in self.sources.items() if os.path.exists(key)}
+        data = {'version': self.version, 'sources': sources, 'symbols': self.symbols}
+        write_atomic(self.path, json.dumps(data, ensure_ascii=False))
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Спрайт Twemoji з використаних емоджі')
+    parser.add_argument('--content', nargs='+', type=Path, default=[], help='експорти контенту блогу (файли або директорії)')
+    parser.add_argument('--check', action='store_true', help='лише перевірити актуальність (код 1, якщо застарів)')
+    parser.add_argument('--force', action='store_true', help='перегенерувати без кешу')
+    parser.add_argument('--stats', action='store_true', help='вивести емоджі та файли, де вони використані')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    if not SVG_DIR.is_dir():
+        print(f"{RED}✗ {SVG_DIR.relative_to(BASE_PATH)} не знайдено{RESET}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    builder = SpriteBuilder(Path(os.devnull) if args.force else CACHE_PATH)
+    used = builder.usage(collect_sources(args.content))
+    names = sorted(used)
+    inputs = builder.inputs_hash(names)
+    fresh = not args.force and current_hash() == inputs and MANIFEST_PATH.exists()
+
+    if args.stats:
+        for name in names:
+            emoji = ''.join(chr(int(part, 16)) for part in name.split('-'))
+            files = used[name]
+            more = f" та ще {len(files) - 3}" if len(files) > 3 else ''
+            print(f"  {emoji}  {name:<24} {', '.join(files[:3])}{more}")
+
+    if args.check:
+        if fresh:
+            print(f"{GREEN}✓ sprite.svg актуальний ({len(names)} емоджі){RESET}")
+            return 0
+        print(f"{RED}✗ sprite.svg застарів: запустіть python3 scripts/twemoji_sprite.py{RESET}")
+        return 1
+
+    if not fresh:
+        sprite, manifest = builder.build(names, inputs)
+        write_atomic(SPRITE_PATH, sprite)
+        write_atomic(MANIFEST_PATH, manifest)
+    if not args.force:
+        builder.save()
+
+    elapsed = (time.perf_counter() - started) * 1000
+    sources_size = sum((SVG_DIR / f'{name}.svg').stat().st_size for name in names)
+    status = 'без змін' if fresh else 'оновлено'
+    print(
+        f"{GREEN}✓ sprite.svg {status}:{RESET} {len(names)} емоджі, "
+        f"{SPRITE_PATH.stat().st_size / 1024:.1f} KB (окремі SVG: {sources_size / 1024:.1f} KB)"
+    )
+    print(f"{BLUE}Проскановано: {builder.scanned}, мінімізовано: {builder.minified}, {elapsed:.0f} мс{RESET}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
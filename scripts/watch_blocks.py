@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Watch mode для лінтера блочного HTML
+
+Довгоживучий процес тримає в пам'яті підсумки lint_blocks для всіх
+файлів gutenberg/ і templates/ та індекс CSS (css_index). Після
+збереження файлу перевіряється лише він:
+
+- HTML — файл лінтується заново, перевірки між файлами (uniqueId,
+  globalClasses) перераховуються з підсумків у пам'яті без повторного
+  розбору інших файлів;
+- CSS — css_index перечитує лише змінену таблицю стилів, після чого
+  перевіряються globalClasses усіх шаблонів.
+
+Виводиться різниця: нові (+) та виправлені (−) проблеми по файлах.
+Зміни відстежуються через inotify (Linux, ctypes без залежностей), в
+інших системах — опитуванням mtime/розміру.
+
+Використання:
+    python3 scripts/watch_blocks.py                 # inotify або опитування
+    python3 scripts/watch_blocks.py --poll 0.5      # примусове опитування
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from css_index import CSS_DIR, load_index
+from gutenberg_blocks import collect_files
+from lint_blocks import BASE_PATH, DEFAULT_DIRS, ERROR, cross_file_issues, lint_file
+
+DEBOUNCE = 0.03  # редактори зберігають кількома записами (tmp + rename)
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+# Кольори для виводу
+RED = '\033[91m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+# ---------------------- Відстеження змін ----------------------
+
+
+def is_watched(path: Path) -> bool:
+    """HTML блоків або вихідна таблиця стилів (не .min.css і не збірки dist/)."""
+    if path.name.startswith('.'):
+        return False
+    if path.suffix == '.html':
+        return path.parent in DEFAULT_DIRS
+    if path.suffix == '.css' and not path.name.endswith('.min.css'):
+        try:
+            return 'dist' not in path.relative_to(CSS_DIR).parts
+        except ValueError:
+            return False
+    return False
+
+
+def watched_dirs() -> List[Path]:
+    dirs = [path for path in DEFAULT_DIRS if path.is_dir()]
+    dirs.append(CSS_DIR)
+    dirs.extend(
+        path for path in sorted(CSS_DIR.rglob('*'))
+        if path.is_dir() and 'dist' not in path.relative_to(CSS_DIR).parts
+    )
+    return dirs
+
+
+class InotifyWatcher:
+    """inotify через libc: події закриття після запису, перейменування, видалення."""
+
+    def __init__(self, dirs: Sequence[Path]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self.dirs: Dict[int, Path] = {}
+        for path in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch {path}')
+            self.dirs[wd] = path
+
+    def _read(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos < len(data):
+            wd, _, _, length = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b'\0')
+            pos += length
+            if wd in self.dirs and name:
+                changed.add(self.dirs[wd] / os.fsdecode(name))
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Змінені файли; чекає першої події, потім збирає серію за DEBOUNCE."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = self._read()
+        while select.select([self.fd], [], [], DEBOUNCE)[0]:
+            changed |= self._read()
+        return {path for path in changed if is_watched(path)}
+
+
+class PollingWatcher:
+    """Опитування mtime_ns/розміру файлів з інтервалом."""
+
+    def __init__(self, dirs: Sequence[Path], interval: float = 0.5) -> None:
+        self.dirs = dirs
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        state = {}
+        for directory in self.dirs:
+            for path in directory.iterdir():
+                if is_watched(path):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            state = self._scan()
+            changed = {
+                path for path in state.keys() | self.state.keys()
+                if state.get(path) != self.state.get(path)
+            }
+            self.state = state
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+
+def make_watcher(poll: Optional[float]):
+    dirs = watched_dirs()
+    if poll is None and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError) as e:
+            print(f"{YELLOW}⚠ inotify недоступний ({e}), опитування{RESET}", file=sys.stderr)
+    return PollingWatcher(dirs, poll or 0.5)
+
+
+# ---------------------- Стан лінтера ----------------------
+
+
+class WatchState:
+    """Підсумки файлів і індекс CSS у пам'яті; звіт — різниця проблем."""
+
+    def __init__(self) -> None:
+        self.css = load_index()
+        self.classes = self.css.classes()
+        self.summaries: Dict[str, Dict] = {
+            str(path): lint_file(path) for path in collect_files(DEFAULT_DIRS)
+        }
+        self.issues = self._issues()
+
+    def _issues(self) -> Dict[str, List[List]]:
+        """Проблеми файлів разом з перевірками між файлами."""
+        cross = cross_file_issues(list(self.summaries.values()), self.classes)
+        return {
+            name: summary['issues'] + cross.get(name, [])
+            for name, summary in self.summaries.items()
+        }
+
+    def apply(self, changed: Set[Path]) -> Dict[str, Tuple[List[List], List[List]]]:
+        """Оновити стан для змінених файлів: файл -> (нові, виправлені)."""
+        css_changed = False
+        for path in changed:
+            if path.suffix == '.css':
+                css_changed = True
+            elif path.exists():
+                self.summaries[str(path)] = lint_file(path)
+            else:
+                self.summaries.pop(str(path), None)
+
+        if css_changed:
+            self.css.update()
+            self.classes = self.css.classes()
+
+        previous, self.issues = self.issues, self._issues()
+        report = {}
+        for name in previous.keys() | self.issues.keys():
+            added, resolved = diff_issues(previous.get(name, []), self.issues.get(name, []))
+            if added or resolved:
+                report[name] = (added, resolved)
+        return report
+
+    def counts(self) -> Tuple[int, int]:
+        issues = [issue for file_issues in self.issues.values() for issue in file_issues]
+        errors = sum(1 for issue in issues if issue[0] == ERROR)
+        return errors, len(issues) - errors
+
+
+def diff_issues(old: Sequence[List], new: Sequence[List]) -> Tuple[List[List], List[List]]:
+    """Нові та виправлені проблеми; рядок не враховується, щоб зсув
+    тексту вище не виглядав як нова проблема."""
+    remaining = Counter((severity, check, message) for severity, check, _, message in old)
+    added = []
+    for issue in new:
+        key = (issue[0], issue[1], issue[3])
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            added.append(issue)
+
+    resolved = []
+    for issue in old:
+        key = (issue[0], issue[1], issue[3])
+        if remaining[key]:
+            remaining[key] -= 1
+            resolved.append(issue)
+    return added, resolved
+
+
+def print_report(report: Dict[str, Tuple[List[List], List[List]]], changed: Set[Path], elapsed: float) -> None:
+    names = ', '.join(sorted(_relative(path) for path in changed))
+    print(f"{BLUE}[{time.strftime('%H:%M:%S')}]{RESET} {names} ({elapsed * 1000:.0f} мс)")
+    if not report:
+        print("  без змін у проблемах")
+    for name in sorted(report):
+        added, resolved = report[name]
+        print(f"  {_relative(Path(name))}")
+        for severity, check, line, message in added:
+            color = RED if severity == ERROR else YELLOW
+            print(f"    {color}+ {line:>5}  [{check}] {message}{RESET}")
+        for _, check, line, message in resolved:
+            print(f"    {GREEN}− {line:>5}  [{check}] {message}{RESET}")
+
+
+def _relative(path: Path) -> str:
+    try:
+        return str(path.relative_to(BASE_PATH))
+    except ValueError:
+        return str(path)
+
+
+# ---------------------- CLI ----------------------
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Watch mode для лінтера блочного HTML')
+    parser.add_argument('--poll', type=float, metavar='SEC', help='опитування з інтервалом замість inotify')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Головна функція."""
+    args = parse_args(argv)
+    started = time.perf_counter()
+    state = WatchState()
+    watcher = make_watcher(args.poll)
+    errors, warnings = state.counts()
+    mode = 'inotify' if isinstance(watcher, InotifyWatcher) else f'опитування {watcher.interval} с'
+    print(f"{BLUE}Файлів: {len(state.summaries)}, помилок: {errors}, попереджень: {warnings} "
+          f"({(time.perf_counter() - started) * 1000:.0f} мс). Відстеження: {mode}, Ctrl+C — вихід{RESET}",
+          flush=True)
+
+    try:
+        while True:
+            changed = watcher.wait()
+            if not changed:
+                continue
+            started = time.perf_counter()
+            report = state.apply(changed)
+            print_report(report, changed, time.perf_counter() - started)
+            errors, warnings = state.counts()
+            print(f"  {BLUE}помилок: {errors}, попереджень: {warnings}{RESET}", flush=True)
+    except KeyboardInterrupt:
+        print()
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())